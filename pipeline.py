@@ -0,0 +1,155 @@
+"""
+Incremental in-season update of the whole pipeline.
+
+    python pipeline.py update --since 2025-03-10 [--until 2025-03-16]
+
+1. Crawl the scoreboards for --since..--until only and append their new
+   Game IDs to the game ID list. The crawl keeps its own checkpoint
+   (--crawl-state), so it never moves the season crawl's.
+2. Scrape only the Game IDs from those dates (and the day after --until,
+   where late tip-offs are listed) that are not yet in the games CSV, and
+   append them to it, to the columnar store (game_store.py) and to the
+   referee crew index (crew_index.py).
+3. Geocode only the venues of the new games and add the new legs to each
+   referee's saved travel totals (see RefereeTravel.update_travel), instead
+   of recomputing travel for every referee.
+
+Run it from the directory that holds the data files, like the scrapers.
+"""
+
+import os
+import sys
+import asyncio
+import argparse
+import datetime as dt
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(ROOT, 'scrapers'), os.path.join(ROOT, 'referee_analysis')]
+
+from async_fetcher import AsyncFetcher, NCAA_BASE_URL
+from page_cache import PageCache
+from retry import RetryPolicy
+from game_parser import parse_contest
+from game_id_crawler import run_crawl
+from batch_merge import append_csv
+from geolocator import RefereeTravel
+from game_store import GAMES_STORE, append_games as append_to_store
+from crew_index import update_crew_index
+
+GAME_IDS_FILE = "regular_season_game_ids.csv"
+GAMES_FILE = "ncaa_games_data.csv"
+CRAWL_STATE_FILE = "update_crawl_state.txt"  # Not the season crawl's game_id_crawl_state.txt, so updates never move its checkpoint
+FAILED_FILE = "update_failed_games.csv"
+BASE_URL = os.environ.get("NCAA_BASE_URL", NCAA_BASE_URL)
+
+
+def unseen_game_ids(game_ids_file, games_file, since, until):
+    """
+    (Date, Game ID) rows dated since..until, plus the day after until,
+    that are not in the games CSV yet. Late tip-offs on until's scoreboard
+    are dated the next day (stats.ncaa.org lists games on Eastern time).
+    """
+    game_ids = pd.read_csv(game_ids_file, dtype={'Game ID': str})
+    dates = pd.to_datetime(game_ids['Date']).dt.date
+    game_ids = game_ids[(dates >= since) & (dates <= until + dt.timedelta(days=1))]
+
+    if os.path.exists(games_file):
+        scraped = set(pd.read_csv(games_file, usecols=['Game_ID'], dtype={'Game_ID': str})['Game_ID'])
+        game_ids = game_ids[~game_ids['Game ID'].isin(scraped)]
+    return game_ids.drop_duplicates(subset='Game ID')
+
+
+def scrape_games(game_ids, base_url=BASE_URL, rate=2.0, max_per_host=4):
+    """Fetch and parse the given games; returns (games DataFrame, failures)"""
+    async def fetch_all():
+        async with AsyncFetcher(base_url=base_url, rate=rate, max_per_host=max_per_host,
+                                cache=PageCache(), retry=RetryPolicy()) as fetcher:
+            return await fetcher.fetch_contests(game_ids['Game ID'].tolist())
+
+    games = []
+    failed_games = []
+    for game_id, game_date, pages in zip(game_ids['Game ID'], game_ids['Date'], asyncio.run(fetch_all())):
+        try:
+            if isinstance(pages, Exception):
+                raise pages
+            games.append(parse_contest(game_id, game_date, pages))
+        except Exception as e:
+            print(f"⚠️ Failed to scrape Game ID: {game_id}")
+            print(f"Error: {str(e)}")
+            failed_games.append({'Game_ID': game_id, 'Error': str(e)})
+
+    return pd.DataFrame(games), failed_games
+
+
+def append_games(new_games, games_file):
+    """Append games to the games CSV, widening its header if the new games bring new columns"""
+    append_csv(new_games, games_file)
+
+
+def update(args):
+    """Bring game IDs, games and referee travel up to date for --since..--until"""
+    since = args.since
+    until = args.until or dt.date.today()
+    print(f"📅 Updating games from {since} to {until}")
+
+    # Step 1: Only the new dates' scoreboards
+    added = run_crawl(since, until + dt.timedelta(days=1), args.game_ids, args.crawl_state,
+                      base_url=args.base_url, rate=args.rate, max_per_host=args.max_per_host,
+                      resume=False, retry=RetryPolicy())
+    print(f"✅ Added {added} Game IDs to '{args.game_ids}'")
+
+    # Step 2: Only games that have not been scraped yet
+    game_ids = unseen_game_ids(args.game_ids, args.games, since, until)
+    if game_ids.empty:
+        print("✅ No unseen games to scrape")
+        return
+
+    print(f"\n🔄 Scraping {len(game_ids)} new games...")
+    new_games, failed_games = scrape_games(game_ids, args.base_url, args.rate, args.max_per_host)
+    if failed_games:
+        pd.DataFrame(failed_games).to_csv(FAILED_FILE, index=False)
+        print(f"❌ Saved {len(failed_games)} failed games to {FAILED_FILE}")
+    if new_games.empty:
+        print("❌ No new games were scraped")
+        return
+
+    append_games(new_games, args.games)
+    append_to_store(new_games, args.store)
+    print(f"✅ Appended {len(new_games)} games to '{args.games}' and '{args.store}'")
+    print(f"✅ Added {update_crew_index(new_games)} games to the crew index")
+
+    # Step 3: Only the new legs
+    analyzer = RefereeTravel(details_json=args.details_json)
+    analyzer.data_path = args.games
+    analyzer.games_store = args.store
+    analyzer.update_travel(new_games)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NCAA referee analysis pipeline")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    update_parser = subparsers.add_parser('update', help="Add new games and update referee travel in place")
+    update_parser.add_argument('--since', type=dt.date.fromisoformat, required=True,
+                               help="First game date to fetch (YYYY-MM-DD)")
+    update_parser.add_argument('--until', type=dt.date.fromisoformat, default=None,
+                               help="Last game date to fetch (default: today)")
+    update_parser.add_argument('--game-ids', default=GAME_IDS_FILE)
+    update_parser.add_argument('--games', default=GAMES_FILE)
+    update_parser.add_argument('--store', default=GAMES_STORE, help="Columnar (Parquet) games store")
+    update_parser.add_argument('--crawl-state', default=CRAWL_STATE_FILE,
+                               help="Checkpoint for this update's crawl, kept apart from the season crawl's")
+    update_parser.add_argument('--base-url', default=BASE_URL)
+    update_parser.add_argument('--rate', type=float, default=1.0, help="Requests per second")
+    update_parser.add_argument('--max-per-host', type=int, default=4)
+    update_parser.add_argument('--details-json', action='store_true',
+                               help="Also write referee_travel_details.json next to the Arrow leg files")
+    update_parser.set_defaults(func=update)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
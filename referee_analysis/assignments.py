@@ -0,0 +1,101 @@
+"""
+Long-format referee assignment table.
+
+Each game row carries up to three officials in Official_1..Official_3.
+Melting those columns once gives one row per (referee, game), which every
+per-referee analysis can then group or shift instead of rescanning the
+whole games table for each referee.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def find_official_columns(df):
+    """Find the official columns in the games dataset"""
+    official_cols = [col for col in df.columns if 'official' in col.lower() and '_' in col]
+    if not official_cols:
+        official_cols = [col for col in df.columns if 'ref' in col.lower() and '_' in col]
+    return official_cols
+
+
+def build_assignments(df, official_cols, columns=('Date',)):
+    """
+    Melt the official columns into one row per (referee, game).
+
+    The result keeps Game_Row (the game's position in df) plus any extra
+    columns requested, and is sorted by referee and then by game order, so
+    each referee's games form one contiguous, chronological block when df
+    is sorted by date. A referee listed twice on the same game counts once.
+
+    When 'Date' is included, a referee's games on the same date keep the
+    order pandas' default (quicksort) date sort gives them, which is the
+    order the published referee_travel outputs were built with.
+    """
+    columns = [col for col in columns if col not in official_cols]
+    games = df[official_cols + columns].reset_index(drop=True)
+    games['Game_Row'] = np.arange(len(games))
+
+    assignments = games.melt(
+        id_vars=['Game_Row'] + columns,
+        value_vars=official_cols,
+        value_name='Referee'
+    ).drop(columns='variable')
+    assignments = assignments.dropna(subset=['Referee'])
+    assignments = assignments.drop_duplicates(subset=['Referee', 'Game_Row'])
+
+    assignments = assignments.sort_values(['Referee', 'Game_Row'], kind='mergesort')
+    assignments = assignments.reset_index(drop=True)[['Referee', 'Game_Row'] + columns]
+
+    if 'Date' in columns:
+        assignments = _order_same_day_games(assignments)
+    return assignments
+
+
+def _order_same_day_games(assignments):
+    """Re-sort the blocks of referees who worked two games on one date"""
+    same_day = assignments.duplicated(['Referee', 'Date'], keep=False)
+    if not same_day.any():
+        return assignments
+
+    order = np.arange(len(assignments))
+    dates = assignments['Date'].to_numpy()
+    referees = assignments['Referee'].to_numpy()
+    for referee in pd.unique(referees[same_day.to_numpy()]):
+        block = np.arange(np.searchsorted(referees, referee, side='left'),
+                          np.searchsorted(referees, referee, side='right'))
+        order[block] = block[np.argsort(dates[block], kind='quicksort')]
+    return assignments.iloc[order].reset_index(drop=True)
+
+
+def referee_blocks(assignments, block_rows):
+    """
+    Yield (start, end) row ranges of about block_rows rows that cover a
+    referee-sorted assignment table and never split one referee's games,
+    without building any array as long as the table.
+    """
+    referees = assignments['Referee']
+    start, n = 0, len(assignments)
+    while start < n:
+        end = min(start + block_rows, n)
+        last = referees.iat[end - 1]
+        while end < n and referees.iat[end] == last:
+            end += 1
+        yield start, end
+        start = end
+
+
+def consecutive_legs(assignments, columns):
+    """
+    Pair each assignment with the same referee's previous assignment.
+
+    Returns the rows that have a previous game, with the previous values
+    of the requested columns added under a 'Prev_' prefix.
+    """
+    referees = assignments['Referee']
+    has_prev = referees.eq(referees.shift()).to_numpy()
+
+    legs = assignments.loc[has_prev].copy()
+    for col in columns:
+        legs[f'Prev_{col}'] = assignments[col].shift().loc[has_prev]
+    return legs
@@ -0,0 +1,70 @@
+"""
+Benchmark the foul-bias tests on synthetic data with a few biased referees.
+
+Run from the repository root:
+    python referee_analysis/benchmark_foul_bias.py [resamples] [max_workers]
+
+Generates one season of games for 780 referees (three per game, Poisson
+foul counts per half), with ten referees whose games get extra home fouls.
+Times foul_bias serially and with up to max_workers processes, checks
+that every worker count gives identical results for the same seed, and
+reports how many of the planted referees are flagged (q < 0.05) and how
+many unbiased ones are.
+"""
+
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from foul_bias import foul_bias
+
+N_GAMES, N_REFEREES, N_BIASED = 6000, 780, 10
+OFFICIAL_COLS = ['Official_1', 'Official_2', 'Official_3']
+
+
+def synthetic_games(seed=0):
+    """Games with Game_ID, Official_1..3 and home/away fouls per half and free throw attempts"""
+    rng = np.random.default_rng(seed)
+    referees = np.array([f'Referee {i}' for i in range(N_REFEREES)], dtype=object)
+    officials = np.array([rng.choice(N_REFEREES, 3, replace=False) for _ in range(N_GAMES)])
+    biased_games = np.isin(officials, np.arange(N_BIASED)).any(axis=1)
+
+    games = {'Game_ID': np.arange(N_GAMES)}
+    for col, refs in zip(OFFICIAL_COLS, officials.T):
+        games[col] = referees[refs]
+    for side, extra in (('Home', 1.5 * biased_games), ('Away', 0)):
+        for half in ('1H', '2H'):
+            games[f'{side}_Fouls_{half}'] = rng.poisson(8.5 + extra)
+        games[f'{side}_Personal_Fouls'] = games[f'{side}_Fouls_1H'] + games[f'{side}_Fouls_2H']
+        games[f'{side}_FTA'] = rng.poisson(games[f'{side}_Personal_Fouls'] * 1.1)
+    return pd.DataFrame(games), set(referees[:N_BIASED])
+
+
+def same_results(result, expected):
+    numeric = result.select_dtypes('number').columns
+    return (result['Referee'].equals(expected['Referee'])
+            and np.allclose(result[numeric], expected[numeric], equal_nan=True, rtol=0, atol=1e-12))
+
+
+if __name__ == "__main__":
+    resamples = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    games, biased = synthetic_games()
+    print(f"📊 {len(games)} games, {N_REFEREES} referees ({N_BIASED} biased), {resamples} resamples, "
+          f"{os.cpu_count()} CPUs")
+
+    expected = None
+    for workers in sorted({1, max_workers} | {2 ** i for i in range(1, max_workers.bit_length()) if 2 ** i <= max_workers}):
+        start = time.perf_counter()
+        result = foul_bias(games, OFFICIAL_COLS, resamples=resamples, workers=workers)
+        elapsed = time.perf_counter() - start
+        match = "" if expected is None else ("✅ same results" if same_results(result, expected) else "❌ results differ")
+        print(f"{workers:3d} workers: {elapsed:8.3f} s  {match}")
+        expected = expected if expected is not None else result
+
+    flagged = expected[(expected['Metric'] == 'Foul_Differential') & (expected['Q_Value'] < 0.05)]
+    print(f"Foul_Differential, q < 0.05: {len(set(flagged['Referee']) & biased)} of {N_BIASED} biased referees, "
+          f"{len(set(flagged['Referee']) - biased)} of {N_REFEREES - N_BIASED} unbiased")
@@ -0,0 +1,111 @@
+"""
+Benchmark serial vs. process-pool travel analysis on synthetic multi-season data.
+
+Run from the repository root:
+    python referee_analysis/benchmark_parallel_travel.py [seasons] [max_workers]
+
+Generates `seasons` seasons of games for several divisions (random venues
+across the continental US, three officials per game drawn from a shared
+referee pool), then times the travel computation serially and with 1, 2,
+4, ... max_workers processes. Every parallel result is checked against
+the serial one. Loading and geocoding are left out: the venue coordinates
+are known and the distance index is built before timing.
+"""
+
+import sys
+import os
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Keep the benchmark's venue store and distance index out of the real work directory
+os.environ['NCAA_WORK_DIR'] = tempfile.mkdtemp(prefix='ncaa_benchmark_')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from assignments import build_assignments
+from geolocator import RefereeTravel
+from parallel_travel import parallel_travel_blocks
+
+DIVISIONS = {'D-I': (360, 5800, 1500), 'D-II': (300, 4500, 1100), 'D-III': (420, 5500, 1200)}  # venues, games, referees
+
+
+def synthetic_games(seasons, seed=0):
+    """Games for every division and season, with Date, Venue and Official_1..3"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for division, (n_venues, n_games, n_referees) in DIVISIONS.items():
+        venues = [f'{division} Arena {i} (City {i}, ST)' for i in range(n_venues)]
+        referees = np.array([f'{division} Referee {i}' for i in range(n_referees)], dtype=object)
+        for season in range(seasons):
+            start = pd.Timestamp(f'{2015 + season}-11-01')
+            officials = np.array([rng.choice(n_referees, 3, replace=False) for _ in range(n_games)])
+            frames.append(pd.DataFrame({
+                'Date': start + pd.to_timedelta(rng.integers(0, 150, n_games), unit='D'),
+                'Venue': np.array(venues, dtype=object)[rng.integers(0, n_venues, n_games)],
+                'Official_1': referees[officials[:, 0]],
+                'Official_2': referees[officials[:, 1]],
+                'Official_3': referees[officials[:, 2]],
+            }))
+    games = pd.concat(frames, ignore_index=True).sort_values('Date')
+
+    venues = pd.unique(games['Venue'])
+    coords = np.column_stack([rng.uniform(25, 49, len(venues)), rng.uniform(-124, -67, len(venues))])
+    return games, {venue: tuple(row) for venue, row in zip(venues, coords)}
+
+
+def time_it(func, *args, repeat=3, **kwargs):
+    """Best wall-clock time of several runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def same_results(result, expected):
+    """Identical state (in the same referee order) and identical leg arrays"""
+    (state, legs), (expected_state, expected_legs) = result, expected
+    return (list(state.items()) == list(expected_state.items())
+            and list(legs) == list(expected_legs)
+            and all(np.array_equal(legs[referee][name], expected_legs[referee][name])
+                    for referee in legs for name in legs[referee]))
+
+
+def collect(blocks):
+    """Merge streamed (state, legs) blocks, so serial and parallel runs can be compared"""
+    state, legs = {}, {}
+    for block_state, block_legs in blocks:
+        state.update(block_state)
+        legs.update(block_legs)
+    return state, legs
+
+
+def serial_results(analyzer, assignments, venue_coords):
+    return collect(analyzer.travel_blocks(assignments, 'Venue', venue_coords))
+
+
+def parallel_results(analyzer, assignments, venue_coords, workers):
+    return collect(parallel_travel_blocks(assignments, 'Venue', venue_coords, analyzer.distance_index, workers=workers))
+
+
+if __name__ == "__main__":
+    seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    games, venue_coords = synthetic_games(seasons)
+    assignments = build_assignments(games, ['Official_1', 'Official_2', 'Official_3'], columns=['Date', 'Venue'])
+    analyzer = RefereeTravel()
+    analyzer.distance_index.add_venues(venue_coords)
+
+    print(f"📊 {seasons} seasons, {len(games)} games, {len(assignments)} assignments, "
+          f"{assignments['Referee'].nunique()} referees, {len(venue_coords)} venues, {os.cpu_count()} CPUs")
+
+    serial_time, expected = time_it(serial_results, analyzer, assignments, venue_coords)
+    print(f"Serial:      {serial_time:8.3f} s")
+
+    worker_counts = sorted({1, max_workers} | {2 ** i for i in range(1, max_workers.bit_length()) if 2 ** i <= max_workers})
+    for workers in worker_counts:
+        elapsed, result = time_it(parallel_results, analyzer, assignments, venue_coords, workers)
+        match = "✅" if same_results(result, expected) else "❌ differs from serial"
+        print(f"{workers:3d} workers: {elapsed:8.3f} s  ({serial_time / elapsed:.2f}x) {match}")
@@ -0,0 +1,93 @@
+"""
+Benchmark the travel-leg builder: per-referee .iloc loop vs. positional slicing.
+
+Run from the repository root:
+    python referee_analysis/benchmark_travel_legs.py [games_csv] [venue_cache_json]
+
+Both paths only build the (date, from_venue, to_venue) leg lists; distances
+are left out so the timing isolates the row access pattern.
+"""
+
+import sys
+import os
+import json
+import time
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from assignments import find_official_columns, build_assignments, consecutive_legs
+from geolocator import RefereeTravel
+
+DEFAULT_GAMES = os.path.join('dataset', 'ncaa_games_data_complete.csv')
+DEFAULT_VENUES = os.path.join('dataset', 'venue_cache.json')
+
+
+def legs_old(df, official_cols, venue_coords):
+    """Previous path: boolean mask per referee, then .iloc per leg"""
+    unique_refs = set()
+    for col in official_cols:
+        unique_refs.update(df[col].dropna().unique())
+
+    legs = {}
+    for referee in unique_refs:
+        ref_games = df[df[official_cols].eq(referee).any(axis=1)].copy()
+        if len(ref_games) <= 1:
+            continue
+        ref_games = ref_games.sort_values('Date')
+
+        travel_legs = []
+        for i in range(1, len(ref_games)):
+            prev_venue = ref_games.iloc[i-1]['Venue']
+            curr_venue = ref_games.iloc[i]['Venue']
+            if venue_coords.get(prev_venue) and venue_coords.get(curr_venue):
+                travel_legs.append({
+                    'date': ref_games.iloc[i]['Date'],
+                    'from_venue': prev_venue,
+                    'to_venue': curr_venue
+                })
+        legs[referee] = travel_legs
+    return legs
+
+
+def legs_new(df, official_cols, venue_coords):
+    """Current path: melted assignments, shifted join, positional slices"""
+    assignments = build_assignments(df, official_cols, columns=['Date', 'Venue'])
+    legs = consecutive_legs(assignments, ['Venue'])
+    legs = legs.rename(columns={'Prev_Venue': 'from_venue', 'Venue': 'to_venue'})
+    legs = legs[legs['from_venue'].isin(venue_coords) & legs['to_venue'].isin(venue_coords)]
+    legs['distance'] = 0.0
+    return RefereeTravel.travel_leg_columns(legs)
+
+
+def time_it(func, *args, repeat=3):
+    """Best wall-clock time of several runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    games_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_GAMES
+    venues_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_VENUES
+
+    df = pd.read_csv(games_path)
+    df['Date'] = pd.to_datetime(df['Date'])
+    df = df.sort_values('Date')
+    official_cols = find_official_columns(df)
+    with open(venues_path, 'r') as f:
+        venue_coords = json.load(f)
+
+    print(f"📊 {len(df)} games, {len(official_cols)} official columns, {len(venue_coords)} geocoded venues")
+
+    old_time, old_legs = time_it(legs_old, df, official_cols, venue_coords, repeat=1)
+    new_time, new_legs = time_it(legs_new, df, official_cols, venue_coords)
+
+    old_count = sum(len(legs) for legs in old_legs.values())
+    new_count = sum(len(legs['date']) for legs in new_legs.values())
+
+    print(f"Old (.iloc loop):       {old_time:8.3f} s  ({old_count} legs)")
+    print(f"New (positional slice): {new_time:8.3f} s  ({new_count} legs)")
+    print(f"Speedup: {old_time / new_time:.0f}x")
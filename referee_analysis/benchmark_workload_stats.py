@@ -0,0 +1,104 @@
+"""
+Benchmark the workload statistics: per-referee loops vs. one melted table.
+
+Run from the repository root:
+    python referee_analysis/benchmark_workload_stats.py [seasons]
+
+Generates `seasons` seasons of synthetic games (three divisions, three
+officials per game, random foul counts), computes the workload and crew
+pair tables both ways and checks that they agree.
+"""
+
+import sys
+import os
+import time
+import itertools
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from workload_stats import workload_tables
+
+DIVISIONS = {'D-I': (5800, 1500), 'D-II': (4500, 1100), 'D-III': (5500, 1200)}  # games, referees
+OFFICIAL_COLS = ['Official_1', 'Official_2', 'Official_3']
+
+
+def synthetic_games(seasons, seed=0):
+    """Games with Date, Official_1..3, Foul_Differential and Total_Fouls"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for division, (n_games, n_referees) in DIVISIONS.items():
+        referees = np.array([f'{division} Referee {i}' for i in range(n_referees)], dtype=object)
+        for season in range(seasons):
+            officials = np.array([rng.choice(n_referees, 3, replace=False) for _ in range(n_games)])
+            home_fouls = rng.poisson(17, n_games)
+            away_fouls = rng.poisson(17, n_games)
+            frames.append(pd.DataFrame({
+                'Date': pd.Timestamp(f'{2015 + season}-11-01') + pd.to_timedelta(rng.integers(0, 150, n_games), unit='D'),
+                'Official_1': referees[officials[:, 0]],
+                'Official_2': referees[officials[:, 1]],
+                'Official_3': referees[officials[:, 2]],
+                'Foul_Differential': home_fouls - away_fouls,
+                'Total_Fouls': home_fouls + away_fouls,
+            }))
+    return pd.concat(frames, ignore_index=True).sort_values('Date', kind='mergesort').reset_index(drop=True)
+
+
+def workload_loop(df):
+    """Old-style path: one boolean mask per referee, pairs from itertools per game"""
+    referees = pd.unique(df[OFFICIAL_COLS].to_numpy().ravel())
+    rows = []
+    for referee in referees:
+        if pd.isna(referee):
+            continue
+        games = df[df[OFFICIAL_COLS].eq(referee).any(axis=1)]
+        days = games['Date'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+        gaps = np.diff(days)
+        rest = np.maximum(gaps - 1, 0)
+        weeks = (days + 3) // 7
+        rows.append({
+            'Referee': referee,
+            'Games_Officiated': len(games),
+            'Games_Per_Week': len(games) / ((days.max() - days.min()) // 7 + 1),
+            'Max_Games_In_Week': Counter(weeks).most_common(1)[0][1],
+            'Back_To_Backs': int((gaps == 1).sum()),
+            'Same_Day_Games': int((gaps == 0).sum()),
+            'Avg_Rest_Days': rest.mean() if len(rest) else np.nan,
+            'Avg_Foul_Differential': games['Foul_Differential'].mean(),
+        })
+
+    pairs = Counter()
+    for crew in df[OFFICIAL_COLS].itertuples(index=False):
+        pairs.update(itertools.combinations(sorted(ref for ref in crew if not pd.isna(ref)), 2))
+    return pd.DataFrame(rows), pairs
+
+
+def time_it(func, *args, repeat=3):
+    """Best wall-clock time of several runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    df = synthetic_games(seasons)
+    print(f"📊 {seasons} seasons, {len(df)} games")
+
+    loop_time, (loop_workload, loop_pairs) = time_it(workload_loop, df, repeat=1)
+    new_time, (workload, pairs) = time_it(workload_tables, df, OFFICIAL_COLS)
+
+    # Both paths must agree
+    merged = workload.merge(loop_workload, on='Referee', suffixes=('', '_loop'))
+    columns = [col for col in loop_workload.columns if col != 'Referee']
+    agree = len(merged) == len(loop_workload) == len(workload) and all(
+        np.allclose(merged[col], merged[f'{col}_loop'], equal_nan=True) for col in columns)
+    agree = agree and dict(zip(zip(pairs['Referee_A'], pairs['Referee_B']), pairs['Games_Together'])) == dict(loop_pairs)
+
+    print(f"Loop (mask per referee): {loop_time:8.3f} s")
+    print(f"Melted table:            {new_time:8.3f} s  ({len(workload)} referees, {len(pairs)} crew pairs)")
+    print(f"Speedup: {loop_time / new_time:.0f}x  {'✅ results match' if agree else '❌ results differ'}")
@@ -0,0 +1,59 @@
+"""
+Build the offline venue gazetteer bundled as dataset/venue_gazetteer.csv.
+
+Two kinds of rows:
+    arena  every venue already geocoded in venue_cache.json, by full venue name
+    city   US places with 1,000+ people from GeoNames (geonames.org, CC BY 4.0),
+           by (city, state), the most populous place winning a name clash;
+           big cities also get their ASCII alternate names ("New York")
+
+Rerun after the venue cache grows:
+    python build_gazetteer.py [venue_cache.json]
+"""
+# pip install geonamescache
+
+import os
+import sys
+import json
+import pandas as pd
+from venue_resolver import GAZETTEER_PATH, normalize_place
+
+ALIAS_MIN_POPULATION = 100000  # Alternate names are only added for cities at least this big
+
+
+def city_rows():
+    """(city, state) rows for US places from the GeoNames cities1000 table"""
+    import geonamescache
+    rows = []
+    for city in geonamescache.GeonamesCache(min_city_population=1000).get_cities().values():
+        if city['countrycode'] != 'US':
+            continue
+        names = {city['name']}
+        if city['population'] >= ALIAS_MIN_POPULATION:
+            names.update(name for name in city['alternatenames'] if name.isascii())
+        for name in names:
+            rows.append({'kind': 'city', 'name': name, 'state': city['admin1code'],
+                         'latitude': round(city['latitude'], 5), 'longitude': round(city['longitude'], 5),
+                         'population': city['population']})
+
+    cities = pd.DataFrame(rows)
+    cities['key'] = cities['name'].map(normalize_place)
+    cities = cities.sort_values('population', ascending=False).drop_duplicates(subset=['key', 'state'])
+    return cities.drop(columns=['key', 'population']).sort_values(['state', 'name'])
+
+
+def arena_rows(venue_cache_path):
+    """Rows for venues that already have coordinates"""
+    with open(venue_cache_path, 'r') as f:
+        venue_cache = json.load(f)
+    return pd.DataFrame([
+        {'kind': 'arena', 'name': venue, 'state': None, 'latitude': coords[0], 'longitude': coords[1]}
+        for venue, coords in sorted(venue_cache.items()) if coords
+    ])
+
+
+if __name__ == "__main__":
+    cache_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(GAZETTEER_PATH), 'venue_cache.json')
+    gazetteer = pd.concat([arena_rows(cache_path), city_rows()], ignore_index=True)
+    gazetteer.to_csv(GAZETTEER_PATH, index=False)
+    print(f"✅ Wrote {len(gazetteer)} gazetteer rows to '{GAZETTEER_PATH}'")
@@ -0,0 +1,171 @@
+"""
+Sparse index of which referees work together.
+
+Two scipy.sparse CSR matrices, both over referee IDs assigned in the order
+referees are first seen (so IDs never change as games are added):
+
+    incidence     game x referee, 1 where the referee worked the game
+    cooccurrence  referee x referee, games worked together; the diagonal
+                  is each referee's game count. Equal to
+                  incidence.T @ incidence, but kept up to date by adding
+                  only the new games' product when games are appended.
+
+Queries:
+    top_partners(referee, n)   the referees who shared the most games with one referee
+    games_together(a, b)       the Game_IDs and dates both referees worked
+
+The index is saved as one .npz file (no pickled objects):
+
+    python crew_index.py                   # build from the games store (or CSV)
+    python crew_index.py "Keith Kimble"    # ... and show a referee's top partners
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from assignments import find_official_columns
+from game_store import game_columns, load_games
+from venue_store import WORK_DIR
+
+CREW_INDEX = os.path.expanduser(os.environ.get('NCAA_CREW_INDEX', os.path.join(WORK_DIR, 'crew_index.npz')))
+
+
+class CrewIndex:
+    """Referee co-occurrence matrix with per-game incidence, extended in place as games are added"""
+
+    def __init__(self, path=CREW_INDEX):
+        self.path = path
+        self.referees = []                  # referee ID -> name
+        self.ids = {}                       # name -> referee ID
+        self.game_ids = np.array([], dtype=np.int64)
+        self.dates = np.array([], dtype='datetime64[D]')
+        self.incidence = sp.csr_matrix((0, 0), dtype=np.int32)
+        self.cooccurrence = sp.csr_matrix((0, 0), dtype=np.int32)
+        self._by_referee = None             # CSC copy of incidence, for column (referee) lookups
+
+    @classmethod
+    def load(cls, path=CREW_INDEX):
+        """Load a saved index, or an empty one if there is none"""
+        index = cls(path)
+        if not os.path.exists(path):
+            return index
+        with np.load(path) as saved:
+            index.referees = saved['referees'].tolist()
+            index.game_ids = saved['game_ids']
+            index.dates = saved['dates']
+            shape = (len(index.game_ids), len(index.referees))
+            indices = saved['indices']
+            index.incidence = sp.csr_matrix((np.ones(len(indices), dtype=np.int32), indices, saved['indptr']),
+                                            shape=shape)
+        index.ids = {referee: referee_id for referee_id, referee in enumerate(index.referees)}
+        index.cooccurrence = (index.incidence.T @ index.incidence).tocsr()
+        return index
+
+    def save(self):
+        """Write the index (atomic replace); the co-occurrence matrix is rebuilt on load"""
+        tmp_path = self.path + '.tmp.npz'
+        np.savez_compressed(tmp_path,
+                            referees=np.array(self.referees, dtype=str),
+                            game_ids=self.game_ids,
+                            dates=self.dates,
+                            indptr=self.incidence.indptr,
+                            indices=self.incidence.indices)
+        os.replace(tmp_path, self.path)
+
+    def _referee_ids(self, names):
+        """IDs for referee names, adding new referees"""
+        return np.fromiter((self.ids.setdefault(name, len(self.ids)) for name in names), np.int64, len(names))
+
+    def add_games(self, df, official_cols=None):
+        """
+        Add games (Game_ID, Date and the official columns) to the index; games
+        already indexed are skipped. Returns the number of games added.
+        """
+        official_cols = official_cols or find_official_columns(df)
+        # Scraped batches carry Game_ID as text; the index stores int64
+        df = df.assign(Game_ID=pd.to_numeric(df['Game_ID']).astype(np.int64))
+        df = df[~df['Game_ID'].isin(self.game_ids)].drop_duplicates(subset='Game_ID')
+        if df.empty:
+            return 0
+
+        # One (game row, referee) pair per official, referees listed twice on a game counted once
+        officials = df[official_cols].astype(object).to_numpy()
+        rows = np.repeat(np.arange(len(df)), len(official_cols))
+        names = officials.ravel()
+        present = ~pd.isna(names)
+        rows, names = rows[present], names[present]
+        referee_ids = self._referee_ids(names)
+        self.referees.extend(list(self.ids)[len(self.referees):])
+        n = len(self.referees)
+
+        new_incidence = sp.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, referee_ids)), shape=(len(df), n))
+        new_incidence.data[:] = 1  # Duplicate (game, referee) entries were summed
+        self.incidence.resize((self.incidence.shape[0], n))
+        self.cooccurrence.resize((n, n))
+        self.incidence = sp.vstack([self.incidence, new_incidence], format='csr')
+        self.cooccurrence = (self.cooccurrence + new_incidence.T @ new_incidence).tocsr()
+        self.game_ids = np.concatenate([self.game_ids, df['Game_ID'].to_numpy(dtype=np.int64)])
+        self.dates = np.concatenate([self.dates, pd.to_datetime(df['Date']).to_numpy(dtype='datetime64[D]')])
+        self._by_referee = None
+        return len(df)
+
+    def games_officiated(self, referee):
+        referee_id = self.ids.get(referee)
+        return 0 if referee_id is None else int(self.cooccurrence[referee_id, referee_id])
+
+    def top_partners(self, referee, n=10):
+        """The n referees who shared the most games with a referee (Partner, Games_Together)"""
+        referee_id = self.ids.get(referee)
+        if referee_id is None:
+            return pd.DataFrame(columns=['Partner', 'Games_Together'])
+        row = self.cooccurrence.getrow(referee_id)
+        partners, counts = row.indices, row.data
+        keep = partners != referee_id
+        partners, counts = partners[keep], counts[keep]
+
+        # Most games first, ties by name
+        names = np.array([self.referees[partner] for partner in partners], dtype=object)
+        order = np.lexsort((names, -counts))[:n]
+        return pd.DataFrame({'Partner': names[order], 'Games_Together': counts[order]})
+
+    def games_together(self, referee_a, referee_b):
+        """Game_ID and Date of every game both referees worked, in date order"""
+        if referee_a not in self.ids or referee_b not in self.ids:
+            return pd.DataFrame(columns=['Game_ID', 'Date'])
+        if self._by_referee is None:
+            self._by_referee = self.incidence.tocsc()
+        by_referee = self._by_referee
+        a, b = self.ids[referee_a], self.ids[referee_b]
+        rows = np.intersect1d(by_referee.indices[by_referee.indptr[a]:by_referee.indptr[a + 1]],
+                              by_referee.indices[by_referee.indptr[b]:by_referee.indptr[b + 1]])
+        games = pd.DataFrame({'Game_ID': self.game_ids[rows], 'Date': self.dates[rows]})
+        return games.sort_values(['Date', 'Game_ID'], kind='mergesort').reset_index(drop=True)
+
+
+def update_crew_index(new_games, path=CREW_INDEX):
+    """Add newly scraped games to the saved crew index; returns the number of games added"""
+    index = CrewIndex.load(path)
+    added = index.add_games(new_games)
+    if added:
+        index.save()
+    return added
+
+
+if __name__ == "__main__":
+    print("📊 Loading NCAA games data...")
+    columns = game_columns()
+    official_cols = find_official_columns(pd.DataFrame(columns=columns))
+    df = load_games(columns=['Game_ID', 'Date'] + official_cols)
+
+    index = CrewIndex.load()
+    added = index.add_games(df, official_cols)
+    index.save()
+    print(f"✅ Added {added} games; {len(index.game_ids)} games and {len(index.referees)} referees "
+          f"({index.cooccurrence.nnz} co-occurrence entries) in '{index.path}'")
+
+    if len(sys.argv) > 1:
+        referee = sys.argv[1]
+        print(f"\n🤝 Top partners of {referee} ({index.games_officiated(referee)} games):")
+        print(index.top_partners(referee))
@@ -0,0 +1,149 @@
+"""
+Precomputed venue-to-venue distances.
+
+Every venue gets an integer ID in the order it was added, and the distance
+for each pair of IDs (i > j) is stored once, in a condensed lower-triangular
+array at position i*(i-1)/2 + j. Adding venue k only appends its k
+distances to the earlier venues, so the file grows by appending and the
+existing entries never move. The array is memory-mapped, so travel analysis
+turns every leg into a pair of IDs and reads its distance with one fancy
+index instead of computing it.
+
+Files (per distance method and dtype):
+    distance_index_<method>.f8       the condensed distances (.f4 for float32)
+    distance_index_<method>.f8.json  the venues in ID order, with coordinates
+
+The default dtype is float64, which keeps every output identical to
+computing the distances directly. float32 halves the file (about 0.4 MB for
+450 venues) and is accurate to ~0.0003 miles, but that is enough to move a
+few legs across the 0.01-mile rounding of the outputs.
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from distance import batch_distance
+from venue_store import WORK_DIR
+
+
+def condensed_position(i, j):
+    """Position of the (i, j) distance in the condensed array; i != j"""
+    i = np.asarray(i, dtype=np.int64)
+    j = np.asarray(j, dtype=np.int64)
+    high = np.maximum(i, j)
+    low = np.minimum(i, j)
+    return high * (high - 1) // 2 + low
+
+
+class DistanceIndex:
+    """Append-only, memory-mapped condensed distance matrix keyed by venue ID"""
+
+    def __init__(self, directory=WORK_DIR, method='vincenty', dtype=np.float64):
+        self.method = method
+        self.dtype = np.dtype(dtype)
+        self.data_path = os.path.join(directory, f'distance_index_{method}.{self.dtype.str[1:]}')
+        self.meta_path = self.data_path + '.json'
+        os.makedirs(directory, exist_ok=True)
+        self.venues = []        # ID -> venue name
+        self.coords = []        # ID -> (lat, lon)
+        self.ids = {}           # venue name -> ID
+        self._matrix = None
+        self._load()
+
+    def _load(self):
+        """Read the venue list and drop any distances appended after it was last saved"""
+        try:
+            with open(self.meta_path, 'r') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            meta = {'venues': []}
+        size = len(meta['venues']) * (len(meta['venues']) - 1) // 2
+        if not os.path.exists(self.data_path) or os.path.getsize(self.data_path) < size * self.dtype.itemsize:
+            meta = {'venues': []}
+            size = 0
+        with open(self.data_path, 'ab') as f:
+            f.truncate(size * self.dtype.itemsize)
+
+        for name, lat, lon in meta['venues']:
+            self.ids[name] = len(self.venues)
+            self.venues.append(name)
+            self.coords.append((lat, lon))
+
+    def _save_meta(self):
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'method': self.method,
+                       'venues': [[name, lat, lon] for name, (lat, lon) in zip(self.venues, self.coords)]}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    @property
+    def matrix(self):
+        """The condensed distances, memory-mapped read-only"""
+        if self._matrix is None or len(self._matrix) != len(self.venues) * (len(self.venues) - 1) // 2:
+            self._matrix = (np.memmap(self.data_path, dtype=self.dtype, mode='r')
+                            if len(self.venues) > 1 else np.zeros(0, dtype=self.dtype))
+        return self._matrix
+
+    def add_venues(self, venue_coords):
+        """
+        Add venues ({name: (lat, lon)}) that are not indexed yet; returns how many were added.
+
+        A venue whose coordinates changed has its distances recomputed in place.
+        """
+        added = 0
+        with open(self.data_path, 'ab') as f:
+            for name, coords in venue_coords.items():
+                coords = (float(coords[0]), float(coords[1]))
+                if name in self.ids:
+                    if self.coords[self.ids[name]] != coords:
+                        f.flush()
+                        self._update_venue(self.ids[name], coords)
+                    continue
+                k = len(self.venues)
+                if k:
+                    row = batch_distance(np.tile(coords, (k, 1)), np.array(self.coords), method=self.method)
+                    f.write(np.asarray(row, dtype=self.dtype).tobytes())
+                self.ids[name] = k
+                self.venues.append(name)
+                self.coords.append(coords)
+                added += 1
+        self._matrix = None
+        if added:
+            self._save_meta()
+        return added
+
+    def _update_venue(self, venue_id, coords):
+        """Recompute one venue's distances after its coordinates changed"""
+        self.coords[venue_id] = coords
+        others = np.array([i for i in range(len(self.venues)) if i != venue_id], dtype=np.int64)
+        if len(others):
+            distances = batch_distance(np.tile(coords, (len(others), 1)),
+                                       np.array(self.coords)[others], method=self.method)
+            matrix = np.memmap(self.data_path, dtype=self.dtype, mode='r+')
+            matrix[condensed_position(venue_id, others)] = distances
+            matrix.flush()
+            del matrix
+        self._matrix = None
+        self._save_meta()
+
+    def venue_ids(self, venues):
+        """IDs for venue names (-1 for venues not in the index)"""
+        return pd.Index(self.venues).get_indexer(pd.Index(venues))
+
+    def lookup(self, from_ids, to_ids):
+        """Distances in miles between pairs of venue IDs (0 for a venue to itself)"""
+        from_ids = np.asarray(from_ids, dtype=np.int64)
+        to_ids = np.asarray(to_ids, dtype=np.int64)
+        distances = np.zeros(len(from_ids), dtype=np.float64)
+        different = from_ids != to_ids
+        distances[different] = self.matrix[condensed_position(from_ids[different], to_ids[different])]
+        return distances
+
+    def distances(self, from_venues, to_venues):
+        """Distances in miles between pairs of indexed venue names"""
+        from_ids = self.venue_ids(from_venues)
+        to_ids = self.venue_ids(to_venues)
+        if (from_ids < 0).any() or (to_ids < 0).any():
+            raise KeyError("Venue not in the distance index; call add_venues() first")
+        return self.lookup(from_ids, to_ids)
@@ -0,0 +1,212 @@
+"""
+Home/away foul bias per referee, with permutation and bootstrap tests.
+
+For every referee and metric (home minus away, per game):
+
+    Foul_Differential        personal fouls
+    Free_Throw_Differential  free throw attempts
+    Foul_Differential_1H/2H  personal fouls in each half
+
+the bias is the mean over the referee's games minus the mean over all
+games. Its significance comes from a permutation test: under the null
+hypothesis, a referee's games are a random draw from all games, so the
+metric values are shuffled across games (crews stay together) and each
+referee's mean is recomputed. The two-sided p-value is the share of
+shuffles whose bias is at least as far from zero as the observed one,
+and Benjamini-Hochberg q-values correct for testing every referee at
+once. A bootstrap over each referee's own games gives the standard error
+and a 95% normal confidence interval of the bias. A referee always works
+with partners, so each estimate is marginal: it is not adjusted for who
+else was on the crew.
+
+All referees are resampled together: the games x referees incidence
+matrix is sparse, so one sparse-dense product turns a block of shuffled
+metric columns into every referee's sums for the whole block. Resamples
+run in chunks, each with its own child of one numpy SeedSequence, spread
+across a process pool, so the results for a given seed are the same for
+any worker count.
+
+    python foul_bias.py [resamples] [workers]   # writes referee_foul_bias.csv
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from concurrent.futures import ProcessPoolExecutor
+from assignments import find_official_columns, build_assignments
+from game_store import game_columns, load_games
+
+# Metric name -> (home column, away column); the differential columns are home minus away already
+FOUL_METRICS = {
+    'Foul_Differential': ('Home_Personal_Fouls', 'Away_Personal_Fouls'),
+    'Free_Throw_Differential': ('Home_FTA', 'Away_FTA'),
+    'Foul_Differential_1H': ('Home_Fouls_1H', 'Away_Fouls_1H'),
+    'Foul_Differential_2H': ('Home_Fouls_2H', 'Away_Fouls_2H'),
+}
+CHUNK_SIZE = 25  # Resamples per task; fixed so a seed gives the same results for any worker count
+
+# Metric values and incidence matrix, set once per worker by _attach
+_worker = {}
+
+
+def foul_metrics(df):
+    """One float column per available metric, NaN where the game lacks the fouls"""
+    metrics = {}
+    for metric, (home_col, away_col) in FOUL_METRICS.items():
+        if home_col in df.columns and away_col in df.columns:
+            metrics[metric] = pd.to_numeric(df[home_col], errors='coerce') - pd.to_numeric(df[away_col], errors='coerce')
+        elif metric in df.columns:
+            metrics[metric] = pd.to_numeric(df[metric], errors='coerce')
+    return pd.DataFrame(metrics, index=df.index, dtype=np.float64)
+
+
+def referee_incidence(df, official_cols):
+    """(referee names, games x referees CSR matrix of 0/1) for the rows of df"""
+    assignments = build_assignments(df, official_cols, columns=[])
+    codes, referees = pd.factorize(assignments['Referee'], sort=True)
+    rows = assignments['Game_Row'].to_numpy()
+    incidence = sp.csr_matrix((np.ones(len(rows)), (rows, codes)), shape=(len(df), len(referees)))
+    return np.asarray(referees, dtype=object), incidence
+
+
+def _attach(spec):
+    """Pool initializer: keep the metric values and the referee-ordered assignment layout"""
+    _worker.clear()
+    _worker.update(spec)
+    by_referee = spec['incidence'].T.tocsr()  # referees x games, each referee's games in one row
+    games = np.diff(by_referee.indptr)
+    _worker['by_referee'] = by_referee
+    _worker['games'] = games
+    _worker['starts'] = by_referee.indptr[:-1]
+    # Per assignment (referee-ordered): metric values, and the owning referee's first position and game count
+    _worker['assignment_values'] = np.ascontiguousarray(spec['values'][by_referee.indices].T)
+    _worker['owner_start'] = np.repeat(_worker['starts'], games)
+    _worker['owner_games'] = np.repeat(games, games)
+
+
+def _resample_chunk(task):
+    """
+    Permutation exceedance counts, and bootstrap bias sums and sums of
+    squares, for one chunk of resamples; each is a referees x metrics array.
+    """
+    seed, size = task
+    rng = np.random.default_rng(seed)
+    values, by_referee, games = _worker['values'], _worker['by_referee'], _worker['games']
+    n_games, n_metrics = values.shape
+    overall, observed = _worker['overall'], _worker['observed']
+
+    # Permutation: shuffle the games under the crews, size shuffles side by side
+    order = rng.permuted(np.tile(np.arange(n_games), (size, 1)), axis=1)
+    shuffled = values[order.T].reshape(n_games, size * n_metrics)        # games x (shuffle, metric)
+    sums = (by_referee @ shuffled).reshape(len(games), size, n_metrics)
+    bias = sums / games[:, None, None] - overall
+    exceed = (np.abs(bias) >= np.abs(observed)[:, None, :] - 1e-9).sum(axis=1)
+
+    # Bootstrap: redraw each referee's games from their own games, with replacement
+    starts, owner_start, owner_games = _worker['starts'], _worker['owner_start'], _worker['owner_games']
+    picks = owner_start + (rng.random((size, len(owner_start))) * owner_games).astype(np.int64)
+    boot_sum = np.zeros((len(games), n_metrics))
+    boot_sumsq = np.zeros((len(games), n_metrics))
+    for metric, assignment_values in enumerate(_worker['assignment_values']):
+        totals = np.add.reduceat(assignment_values[picks], starts, axis=1)  # size x referees
+        boot_bias = totals / games - overall[metric]
+        boot_sum[:, metric] = boot_bias.sum(axis=0)
+        boot_sumsq[:, metric] = (boot_bias ** 2).sum(axis=0)
+    return exceed, boot_sum, boot_sumsq
+
+
+def benjamini_hochberg(p_values):
+    """Benjamini-Hochberg adjusted p-values (q-values)"""
+    p_values = np.asarray(p_values, dtype=np.float64)
+    n = len(p_values)
+    if n == 0:
+        return p_values
+    order = np.argsort(p_values, kind='mergesort')
+    scaled = p_values[order] * n / np.arange(1, n + 1)
+    q_values = np.empty(n)
+    q_values[order] = np.minimum(np.minimum.accumulate(scaled[::-1])[::-1], 1.0)
+    return q_values
+
+
+def foul_bias(df, official_cols=None, resamples=10000, seed=0, workers=None):
+    """
+    Bias, bootstrap standard error and 95% interval, permutation p-value
+    and q-value for every referee and metric (one row each), most
+    significant first within each metric.
+    """
+    official_cols = official_cols or find_official_columns(df)
+    if 'Game_ID' in df.columns:
+        df = df.drop_duplicates(subset='Game_ID')
+    metrics = foul_metrics(df)
+    complete = metrics.notna().all(axis=1).to_numpy()
+    df, metrics = df[complete].reset_index(drop=True), metrics[complete]
+
+    referees, incidence = referee_incidence(df, official_cols)
+    values = metrics.to_numpy()
+    games = np.asarray(incidence.sum(axis=0)).ravel()
+    overall = values.mean(axis=0)
+    observed = (incidence.T @ values) / games[:, None] - overall
+
+    # Fixed-size chunks, each seeded by its own child of one SeedSequence
+    sizes = [CHUNK_SIZE] * (resamples // CHUNK_SIZE) + ([resamples % CHUNK_SIZE] if resamples % CHUNK_SIZE else [])
+    tasks = list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+    spec = {'values': values, 'incidence': incidence, 'overall': overall, 'observed': observed}
+
+    workers = workers or os.cpu_count()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(spec,)) as pool:
+            chunks = list(pool.map(_resample_chunk, tasks))
+    else:
+        _attach(spec)
+        chunks = [_resample_chunk(task) for task in tasks]
+
+    exceed = sum(chunk[0] for chunk in chunks)
+    boot_mean = sum(chunk[1] for chunk in chunks) / resamples
+    boot_var = np.maximum(sum(chunk[2] for chunk in chunks) / resamples - boot_mean ** 2, 0)
+    standard_error = np.sqrt(boot_var * resamples / max(resamples - 1, 1))
+    p_values = (exceed + 1) / (resamples + 1)
+
+    frames = []
+    for position, metric in enumerate(metrics.columns):
+        frames.append(pd.DataFrame({
+            'Referee': referees,
+            'Metric': metric,
+            'Games': games.astype(np.int64),
+            'Mean': observed[:, position] + overall[position],
+            'Bias': observed[:, position],
+            'Bootstrap_SE': standard_error[:, position],
+            'CI_Low': observed[:, position] - 1.96 * standard_error[:, position],
+            'CI_High': observed[:, position] + 1.96 * standard_error[:, position],
+            'P_Value': p_values[:, position],
+            'Q_Value': benjamini_hochberg(p_values[:, position]),
+        }).sort_values(['P_Value', 'Referee'], kind='mergesort'))
+    return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == "__main__":
+    resamples = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    print("📊 Loading NCAA games data...")
+    columns = game_columns()
+    official_cols = find_official_columns(pd.DataFrame(columns=columns))
+    foul_cols = [col for pair in FOUL_METRICS.values() for col in pair] + list(FOUL_METRICS)
+    df = load_games(columns=[col for col in ['Game_ID'] + official_cols + foul_cols if col in columns])
+
+    start = time.perf_counter()
+    results = foul_bias(df, official_cols, resamples=resamples, workers=workers)
+    elapsed = time.perf_counter() - start
+
+    output_dir = os.path.expanduser('~/Desktop/workfiles')
+    os.makedirs(output_dir, exist_ok=True)
+    results.to_csv(os.path.join(output_dir, 'referee_foul_bias.csv'), index=False)
+
+    print(f"\n⚖️ {results['Referee'].nunique()} referees x {results['Metric'].nunique()} metrics, "
+          f"{resamples} resamples in {elapsed:.1f} s")
+    significant = results[results['Q_Value'] < 0.05]
+    print(f"\n{len(significant)} referee/metric results significant after correction (q < 0.05):")
+    print(significant.head(20)[['Referee', 'Metric', 'Games', 'Bias', 'CI_Low', 'CI_High', 'P_Value', 'Q_Value']])
+    print(f"\n✅ Results saved to '{os.path.join(output_dir, 'referee_foul_bias.csv')}'")
@@ -0,0 +1,138 @@
+"""
+Columnar storage for the scraped games dataset.
+
+The merged games are written as typed Parquet files, partitioned by season
+and month:
+
+    ncaa_games_data/Season=2024-25/Month=2024-11/part-0.parquet
+
+Official columns (and the team and venue names) are stored dictionary-encoded
+and come back as pandas categoricals, scores and foul counts as numbers and
+Date as a timestamp, so loaders skip the CSV text parsing entirely and can
+read just the columns they need. The CSV stays available through
+export_csv() and is used as the fallback when no store has been written.
+
+    python game_store.py ncaa_games_data_complete.csv     # build the store from a CSV
+    python game_store.py --export-csv ncaa_games_data.csv # write the store back out as CSV
+"""
+
+import os
+import sys
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.dataset as ds
+
+GAMES_STORE = os.environ.get('NCAA_GAMES_STORE', 'ncaa_games_data')
+GAMES_CSV = 'ncaa_games_data.csv'
+PARTITION_COLS = ['Season', 'Month']
+
+# String columns with few distinct values, stored dictionary-encoded
+CATEGORY_COLUMNS = ['Official_1', 'Official_2', 'Official_3', 'Home_Team', 'Away_Team', 'Venue']
+TEXT_COLUMNS = ['Game_Time']
+
+
+def season_label(dates):
+    """NCAA season of each date, e.g. '2024-25' for November 2024 through April 2025"""
+    start_year = dates.dt.year - (dates.dt.month < 7)
+    return start_year.astype(str) + '-' + ((start_year + 1) % 100).astype(str).str.zfill(2)
+
+
+def type_games(df):
+    """Give the games their storage types: timestamps, numbers and dictionary-encoded names"""
+    df = df.copy()
+    df['Date'] = pd.to_datetime(df['Date'])
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS or col.startswith('Official_'):
+            df[col] = df[col].astype('category')
+        elif col in TEXT_COLUMNS or col == 'Date':
+            continue
+        elif not pd.api.types.is_numeric_dtype(df[col]):
+            try:
+                df[col] = pd.to_numeric(df[col])
+            except (ValueError, TypeError):
+                pass
+    if 'Game_ID' in df.columns:
+        df['Game_ID'] = df['Game_ID'].astype('int64')
+    return df
+
+
+def _partitioned(df):
+    """Add the partition columns (as plain strings) to typed games"""
+    return df.assign(Season=season_label(df['Date']), Month=df['Date'].dt.strftime('%Y-%m'))
+
+
+def write_games(df, store_dir=GAMES_STORE):
+    """Write games to the store, replacing every season/month partition they fall in"""
+    table = pa.Table.from_pandas(_partitioned(type_games(df)), preserve_index=False)
+    pq.write_to_dataset(table, store_dir, partition_cols=PARTITION_COLS,
+                        existing_data_behavior='delete_matching',
+                        basename_template='part-{i}.parquet')
+    return len(df)
+
+
+def append_games(new_games, store_dir=GAMES_STORE):
+    """Add games that are not stored yet, rewriting only the month partitions they touch"""
+    new_games = _partitioned(type_games(new_games))
+    if not os.path.exists(store_dir):
+        return write_games(new_games.drop(columns=PARTITION_COLS), store_dir)
+
+    months = new_games['Month'].unique().tolist()
+    existing = ds.dataset(store_dir, format='parquet', partitioning='hive')
+    existing = existing.to_table(filter=ds.field('Month').isin(months)).to_pandas()
+
+    if 'Game_ID' in new_games.columns:
+        new_games = new_games[~new_games['Game_ID'].isin(existing['Game_ID'])]
+    combined = pd.concat([existing.drop(columns=PARTITION_COLS, errors='ignore'),
+                          new_games.drop(columns=PARTITION_COLS)], ignore_index=True)
+    write_games(combined.sort_values('Date', kind='mergesort'), store_dir)
+    return len(new_games)
+
+
+def has_store(store_dir=GAMES_STORE):
+    """True if the columnar store has been written"""
+    return os.path.isdir(store_dir) and any(files for _, _, files in os.walk(store_dir))
+
+
+def game_columns(store_dir=GAMES_STORE, csv_path=GAMES_CSV):
+    """Column names of the games dataset, without loading any rows"""
+    if has_store(store_dir):
+        schema = ds.dataset(store_dir, format='parquet', partitioning='hive').schema
+        return [name for name in schema.names if name not in PARTITION_COLS]
+    return pd.read_csv(csv_path, nrows=0).columns.tolist()
+
+
+def load_games(columns=None, store_dir=GAMES_STORE, csv_path=GAMES_CSV):
+    """
+    Load the games, reading only the requested columns.
+
+    Reads the columnar store when it exists and falls back to the CSV.
+    Rows come back in date order, partition by partition.
+    """
+    if not has_store(store_dir):
+        return pd.read_csv(csv_path, usecols=columns)
+
+    dataset = ds.dataset(store_dir, format='parquet', partitioning='hive')
+    if columns is None:
+        columns = [name for name in dataset.schema.names if name not in PARTITION_COLS]
+    return dataset.to_table(columns=list(columns)).to_pandas()
+
+
+def export_csv(csv_path=GAMES_CSV, store_dir=GAMES_STORE):
+    """Write the whole store back out as one CSV"""
+    df = load_games(store_dir=store_dir)
+    df['Date'] = df['Date'].dt.strftime('%Y-%m-%d')
+    df.to_csv(csv_path, index=False)
+    return csv_path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == '--export-csv':
+        print(f"✅ Exported games to '{export_csv(sys.argv[2])}'")
+    else:
+        source = sys.argv[1] if len(sys.argv) > 1 else 'ncaa_games_data_complete.csv'
+        if os.path.exists(GAMES_STORE):
+            shutil.rmtree(GAMES_STORE)
+        count = write_games(pd.read_csv(source))
+        print(f"✅ Wrote {count} games from '{source}' to '{GAMES_STORE}'")
@@ -9,63 +9,57 @@ import pandas as pd
 import numpy as np
 from geopy.distance import geodesic
 from geopy.geocoders import Nominatim
-import time
 import os
+import sys
 import json
+from distance import batch_distance
+from assignments import find_official_columns, build_assignments, consecutive_legs, referee_blocks
+import game_store
+from venue_resolver import VenueResolver
+from venue_store import VENUE_DB, WORK_DIR, VenueStore
+from distance_index import DistanceIndex
+from parallel_travel import parallel_travel_blocks
+import travel_legs
+
+BLOCK_ROWS = 65536  # Assignments per block of whole referees; legs exist for one block at a time
 
 class RefereeTravel:
-    def __init__(self):
+    def __init__(self, distance_method='vincenty', venue_db=VENUE_DB, details_json=False):
         """Initialize the referee travel analyzer"""
-        self.data_path = 'ncaa_games_data.csv'
-        self.venue_cache_path = os.path.expanduser('~/Desktop/workfiles/venue_cache.json')
-        self.output_dir = os.path.expanduser('~/Desktop/workfiles')
+        self.data_path = 'ncaa_games_data.csv'  # CSV fallback when there is no columnar store
+        self.games_store = game_store.GAMES_STORE
+        self.distance_method = distance_method  # 'vincenty' (matches geodesic) or 'haversine' (fastest)
+        self.venue_cache_path = os.path.join(WORK_DIR, 'venue_cache.json')  # Legacy, imported once
+        self.venue_db = venue_db  # Shared SQLite venue store (NCAA_VENUE_DB)
+        self.output_dir = WORK_DIR  # Same directory as the venue store and distance index (NCAA_WORK_DIR)
+        self.details_json = details_json  # Also write referee_travel_details.json (the Arrow leg files are always written)
+        self.block_rows = BLOCK_ROWS  # Assignments per block of referees, and legs per Arrow record batch
         os.makedirs(self.output_dir, exist_ok=True)
         
         # Initialize the geocoder
         self.geolocator = Nominatim(user_agent="ncaa_referee_analysis")
-        self.venue_cache = self.load_venue_cache()
-    
-    def load_venue_cache(self):
-        """Load venue coordinates from cache file"""
-        try:
-            with open(self.venue_cache_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        self.venue_store = self.load_venue_store()
+        
+        # Venue store and bundled gazetteer first; only unknown venues go to Nominatim (1 request/second)
+        self.resolver = VenueResolver(cache=self.venue_store, geocoder=self.geolocator, rate=1.0)
+        
+        # Venue-to-venue distances, computed once per venue and then looked up
+        self.distance_index = DistanceIndex(WORK_DIR, method=distance_method)
     
-    def save_venue_cache(self):
-        """Save venue coordinates to cache file"""
-        with open(self.venue_cache_path, 'w') as f:
-            json.dump(self.venue_cache, f, indent=2)
+    def load_venue_store(self):
+        """Open the venue store, importing the old venue_cache.json the first time"""
+        store = VenueStore(self.venue_db)
+        if len(store) == 0:
+            imported = store.import_json(self.venue_cache_path)
+            if imported:
+                print(f"📥 Imported {imported} venues from '{self.venue_cache_path}' into '{self.venue_db}'")
+        return store
     
     def get_venue_coordinates(self, venue):
-        """Get coordinates for a venue with caching"""
+        """Get coordinates for a venue (cache, then gazetteer, then geocoder)"""
         if not venue or pd.isna(venue):
             return None
-        
-        venue = str(venue).strip()
-        
-        # Check cache first
-        if venue in self.venue_cache:
-            return self.venue_cache[venue]
-        
-        try:
-            print(f"🔍 Geocoding venue: {venue}")
-            location = self.geolocator.geocode(venue)
-            time.sleep(1)  # Respect API limits
-            
-            if location:
-                coords = (location.latitude, location.longitude)
-                self.venue_cache[venue] = coords
-                self.save_venue_cache()
-                return coords
-            
-            print(f"⚠️ Could not geocode: {venue}")
-            return None
-            
-        except Exception as e:
-            print(f"❌ Error geocoding {venue}: {str(e)}")
-            return None
+        return self.resolver.resolve_all([venue]).get(venue)
     
     def calculate_distance(self, coord1, coord2):
         """Calculate distance between two coordinates in miles"""
@@ -73,20 +67,203 @@ class RefereeTravel:
             return None
         return geodesic(coord1, coord2).miles
     
-    def analyze_travel(self):
-        """Analyze travel distances for referees"""
-        print("📊 Loading NCAA games data...")
-        df = pd.read_csv(self.data_path)
+    def calculate_distances(self, from_coords, to_coords):
+        """Calculate distances in miles for arrays of (lat, lon) pairs in one vectorized call"""
+        return batch_distance(from_coords, to_coords, method=self.distance_method)
+    
+    EMPTY_LEGS = {
+        'date': np.array([], dtype='datetime64[ns]'),
+        'from_venue': np.array([], dtype=object),
+        'to_venue': np.array([], dtype=object),
+        'distance': np.array([], dtype=np.float64)
+    }
+    
+    @staticmethod
+    def travel_leg_columns(legs):
+        """Split a referee-sorted legs table into per-referee columnar records by positional slicing"""
+        referees = legs['Referee'].to_numpy()
+        columns = {
+            'date': legs['Date'].to_numpy(),
+            'from_venue': legs['from_venue'].to_numpy(),
+            'to_venue': legs['to_venue'].to_numpy(),
+            'distance': legs['distance'].to_numpy(dtype=np.float64)
+        }
+        
+        # Each referee's legs are one contiguous block
+        starts = np.flatnonzero(np.r_[True, referees[1:] != referees[:-1]]) if len(referees) else np.array([], dtype=int)
+        ends = np.r_[starts[1:], len(referees)]
+        
+        return {
+            referees[start]: {name: values[start:end] for name, values in columns.items()}
+            for start, end in zip(starts, ends)
+        }
+    
+    @staticmethod
+    def leg_records(leg_columns):
+        """Expand columnar legs into the list-of-dicts layout used by referee_travel_details.json"""
+        return [
+            {
+                'date': date,
+                'from_venue': from_venue,
+                'to_venue': to_venue,
+                'distance': round(float(distance), 2)
+            }
+            for date, from_venue, to_venue, distance in zip(
+                pd.DatetimeIndex(leg_columns['date']), leg_columns['from_venue'],
+                leg_columns['to_venue'], leg_columns['distance'])
+        ]
+    
+    def load_games(self, df=None):
+        """Load the games (or take a DataFrame of games), parse dates and sort by date"""
+        if df is None:
+            print("📊 Loading NCAA games data...")
+            # Only the date, official and venue columns are needed
+            columns = [col for col in game_store.game_columns(self.games_store, self.data_path)
+                       if any(key in col.lower() for key in ('date', 'official', 'ref', 'venue'))]
+            df = game_store.load_games(columns, store_dir=self.games_store, csv_path=self.data_path)
         
-        # Step 1: Convert date column and sort by date
         date_col = [col for col in df.columns if 'date' in col.lower()][0]
         df['Date'] = pd.to_datetime(df[date_col])
-        df = df.sort_values('Date')
+        return df.sort_values('Date')
+    
+    def geocode_venues(self, venues):
+        """Coordinates for every venue that can be resolved, geocoding unknown ones as one batch"""
+        return self.resolver.resolve_all([venue for venue in venues if not pd.isna(venue)])
+    
+    def compute_legs(self, assignments, venue_col, venue_coords):
+        """Legs between each referee's consecutive games, with distances, sorted by referee"""
+        # Pair each game with the same referee's previous game
+        legs = consecutive_legs(assignments, [venue_col])
+        legs = legs.rename(columns={f'Prev_{venue_col}': 'from_venue', venue_col: 'to_venue'})
+        legs = legs[legs['from_venue'].isin(venue_coords) & legs['to_venue'].isin(venue_coords)]
+        
+        # Index any new venues, then look up every leg's distance
+        self.distance_index.add_venues(venue_coords)
+        legs['distance'] = self.distance_index.distances(legs['from_venue'], legs['to_venue'])
+        return legs[legs['distance'] > 0]
+    
+    @property
+    def state_path(self):
+        return os.path.join(self.output_dir, 'referee_travel_state.json')
+    
+    @property
+    def details_path(self):
+        return os.path.join(self.output_dir, 'referee_travel_details.json')
+    
+    def load_travel_state(self):
+        """Load the per-referee running totals saved by the last run"""
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    
+    def save_travel_state(self, state):
+        """Save the per-referee running totals (atomic replace)"""
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+    
+    @staticmethod
+    def update_travel_state(state, assignments, venue_col, legs):
+        """Add a batch of assignments and their legs to the per-referee running totals in place"""
+        games = assignments.groupby('Referee').size()
+        last_games = assignments.groupby('Referee').tail(1)
+        leg_stats = legs.groupby('Referee')['distance'].agg(['sum', 'max', 'size'])
+        
+        for referee, date, venue in zip(last_games['Referee'], last_games['Date'], last_games[venue_col]):
+            entry = state.setdefault(referee, {'games': 0, 'total_miles': 0.0, 'max_leg': 0.0, 'legs': 0})
+            entry['games'] += int(games[referee])
+            if referee in leg_stats.index:
+                entry['total_miles'] += float(leg_stats.at[referee, 'sum'])
+                entry['max_leg'] = max(entry['max_leg'], float(leg_stats.at[referee, 'max']))
+                entry['legs'] += int(leg_stats.at[referee, 'size'])
+            entry['last_date'] = str(date)
+            entry['last_venue'] = None if pd.isna(venue) else venue
+        return state
+    
+    @staticmethod
+    def travel_record(referee, entry, travel_legs):
+        """One referee's entry in referee_travel_details.json"""
+        games_officiated = entry['games']
+        total_distance = entry['total_miles']
+        return {
+            'referee': referee,
+            'games_officiated': games_officiated,
+            'total_travel_miles': round(total_distance, 2),
+            'avg_miles_per_trip': round(total_distance / (games_officiated - 1), 2) if games_officiated > 1 else 0,
+            'travel_legs': travel_legs
+        }
+    
+    @classmethod
+    def travel_results(cls, assignments, venue_col, legs):
+        """Running totals per referee (including one-game referees) and each referee's legs as columns"""
+        state = cls.update_travel_state({}, assignments, venue_col, legs)
+        return state, cls.travel_leg_columns(legs)
+    
+    def travel_blocks(self, assignments, venue_col, venue_coords):
+        """Yield travel_results for contiguous blocks of whole referees of a referee-sorted assignment table"""
+        self.distance_index.add_venues(venue_coords)
+        for start, end in referee_blocks(assignments, self.block_rows):
+            block = assignments.iloc[start:end]
+            yield self.travel_results(block, venue_col, self.compute_legs(block, venue_col, venue_coords))
+    
+    def iter_travel_records(self, state, leg_columns):
+        """Yield (record, leg columns) one referee at a time, in name order, skipping one-game referees"""
+        for referee in sorted(state):
+            if state[referee]['games'] > 1:
+                yield self.travel_record(referee, state[referee], []), leg_columns.get(referee, self.EMPTY_LEGS)
+    
+    def save_travel_outputs(self, blocks):
+        """
+        Stream blocks of (state, leg columns), each covering whole referees,
+        into the Arrow leg files and referee_travel.csv (most traveled first),
+        and optionally the details JSON; returns (travel_df, state).
+        """
+        state, summary_rows = {}, []
+        with travel_legs.TravelLegsWriter(self.output_dir, self.resolver.resolve_offline,
+                                          batch_rows=self.block_rows) as legs_writer:
+            for block_state, block_legs in blocks:
+                state.update(block_state)
+                for record, columns in self.iter_travel_records(block_state, block_legs):
+                    legs_writer.write(record, columns)
+                    
+                    # The summary row comes from the running totals, not the legs
+                    entry = block_state[record['referee']]
+                    summary_rows.append({
+                        'Referee': record['referee'],
+                        'Games_Officiated': record['games_officiated'],
+                        'Total_Travel_Miles': record['total_travel_miles'],
+                        'Avg_Miles_Per_Trip': record['avg_miles_per_trip'],
+                        'Max_Single_Trip': round(entry['max_leg'], 2) if len(columns['distance']) else 0
+                    })
+        
+        travel_df = pd.DataFrame(summary_rows, columns=['Referee', 'Games_Officiated', 'Total_Travel_Miles',
+                                                        'Avg_Miles_Per_Trip', 'Max_Single_Trip'])
+        travel_df = travel_df.sort_values('Total_Travel_Miles', ascending=False, kind='mergesort').reset_index(drop=True)
+        output_path = os.path.join(self.output_dir, 'referee_travel.csv')
+        travel_df.to_csv(output_path, index=False)
+        print(f"\n✅ Results saved to '{output_path}' and '{os.path.join(self.output_dir, travel_legs.LEGS_FILE)}'")
+        
+        if self.details_json:
+            self.save_travel_details(state, travel_df['Referee'])
+            print(f"✅ Travel details saved to '{self.details_path}'")
+        return travel_df, state
+    
+    def save_travel_details(self, state, referees):
+        """Write referee_travel_details.json in the given order, rereading each referee's legs from the Arrow files"""
+        with travel_legs.DetailsJsonWriter(self.details_path) as details_json:
+            for referee, columns in travel_legs.iter_referee_legs(self.output_dir, referees):
+                details_json.write(self.travel_record(referee, state[referee], self.leg_records(columns)))
+    
+    def analyze_travel(self, workers=None):
+        """Analyze travel distances for referees (in a pool of worker processes when workers > 1)"""
+        # Step 1: Load games sorted by date
+        df = self.load_games()
         
         # Step 2: Find official columns
-        official_cols = [col for col in df.columns if 'official' in col.lower() and '_' in col]
-        if not official_cols:
-            official_cols = [col for col in df.columns if 'ref' in col.lower() and '_' in col]
+        official_cols = find_official_columns(df)
         
         if not official_cols:
             print("❌ Could not find official columns in the dataset")
@@ -100,99 +277,98 @@ class RefereeTravel:
         # Step 4: Start geocoding venues
         print("\n🏟️ Geocoding venues...")
         venues = df[venue_col].unique()
-        venue_coords = {}
-        
-        for venue in venues:
-            if pd.isna(venue):
-                continue
-            coords = self.get_venue_coordinates(venue)
-            if coords:
-                venue_coords[venue] = coords
+        venue_coords = self.geocode_venues(venues)
         
         print(f"✅ Geocoded {len(venue_coords)} venues out of {len(venues)}")
         
         # Step 5: Calculate travel for each referee
         print("\n🧮 Calculating referee travel distances...")
         
-        # Create a list of all referees
-        all_refs = []
-        for col in official_cols:
-            refs = df[col].dropna().unique()
-            all_refs.extend(refs)
-        
-        # Get unique referees
-        unique_refs = set(all_refs)
-        print(f"Found {len(unique_refs)} unique referees")
-        
-        # Calculate travel for each referee
-        referee_travel = []
-        
-        for referee in unique_refs:
-            # Get games for this referee
-            ref_games = df[df[official_cols].eq(referee).any(axis=1)].copy()
-            
-            if len(ref_games) <= 1:
-                continue  # Skip referees with only one game
-            
-            # Sort by date
-            ref_games = ref_games.sort_values('Date')
-            
-            # Calculate travel distances
-            total_distance = 0
-            travel_legs = []
-            
-            for i in range(1, len(ref_games)):
-                prev_venue = ref_games.iloc[i-1][venue_col]
-                curr_venue = ref_games.iloc[i][venue_col]
-                
-                prev_coords = venue_coords.get(prev_venue)
-                curr_coords = venue_coords.get(curr_venue)
-                
-                if prev_coords and curr_coords:
-                    distance = self.calculate_distance(prev_coords, curr_coords)
-                    if distance:
-                        total_distance += distance
-                        travel_legs.append({
-                            'date': ref_games.iloc[i]['Date'],
-                            'from_venue': prev_venue,
-                            'to_venue': curr_venue,
-                            'distance': round(distance, 2)
-                        })
-            
-            # Add referee travel stats
-            referee_travel.append({
-                'referee': referee,
-                'games_officiated': len(ref_games),
-                'total_travel_miles': round(total_distance, 2),
-                'avg_miles_per_trip': round(total_distance / (len(ref_games) - 1), 2) if len(ref_games) > 1 else 0,
-                'travel_legs': travel_legs
-            })
-        
-        # Sort by total travel distance
-        referee_travel.sort(key=lambda x: x['total_travel_miles'], reverse=True)
-        
-        # Step 6: Create summary DataFrame
-        travel_df = pd.DataFrame([
-            {
-                'Referee': r['referee'],
-                'Games_Officiated': r['games_officiated'],
-                'Total_Travel_Miles': r['total_travel_miles'],
-                'Avg_Miles_Per_Trip': r['avg_miles_per_trip'],
-                'Max_Single_Trip': max([leg['distance'] for leg in r['travel_legs']]) if r['travel_legs'] else 0
-            }
-            for r in referee_travel
-        ])
+        # Melt the official columns once into a (referee, game) table, sorted by referee and date
+        assignments = build_assignments(df, official_cols, columns=['Date', venue_col])
         
-        # Step 7: Save results
-        output_path = os.path.join(self.output_dir, 'referee_travel.csv')
-        travel_df.to_csv(output_path, index=False)
+        # Step 6: Stream blocks of referees straight into the outputs, so legs never exist for everyone at once
+        if workers is not None and workers > 1:
+            blocks = parallel_travel_blocks(assignments, venue_col, venue_coords, self.distance_index, workers=workers)
+        else:
+            blocks = self.travel_blocks(assignments, venue_col, venue_coords)
+        travel_df, state = self.save_travel_outputs(blocks)
+        self.save_travel_state(state)
+        print(f"Found {len(state)} unique referees")
+        
+        # Step 7: Display summary
+        self.print_summary(travel_df)
+        return travel_df
+    
+    def update_travel(self, new_games):
+        """
+        Add newly scraped games to the saved travel results.
         
-        # Also save the detailed travel legs for further analysis
-        details_path = os.path.join(self.output_dir, 'referee_travel_details.json')
-        with open(details_path, 'w') as f:
-            json.dump(referee_travel, f, indent=2, default=str)
+        Each referee's chain continues from the last game in the saved state,
+        so only the new legs are geocoded and measured, and only the referees
+        who worked a new game have their totals changed. Falls back to a full
+        analyze_travel() when there is no saved state or when a new game is
+        dated before the latest game already counted.
+        """
+        state = self.load_travel_state()
+        if state is None or not travel_legs.has_travel_legs(self.output_dir):
+            print("⚠️ No saved travel state, running the full analysis")
+            return self.analyze_travel()
         
-        # Step 8: Display summary
+        df = self.load_games(new_games.copy())
+        if df.empty:
+            print("✅ No new games, travel results are up to date")
+            return None
+        
+        latest = max(pd.Timestamp(entry['last_date']) for entry in state.values())
+        if df['Date'].min() < latest:
+            print(f"⚠️ New games start before {latest.date()}, running the full analysis")
+            return self.analyze_travel()
+        
+        official_cols = find_official_columns(df)
+        if not official_cols:
+            print("❌ Could not find official columns in the new games")
+            return None
+        venue_col = [col for col in df.columns if 'venue' in col.lower()][0]
+        
+        # Seed each returning referee's chain with their last counted game
+        assignments = build_assignments(df, official_cols, columns=['Date', venue_col])
+        returning = [referee for referee in pd.unique(assignments['Referee']) if referee in state]
+        seeds = pd.DataFrame({
+            'Referee': returning,
+            'Game_Row': -1,
+            'Date': pd.to_datetime([state[referee]['last_date'] for referee in returning]),
+            venue_col: [state[referee]['last_venue'] for referee in returning]
+        })
+        chains = pd.concat([seeds, assignments], ignore_index=True)
+        chains = chains.sort_values('Referee', kind='mergesort').reset_index(drop=True)
+        
+        # Only the venues in these chains need coordinates
+        print("\n🏟️ Geocoding new venues...")
+        venue_coords = self.geocode_venues(pd.unique(chains[venue_col]))
+        
+        print(f"\n🧮 Adding {len(df)} games for {assignments['Referee'].nunique()} referees...")
+        legs = self.compute_legs(chains, venue_col, venue_coords)
+        self.update_travel_state(state, assignments, venue_col, legs)
+        
+        # Rewrite the outputs one referee at a time: saved legs followed by the new ones
+        travel_df, state = self.save_travel_outputs(self.updated_travel_blocks(state, legs))
+        self.save_travel_state(state)
+        
+        self.print_summary(travel_df)
+        return travel_df
+    
+    def updated_travel_blocks(self, state, new_legs):
+        """Yield one block per referee in state: their saved legs, read back from the Arrow files, plus their new legs"""
+        new_columns = self.travel_leg_columns(new_legs)
+        for referee, saved_legs in travel_legs.iter_referee_legs(self.output_dir, sorted(state)):
+            added = new_columns.get(referee)
+            columns = saved_legs if added is None else {
+                name: np.concatenate([saved_legs[name], values]) for name, values in added.items()}
+            yield {referee: state[referee]}, {referee: columns}
+    
+    def print_summary(self, travel_df):
+        """Print the headline travel numbers"""
         print("\n📊 Referee Travel Summary:")
         print(f"Total referees analyzed: {len(travel_df)}")
         print(f"Average travel per referee: {travel_df['Total_Travel_Miles'].mean():.2f} miles")
@@ -201,11 +377,10 @@ class RefereeTravel:
         
         print("\nTop 10 Most Traveled Referees:")
         print(travel_df.head(10))
-        
-        print(f"\n✅ Results saved to '{output_path}' and '{details_path}'")
-        
-        return travel_df
 
 if __name__ == "__main__":
-    analyzer = RefereeTravel()
-    travel_df = analyzer.analyze_travel() 
+    # Optional worker count, and --json to also write referee_travel_details.json: python geolocator.py 8 --json
+    args = [arg for arg in sys.argv[1:] if arg != '--json']
+    workers = int(args[0]) if args else None
+    analyzer = RefereeTravel(details_json='--json' in sys.argv)
+    travel_df = analyzer.analyze_travel(workers=workers)
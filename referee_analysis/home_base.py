@@ -0,0 +1,240 @@
+"""
+Estimated home base per referee, and travel as home -> venues -> home trips.
+
+A referee's home base is estimated as the weighted geometric median of the
+venues they worked (each venue weighted by its number of games): the point
+with the smallest total great-circle distance to their games. Unlike the
+mean it is not dragged across the country by one far-away tournament.
+
+The median is found with Weiszfeld's algorithm on the unit sphere, for all
+referees at once. With venues as unit vectors p_i and the current estimate
+x, each step moves to
+
+    x' = normalize( sum_i w_i p_i / sin(angle(x, p_i)) )
+
+the fixed point of the gradient of the weighted sum of arc lengths. Every
+(referee, venue) pair is one row of flat arrays, so a step is a few
+vectorized operations plus a bincount per coordinate. Weiszfeld crawls when
+the median is one of the venues (typically a referee's most-worked gym), so
+before iterating, every venue of every referee is tested once with Kuhn's
+condition: if the other venues' combined pull towards it is no stronger
+than its own weight, that venue is the median and the referee is settled
+without any steps. The other referees start from their weighted centroid
+and take over-relaxed Weiszfeld steps until a step moves less than
+tolerance_miles; the budget is max_iterations steps.
+
+Trips come from itinerary.build_itineraries: each trip is travelled as
+home -> first venue -> ... -> last venue -> home, so
+
+    Home_Travel_Miles   sum over trips of the two home legs plus the miles
+                        between the trip's games
+    Chain_Travel_Miles  the straight chain of consecutive venues, as in
+                        referee_travel.csv (ordered by tip-off here)
+
+    python home_base.py [home_gap_hours]   # writes referee_home_travel.csv
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+from assignments import find_official_columns, build_assignments
+from distance import EARTH_RADIUS_MILES, batch_distance
+
+MAX_ITERATIONS = 200        # Weiszfeld steps per referee at most
+TOLERANCE_MILES = 0.01      # A referee has converged once a step moves the estimate less than this
+OVER_RELAXATION = 1.8      # Step length multiplier tried on every Weiszfeld step
+MIN_ANGLE = 1e-12           # Floor on sin(angle) when the estimate sits on a venue (about 4 microns)
+
+
+def unit_vectors(latitude, longitude):
+    """(n, 3) unit vectors for latitudes and longitudes in degrees"""
+    lat, lon = np.radians(latitude), np.radians(longitude)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def lat_lon(vectors):
+    """(latitudes, longitudes) in degrees of (n, 3) unit vectors"""
+    return (np.degrees(np.arctan2(vectors[:, 2], np.hypot(vectors[:, 0], vectors[:, 1]))),
+            np.degrees(np.arctan2(vectors[:, 1], vectors[:, 0])))
+
+
+def _group_sums(groups, vectors, weights, n_groups):
+    """Weighted sum of the vectors in each group, normalized to unit length"""
+    sums = np.column_stack([np.bincount(groups, weights * vectors[:, k], minlength=n_groups) for k in range(3)])
+    return sums / np.linalg.norm(sums, axis=1, keepdims=True)
+
+
+def _total_arcs(groups, points, weights, median, n_groups):
+    """Weighted sum of the angles from each group's estimate to its points"""
+    cosines = np.clip(np.einsum('ij,ij->i', median[groups], points), -1.0, 1.0)
+    return np.bincount(groups, weights * np.arccos(cosines), minlength=n_groups)
+
+
+def _vertex_medians(groups, points, weights, n_groups):
+    """
+    (median, found) per group for the groups whose median is one of their
+    points, by Kuhn's condition: p_j is the median if the other points'
+    combined pull on it (each w_i times the unit tangent at p_j towards p_i)
+    is no stronger than its own weight. Tests every pair of points within
+    each group at once.
+    """
+    order = np.argsort(groups, kind='stable')
+    groups, points, weights = groups[order], points[order], weights[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    group_start = np.cumsum(counts) - counts
+
+    # Pair rows: every point of a group (vertex) with every point of the same group (other)
+    per_row = counts[groups]
+    vertex_rows = np.repeat(np.arange(len(groups)), per_row)
+    other_rows = group_start[groups][vertex_rows] + np.arange(len(vertex_rows)) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+
+    vertex, other, other_weights = points[vertex_rows], points[other_rows], weights[other_rows]
+    sines = np.linalg.norm(np.cross(vertex, other), axis=1)
+    coincident = sines < MIN_ANGLE
+    tangents = other - np.einsum('ij,ij->i', vertex, other)[:, None] * vertex
+    pull_weights = np.where(coincident, 0.0, other_weights / np.maximum(sines, MIN_ANGLE))
+    pull = np.column_stack([np.bincount(vertex_rows, pull_weights * tangents[:, k], minlength=len(groups))
+                            for k in range(3)])
+    own_weight = np.bincount(vertex_rows, np.where(coincident, other_weights, 0.0), minlength=len(groups))
+
+    optimal = np.flatnonzero(np.linalg.norm(pull, axis=1) <= own_weight)
+    median = np.zeros((n_groups, 3))
+    found = np.zeros(n_groups, dtype=bool)
+    median[groups[optimal]] = points[optimal]
+    found[groups[optimal]] = True
+    return median, found
+
+
+def weighted_spherical_median(groups, latitude, longitude, weights, n_groups,
+                              max_iterations=MAX_ITERATIONS, tolerance_miles=TOLERANCE_MILES):
+    """
+    (latitudes, longitudes, iterations, converged) of the weighted geometric
+    median of each group's points; groups are integer codes 0..n_groups-1,
+    and every group needs at least one point.
+    """
+    points = unit_vectors(latitude, longitude)
+    weights = np.asarray(weights, dtype=np.float64)
+    # Referees whose median is a venue are settled up front; the rest start from the weighted centroid
+    vertex, found = _vertex_medians(groups, points, weights, n_groups)
+    median = np.where(found[:, None], vertex, _group_sums(groups, points, weights, n_groups))
+    iterations = np.zeros(n_groups, dtype=np.int64)
+    active = ~found
+
+    for _ in range(max_iterations):
+        # Only the rows of referees still moving, with their groups renumbered 0..n-1
+        moving = np.flatnonzero(active)
+        if not len(moving):
+            break
+        rows = active[groups]
+        local, local_points, local_weights = np.searchsorted(moving, groups[rows]), points[rows], weights[rows]
+        current = median[moving]
+
+        sines = np.maximum(np.linalg.norm(np.cross(current[local], local_points), axis=1), MIN_ANGLE)
+        step = _group_sums(local, local_points, local_weights / sines, len(moving))
+
+        # Over-relaxed step (Ostresh), kept where it lowers the total distance further
+        stretched = step + (OVER_RELAXATION - 1) * (step - current)
+        stretched /= np.linalg.norm(stretched, axis=1, keepdims=True)
+        better = (_total_arcs(local, local_points, local_weights, stretched, len(moving))
+                  < _total_arcs(local, local_points, local_weights, step, len(moving)))
+        step[better] = stretched[better]
+
+        moved = 2 * EARTH_RADIUS_MILES * np.arcsin(np.minimum(np.linalg.norm(step - current, axis=1) / 2, 1.0))
+        median[moving] = step
+        iterations[moving] += 1
+        active[moving[moved < tolerance_miles]] = False
+
+    latitudes, longitudes = lat_lon(median)
+    return latitudes, longitudes, iterations, ~active
+
+
+def home_bases(df, venue_coords, official_cols=None, **options):
+    """
+    Estimated home base of every referee with at least one located game:
+    Referee, Home_Latitude, Home_Longitude, Venues, Games, Iterations,
+    Converged. options go to weighted_spherical_median.
+    """
+    official_cols = official_cols or find_official_columns(df)
+    venue_col = [col for col in df.columns if 'venue' in col.lower()][0]
+    games = df[official_cols + [venue_col]].astype(object)
+    assignments = build_assignments(games, official_cols, columns=[venue_col])
+    assignments = assignments[assignments[venue_col].isin(venue_coords)]
+
+    # One row per (referee, venue), weighted by the games there
+    visits = assignments.groupby(['Referee', venue_col], sort=True).size().rename('Games').reset_index()
+    codes, referees = pd.factorize(visits['Referee'], sort=True)
+    coords = np.array([venue_coords[venue] for venue in visits[venue_col]], dtype=np.float64).reshape(-1, 2)
+
+    latitudes, longitudes, iterations, converged = weighted_spherical_median(
+        codes, coords[:, 0], coords[:, 1], visits['Games'].to_numpy(), len(referees), **options)
+    return pd.DataFrame({
+        'Referee': pd.Series(np.asarray(referees, dtype=object), dtype=object),
+        'Home_Latitude': latitudes,
+        'Home_Longitude': longitudes,
+        'Venues': np.bincount(codes, minlength=len(referees)),
+        'Games': np.bincount(codes, visits['Games'].to_numpy(), minlength=len(referees)).astype(np.int64),
+        'Iterations': iterations,
+        'Converged': converged,
+    })
+
+
+def home_travel(trips, legs, homes, venue_coords, method='vincenty'):
+    """
+    Per referee: trips, miles travelled as home -> venues -> home trips,
+    and the chain-of-venues miles, joined to their home bases.
+    """
+    located = trips[trips['Referee'].isin(homes['Referee'])]
+    home = homes.set_index('Referee').loc[located['Referee'], ['Home_Latitude', 'Home_Longitude']].to_numpy()
+    missing = (np.nan, np.nan)
+    first = np.array([venue_coords.get(venue, missing) for venue in located['First_Venue']], dtype=np.float64).reshape(-1, 2)
+    last = np.array([venue_coords.get(venue, missing) for venue in located['Last_Venue']], dtype=np.float64).reshape(-1, 2)
+
+    # Unlocated first/last venues add no home leg, as unlocated venues add no leg to the chain
+    trip_miles = (np.nan_to_num(batch_distance(home, first, method=method))
+                  + located['Trip_Miles'].to_numpy()
+                  + np.nan_to_num(batch_distance(last, home, method=method)))
+    per_referee = pd.DataFrame({'Referee': located['Referee'].to_numpy(), 'Home_Travel_Miles': trip_miles})
+    per_referee = per_referee.groupby('Referee', sort=False).agg(
+        Trips=('Home_Travel_Miles', 'size'), Home_Travel_Miles=('Home_Travel_Miles', 'sum'))
+    chain = legs.groupby('Referee', sort=False)['Distance'].sum().rename('Chain_Travel_Miles')
+
+    travel = homes.join(per_referee, on='Referee').join(chain, on='Referee')
+    travel['Chain_Travel_Miles'] = travel['Chain_Travel_Miles'].fillna(0.0)
+    return travel.sort_values(['Home_Travel_Miles', 'Referee'], ascending=[False, True], kind='mergesort').reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    import game_store
+    from geolocator import RefereeTravel
+    from itinerary import build_itineraries
+
+    options = {'home_gap_hours': float(sys.argv[1])} if len(sys.argv) > 1 else {}
+
+    analyzer = RefereeTravel()
+    print("📊 Loading NCAA games data...")
+    columns = game_store.game_columns(analyzer.games_store, analyzer.data_path)
+    df = game_store.load_games([col for col in columns if col in ('Date', 'Game_Time')
+                                or any(key in col.lower() for key in ('official', 'venue'))],
+                               store_dir=analyzer.games_store, csv_path=analyzer.data_path)
+    venue_col = [col for col in df.columns if 'venue' in col.lower()][0]
+
+    print("\n🏟️ Geocoding venues...")
+    venue_coords = analyzer.geocode_venues(df[venue_col].unique())
+
+    print("\n🏠 Estimating home bases...")
+    homes = home_bases(df, venue_coords)
+    trips, legs = build_itineraries(df, venue_coords, analyzer.distance_index, **options)
+    travel = home_travel(trips, legs, homes, venue_coords, method=analyzer.distance_method)
+
+    output_path = os.path.join(analyzer.output_dir, 'referee_home_travel.csv')
+    travel.round({'Home_Latitude': 5, 'Home_Longitude': 5, 'Home_Travel_Miles': 2, 'Chain_Travel_Miles': 2}).to_csv(
+        output_path, index=False)
+
+    print(f"\n📊 Home bases for {len(homes)} referees, {(~homes['Converged']).sum()} not converged "
+          f"within {MAX_ITERATIONS} iterations (most used: {homes['Iterations'].max()})")
+    print(f"Average travel per referee: {travel['Home_Travel_Miles'].mean():.2f} miles from home, "
+          f"{travel['Chain_Travel_Miles'].mean():.2f} miles venue to venue")
+    print("\nTop 10 Most Traveled Referees (from home):")
+    print(travel.head(10)[['Referee', 'Games', 'Trips', 'Home_Travel_Miles', 'Chain_Travel_Miles']])
+    print(f"\n✅ Results saved to '{output_path}'")
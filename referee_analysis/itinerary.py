@@ -0,0 +1,184 @@
+"""
+Referee itineraries: trips between home stays, and travel-feasibility checks.
+
+Tip-off times come from Game_Time ('11/09/2024 12:00 AM'). stats.ncaa.org
+lists every game on Eastern time (a 7 PM game in Honolulu reads 12:00 AM
+the next day), so differences between tip-offs are real elapsed hours.
+Games without a readable Game_Time tip off at DEFAULT_TIP_HOUR on their
+Date.
+
+Each referee's games are ordered by tip-off and paired with the previous
+game, all referees at once (assignments.consecutive_legs). For every leg:
+
+    Hours_Available  time from the end of the previous game (tip-off plus
+                     game_hours) to the next tip-off
+    Distance         straight-line miles from the DistanceIndex (NaN when a
+                     venue has no coordinates)
+    Required_MPH     Distance / Hours_Available (inf when the games overlap)
+    New_Trip         Hours_Available > home_gap_hours: the referee is
+                     assumed to go home in between, so the leg starts a new
+                     trip instead of being travelled directly
+    Infeasible       Required_MPH > max_speed_mph
+
+Trips are the runs of games between home stays, with their dates, games,
+first and last venues and the miles travelled between their games.
+
+    python itinerary.py [home_gap_hours] [max_speed_mph]
+        # writes referee_trips.csv and referee_infeasible_legs.csv
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+from assignments import find_official_columns, build_assignments, consecutive_legs
+
+GAME_TIME_FORMAT = '%m/%d/%Y %I:%M %p'
+DEFAULT_TIP_HOUR = 19       # Tip-off assumed for games without a readable Game_Time
+GAME_HOURS = 2.0            # Tip-off to leaving the venue
+HOME_GAP_HOURS = 48.0       # More free time than this between games and the referee goes home
+MAX_SPEED_MPH = 300.0       # Straight-line miles per free hour no referee can cover, even by air
+
+
+def tip_off_times(df, default_hour=DEFAULT_TIP_HOUR):
+    """Tip-off timestamp of each game, from Game_Time or its Date at default_hour"""
+    fallback = pd.to_datetime(df['Date']).dt.normalize() + pd.Timedelta(hours=default_hour)
+    if 'Game_Time' not in df.columns:
+        return fallback
+    times = pd.to_datetime(df['Game_Time'].astype(object), format=GAME_TIME_FORMAT, errors='coerce')
+    return times.fillna(fallback)
+
+
+def itinerary_legs(assignments, venue_ids, distance_index, game_hours=GAME_HOURS,
+                   home_gap_hours=HOME_GAP_HOURS, max_speed_mph=MAX_SPEED_MPH):
+    """
+    (assignments with a Trip number per referee, legs with feasibility
+    flags), from a table of Referee, Game_Row, Tip_Off and Venue codes;
+    venue_ids maps a venue code to its DistanceIndex ID (-1 if unknown).
+    """
+    assignments = assignments.sort_values(['Referee', 'Tip_Off', 'Game_Row'], kind='mergesort').reset_index(drop=True)
+    legs = consecutive_legs(assignments, ['Venue', 'Tip_Off'])
+    rows = legs.index.to_numpy()
+
+    from_ids = venue_ids[legs['Prev_Venue'].to_numpy(dtype=np.int64)]
+    to_ids = venue_ids[legs['Venue'].to_numpy(dtype=np.int64)]
+    located = (from_ids >= 0) & (to_ids >= 0)
+    distance = np.full(len(legs), np.nan)
+    distance[located] = distance_index.lookup(from_ids[located], to_ids[located])
+
+    tip_off = legs['Tip_Off'].to_numpy(dtype='datetime64[s]')
+    prev_tip_off = legs['Prev_Tip_Off'].to_numpy(dtype='datetime64[s]')
+    hours = (tip_off - prev_tip_off).astype(np.float64) / 3600 - game_hours
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speed = np.where(hours > 0, distance / hours, np.where(distance > 0, np.inf, 0.0))
+    new_trip = hours > home_gap_hours
+
+    # Trip numbers: count trip starts (a referee's first game or a home stay before it) per referee
+    starts = np.ones(len(assignments), dtype=bool)
+    starts[rows] = new_trip
+    assignments['Trip'] = pd.Series(starts).groupby(assignments['Referee'].to_numpy(), sort=False).cumsum().to_numpy()
+
+    legs = pd.DataFrame({
+        'Referee': legs['Referee'].to_numpy(),
+        'Trip': assignments['Trip'].to_numpy()[rows],
+        'From_Venue': legs['Prev_Venue'].to_numpy(dtype=np.int64),
+        'To_Venue': legs['Venue'].to_numpy(dtype=np.int64),
+        'Depart': prev_tip_off + np.timedelta64(int(game_hours * 3600), 's'),
+        'Tip_Off': tip_off,
+        'Hours_Available': hours,
+        'Distance': distance,
+        'Required_MPH': speed,
+        'New_Trip': new_trip,
+        'Infeasible': speed > max_speed_mph,
+    })
+    return assignments, legs
+
+
+def trip_summary(assignments, legs):
+    """One row per referee trip: dates, games, first/last venue, miles between its games, infeasible legs"""
+    trips = assignments.groupby(['Referee', 'Trip'], sort=False).agg(
+        Start=('Tip_Off', 'first'),
+        End=('Tip_Off', 'last'),
+        Games=('Tip_Off', 'size'),
+        First_Venue=('Venue', 'first'),
+        Last_Venue=('Venue', 'last'),
+    )
+    in_trip = legs[~legs['New_Trip']]
+    travel = in_trip.groupby(['Referee', 'Trip'], sort=False).agg(
+        Trip_Miles=('Distance', 'sum'),
+        Infeasible_Legs=('Infeasible', 'sum'),
+    )
+    trips = trips.join(travel)
+    trips['Trip_Miles'] = trips['Trip_Miles'].fillna(0.0)
+    trips['Infeasible_Legs'] = trips['Infeasible_Legs'].fillna(0).astype(np.int64)
+    return trips.reset_index()
+
+
+def build_itineraries(df, venue_coords, distance_index, official_cols=None, **options):
+    """
+    (trips, legs) for every referee in a games table with Date, Game_Time,
+    the venue and the official columns; options go to itinerary_legs.
+    """
+    official_cols = official_cols or find_official_columns(df)
+    venue_col = [col for col in df.columns if 'venue' in col.lower()][0]
+    distance_index.add_venues(venue_coords)
+
+    # Referees and venues as integer codes, so the melt, sorts and shifts move numbers instead of strings
+    officials = df[official_cols].astype(object).to_numpy()
+    referee_codes, referees = pd.factorize(officials.ravel(), sort=True)
+    venue_codes, venues = pd.factorize(df[venue_col].astype(object), sort=True)
+    games = pd.DataFrame(np.where(referee_codes >= 0, referee_codes, np.nan).reshape(officials.shape), columns=official_cols)
+    games['Tip_Off'] = tip_off_times(df).to_numpy()
+    games['Venue'] = venue_codes
+    assignments = build_assignments(games, official_cols, columns=['Tip_Off', 'Venue'])
+    assignments['Referee'] = assignments['Referee'].astype(np.int64)
+
+    venues = np.asarray(venues, dtype=object)
+    venue_ids = np.r_[distance_index.venue_ids(venues), -1]    # code -1 (no venue) -> -1
+    assignments, legs = itinerary_legs(assignments, venue_ids, distance_index, **options)
+    trips = trip_summary(assignments, legs)
+
+    # Codes back to names
+    referees = np.asarray(referees, dtype=object)
+    venue_names = np.r_[venues, np.array([None], dtype=object)]
+    for table, venue_cols in ((trips, ['First_Venue', 'Last_Venue']), (legs, ['From_Venue', 'To_Venue'])):
+        table['Referee'] = pd.Series(referees[table['Referee'].to_numpy()], index=table.index, dtype=object)
+        for col in venue_cols:
+            table[col] = pd.Series(venue_names[table[col].to_numpy()], index=table.index, dtype=object)
+    return trips, legs
+
+
+if __name__ == "__main__":
+    import game_store
+    from geolocator import RefereeTravel
+
+    options = {}
+    if len(sys.argv) > 1:
+        options['home_gap_hours'] = float(sys.argv[1])
+    if len(sys.argv) > 2:
+        options['max_speed_mph'] = float(sys.argv[2])
+
+    analyzer = RefereeTravel()
+    print("📊 Loading NCAA games data...")
+    columns = game_store.game_columns(analyzer.games_store, analyzer.data_path)
+    df = game_store.load_games([col for col in columns if col in ('Date', 'Game_Time')
+                                or any(key in col.lower() for key in ('official', 'venue'))],
+                               store_dir=analyzer.games_store, csv_path=analyzer.data_path)
+    venue_col = [col for col in df.columns if 'venue' in col.lower()][0]
+
+    print("\n🏟️ Geocoding venues...")
+    venue_coords = analyzer.geocode_venues(df[venue_col].unique())
+
+    print("\n🧭 Building referee itineraries...")
+    trips, legs = build_itineraries(df, venue_coords, analyzer.distance_index, **options)
+    infeasible = legs[legs['Infeasible']].sort_values('Required_MPH', ascending=False, kind='mergesort')
+
+    trips.to_csv(os.path.join(analyzer.output_dir, 'referee_trips.csv'), index=False)
+    infeasible.to_csv(os.path.join(analyzer.output_dir, 'referee_infeasible_legs.csv'), index=False)
+
+    print(f"\n📊 {len(trips)} trips for {trips['Referee'].nunique()} referees, "
+          f"{trips['Games'].mean():.2f} games and {trips['Trip_Miles'].mean():.0f} miles per trip")
+    print(f"⚠️ {len(infeasible)} of {len(legs)} legs need more than "
+          f"{options.get('max_speed_mph', MAX_SPEED_MPH):.0f} mph:")
+    print(infeasible.head(10)[['Referee', 'From_Venue', 'To_Venue', 'Tip_Off', 'Hours_Available', 'Distance', 'Required_MPH']])
+    print(f"\n✅ Results saved to '{analyzer.output_dir}'")
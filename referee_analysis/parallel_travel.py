@@ -0,0 +1,147 @@
+"""
+Process-pool travel analysis for multi-season, multi-division game sets.
+
+The referee-sorted assignment table is encoded as three flat arrays
+(referee code, venue code, date) placed in shared memory once. It is then
+cut into contiguous blocks of whole referees, and each worker process
+reads its block straight out of shared memory: nothing but the block
+bounds is pickled per task. Leg distances come from the DistanceIndex
+file, which every worker memory-maps read-only, so the OS shares its pages
+between processes as well.
+
+Each block runs the same per-referee code as the serial path
+(RefereeTravel.travel_results), and blocks are yielded in referee order, so
+the results are identical to a serial run regardless of the worker count.
+Only a few blocks per worker are in flight at a time, so the legs of every
+referee are never held at once.
+"""
+
+import os
+import collections
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from assignments import consecutive_legs
+from distance_index import condensed_position
+
+# Shared arrays and lookup tables, set once per worker by _attach
+_worker = {}
+
+
+def partition_referees(referee_codes, parts):
+    """
+    [(start, end)] row ranges of a referee-sorted code array, about equal in
+    size, that never split one referee's games across two ranges
+    """
+    n = len(referee_codes)
+    if n == 0:
+        return []
+    starts = np.flatnonzero(np.r_[True, referee_codes[1:] != referee_codes[:-1]])
+    targets = np.linspace(0, n, max(1, parts) + 1)[1:-1]
+    cuts = np.unique(starts[np.minimum(np.searchsorted(starts, targets), len(starts) - 1)])
+    bounds = np.unique(np.r_[0, cuts, n])
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def _share(array):
+    """Copy an array into a new shared memory block; returns (block, spec)"""
+    block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block, (block.name, array.dtype.str, len(array))
+
+
+def _attach(spec):
+    """Pool initializer: map the shared arrays and keep the lookup tables"""
+    _worker.clear()
+    _worker.update(spec)
+    _worker['blocks'] = []
+    for key, (name, dtype, length) in spec['arrays'].items():
+        block = shared_memory.SharedMemory(name=name)
+        _worker['blocks'].append(block)
+        _worker[key] = np.ndarray(length, dtype=dtype, buffer=block.buf)
+    _worker['matrix'] = (np.memmap(spec['index_path'], dtype=spec['index_dtype'], mode='r')
+                         if spec['index_size'] else np.zeros(0, dtype=spec['index_dtype']))
+
+
+def _travel_block(bounds):
+    """State entries and leg columns for the referees in rows [start, end)"""
+    from geolocator import RefereeTravel
+
+    start, end = bounds
+    venue_col = _worker['venue_col']
+    venue_codes = _worker['venue_codes'][start:end]
+    venue_names = _worker['venue_names']
+    assignments = pd.DataFrame({
+        'Referee': _worker['referee_names'][_worker['referee_codes'][start:end]],
+        'Date': _worker['dates'][start:end].view('datetime64[ns]'),
+        venue_col: np.where(venue_codes >= 0, venue_names[venue_codes], None),
+        'Venue_ID': _worker['index_ids'][venue_codes],
+    })
+
+    legs = consecutive_legs(assignments, [venue_col, 'Venue_ID'])
+    legs = legs.rename(columns={f'Prev_{venue_col}': 'from_venue', venue_col: 'to_venue'})
+    from_ids = legs['Prev_Venue_ID'].to_numpy(dtype=np.int64)
+    to_ids = legs['Venue_ID'].to_numpy(dtype=np.int64)
+    located = (from_ids >= 0) & (to_ids >= 0)
+    legs, from_ids, to_ids = legs[located], from_ids[located], to_ids[located]
+
+    distances = np.zeros(len(legs), dtype=np.float64)
+    different = from_ids != to_ids
+    distances[different] = _worker['matrix'][condensed_position(from_ids[different], to_ids[different])]
+    legs = legs.assign(distance=distances)
+    return RefereeTravel.travel_results(assignments, venue_col, legs[legs['distance'] > 0])
+
+
+def parallel_travel_blocks(assignments, venue_col, venue_coords, distance_index, workers=None, parts=None):
+    """
+    Yield (state, leg_columns) for contiguous blocks of whole referees of a
+    referee-sorted assignment table, in referee order, computed in a pool
+    of worker processes; the same blocks as the serial
+    RefereeTravel.travel_blocks path.
+
+    parts is the number of referee blocks (default four per worker, so a
+    block of heavy-travel referees does not hold up the whole pool).
+    """
+    workers = workers or os.cpu_count()
+    parts = parts or workers * 4
+    distance_index.add_venues(venue_coords)
+
+    referee_codes, referee_names = pd.factorize(assignments['Referee'], sort=True)
+    venue_codes, venue_names = pd.factorize(assignments[venue_col])
+    venue_names = np.asarray(venue_names, dtype=object)
+    index_ids = np.array([distance_index.ids.get(venue, -1) if venue in venue_coords else -1
+                          for venue in venue_names] + [-1], dtype=np.int64)  # code -1 (no venue) -> -1
+
+    blocks = []
+    try:
+        arrays = {}
+        for key, array in (('referee_codes', referee_codes.astype(np.int32)),
+                           ('venue_codes', venue_codes.astype(np.int32)),
+                           ('dates', assignments['Date'].to_numpy(dtype='datetime64[ns]').view(np.int64))):
+            block, arrays[key] = _share(array)
+            blocks.append(block)
+
+        spec = {
+            'arrays': arrays,
+            'venue_col': venue_col,
+            'referee_names': np.asarray(referee_names, dtype=object),
+            'venue_names': venue_names,
+            'index_ids': index_ids,
+            'index_path': distance_index.data_path,
+            'index_dtype': distance_index.dtype.str,
+            'index_size': len(distance_index.matrix),
+        }
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(spec,)) as pool:
+            # A bounded window of submitted blocks, handed back in order as each finishes
+            pending = collections.deque()
+            for bounds in partition_referees(referee_codes, parts):
+                pending.append(pool.submit(_travel_block, bounds))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
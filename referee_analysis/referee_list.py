@@ -6,48 +6,46 @@ Created on Sun Mar 30 23:45:24 2025
 
 import pandas as pd
 import os
+from game_store import game_columns, load_games
 
 def analyze_referee_games():
    
     #Analyze how many games each referee officiated
 
-    # Step 1: Load the data
-    print("Loading the data...")
-    df = pd.read_csv('ncaa_games_data.csv')
+    # Step 1: Look at the columns (read from the schema, no rows loaded yet)
+    columns = game_columns()
     
     # Step 2: Exploring the data structure
     print("\nFirst, let's look at our columns:")
-    print(df.columns.tolist())
+    print(columns)
     
     # Step 3: Get the official columns
     official_cols = ['Official_1', 'Official_2', 'Official_3']
     
     # Check if these columns exist, if not, try to find them
     for col in official_cols:
-        if col not in df.columns:
+        if col not in columns:
             print(f"Warning: Column '{col}' not found in the dataset")
     
     # If columns not found, try to detect them
-    if not all(col in df.columns for col in official_cols):
-        potential_cols = [col for col in df.columns if 'official' in col.lower() or 'ref' in col.lower()]
+    if not all(col in columns for col in official_cols):
+        potential_cols = [col for col in columns if 'official' in col.lower() or 'ref' in col.lower()]
         print(f"Potential official columns found: {potential_cols}")
         if potential_cols:
             official_cols = potential_cols[:3]  # Use the first 3 found
     
     print(f"\nUsing these columns for officials: {official_cols}")
     
-    # Step 4: Create a list of all referees
-    all_refs = []
+    # Load only the official columns
+    print("Loading the data...")
+    official_cols = [col for col in official_cols if col in columns]
+    df = load_games(columns=official_cols)
     
-    # Loop through each official column
-    for col in official_cols:
-        if col in df.columns:
-            # Add non-null values to our list
-            refs = df[col].dropna().tolist()
-            all_refs.extend(refs)
+    # Step 4: Melt the official columns into one column of referee names
+    all_refs = df[official_cols].astype(object).melt(value_name='Referee')['Referee'].dropna()
     
     # Step 5: Count games for each referee
-    ref_counts = pd.Series(all_refs).value_counts()
+    ref_counts = all_refs.value_counts()
     
     # Step 6: Create a nice dataframe for display
     referee_stats = pd.DataFrame({
@@ -73,6 +71,7 @@ def analyze_referee_games():
     output_path = os.path.join(output_dir, 'referee_games.csv')
     referee_stats.to_csv(output_path, index=False)
     print(f"\n✅ Full results saved to '{output_path}'")
+    print("   (Per-referee workload and crew pairs: python workload_stats.py)")
     
     return referee_stats
 
@@ -0,0 +1,235 @@
+"""
+Columnar travel leg details (Arrow IPC), in place of referee_travel_details.json.
+
+Three files are written to the output directory:
+    referee_travel_legs.arrow      one row per leg: referee_id, date,
+                                   from_venue_id, to_venue_id, distance (full
+                                   precision; the CSV and JSON round to 0.01).
+                                   Each referee's legs are one contiguous run
+                                   of rows.
+    referee_travel_referees.arrow  one row per referee: referee_id, referee,
+                                   games_officiated, total_travel_miles,
+                                   avg_miles_per_trip, leg_offset, leg_count
+    referee_travel_venues.arrow    venue_id, venue, latitude, longitude
+
+The legs file is uncompressed, so it can be memory-mapped: a reader finds
+leg_offset and leg_count in the small referees file and slices just that
+referee's rows (read_referee_legs here; arrow::read_ipc_file(...,
+as_data_frame = FALSE) and $Slice() in R). Names are stored once, in the
+referees and venues files, instead of on every leg.
+
+TravelLegsWriter and DetailsJsonWriter (the optional
+referee_travel_details.json) both take one referee at a time, and
+iter_referee_legs reads saved legs back one referee at a time, so neither
+writing nor rereading ever holds every referee's legs at once.
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+LEGS_FILE = 'referee_travel_legs.arrow'
+REFEREES_FILE = 'referee_travel_referees.arrow'
+VENUES_FILE = 'referee_travel_venues.arrow'
+
+LEG_SCHEMA = pa.schema([
+    ('referee_id', pa.int32()),
+    ('date', pa.timestamp('us')),
+    ('from_venue_id', pa.int32()),
+    ('to_venue_id', pa.int32()),
+    ('distance', pa.float64()),
+])
+
+
+def _write_table(path, table):
+    """Write a table as an Arrow IPC file"""
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_table(path, memory_map=False):
+    """Read an Arrow IPC file; memory-mapped reads are zero-copy"""
+    source = pa.memory_map(path, 'r') if memory_map else pa.OSFile(path, 'rb')
+    with source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def has_travel_legs(output_dir):
+    return all(os.path.exists(os.path.join(output_dir, name)) for name in (LEGS_FILE, REFEREES_FILE, VENUES_FILE))
+
+
+class TravelLegsWriter:
+    """
+    Stream referees into the three Arrow files, one referee at a time.
+
+    Legs are buffered into record batches of about batch_rows rows, so
+    memory stays bounded however many legs are written. The new files
+    replace the old ones only when the writer closes without an error.
+    locate_venue(venue) gives a venue's (lat, lon), or None.
+    """
+
+    def __init__(self, output_dir, locate_venue, batch_rows=65536):
+        self.paths = [os.path.join(output_dir, name) for name in (LEGS_FILE, REFEREES_FILE, VENUES_FILE)]
+        self.locate_venue = locate_venue
+        self.batch_rows = batch_rows
+        self.venue_ids = {}
+        self.referees = {name: [] for name in ('referee', 'games_officiated', 'total_travel_miles',
+                                               'avg_miles_per_trip', 'leg_offset', 'leg_count')}
+        self.leg_offset = 0
+        self._batches = []
+        self._batched_rows = 0
+        self._sink = pa.OSFile(self.paths[0] + '.tmp', 'wb')
+        self._writer = pa.ipc.new_file(self._sink, LEG_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(commit=exc_type is None)
+
+    def _venue_ids(self, venues):
+        return np.fromiter((self.venue_ids.setdefault(venue, len(self.venue_ids)) for venue in venues),
+                           np.int32, len(venues))
+
+    def write(self, record, leg_columns):
+        """Add one referee: their travel record (travel_legs is not read) and their legs as columns"""
+        count = len(leg_columns['distance'])
+        referee_id = len(self.referees['referee'])
+        for name in ('referee', 'games_officiated', 'total_travel_miles', 'avg_miles_per_trip'):
+            self.referees[name].append(record[name])
+        self.referees['leg_offset'].append(self.leg_offset)
+        self.referees['leg_count'].append(count)
+        self.leg_offset += count
+        if not count:
+            return
+
+        self._batches.append(pa.record_batch([
+            pa.array(np.full(count, referee_id, dtype=np.int32)),
+            pa.array(np.asarray(leg_columns['date'], dtype='datetime64[us]')),
+            pa.array(self._venue_ids(leg_columns['from_venue'])),
+            pa.array(self._venue_ids(leg_columns['to_venue'])),
+            pa.array(np.asarray(leg_columns['distance'], dtype=np.float64)),
+        ], schema=LEG_SCHEMA))
+        self._batched_rows += count
+        if self._batched_rows >= self.batch_rows:
+            self._flush()
+
+    def _flush(self):
+        """Write the buffered referees' legs as one record batch"""
+        if self._batches:
+            self._writer.write_table(pa.Table.from_batches(self._batches).combine_chunks())
+            self._batches = []
+            self._batched_rows = 0
+
+    def close(self, commit=True):
+        """Finish the legs file, write the referees and venues files and move all three into place"""
+        if self._writer is None:
+            return
+        try:
+            if commit:
+                self._flush()
+            self._writer.close()
+        finally:
+            self._sink.close()
+            self._writer = None
+        if not commit:
+            os.remove(self.paths[0] + '.tmp')
+            return
+
+        referees = self.referees
+        _write_table(self.paths[1] + '.tmp', pa.table({
+            'referee_id': pa.array(range(len(referees['referee'])), pa.int32()),
+            'referee': pa.array(referees['referee'], pa.string()),
+            'games_officiated': pa.array(referees['games_officiated'], pa.int32()),
+            'total_travel_miles': pa.array(referees['total_travel_miles'], pa.float64()),
+            'avg_miles_per_trip': pa.array(referees['avg_miles_per_trip'], pa.float64()),
+            'leg_offset': pa.array(referees['leg_offset'], pa.int64()),
+            'leg_count': pa.array(referees['leg_count'], pa.int64()),
+        }))
+        venues = list(self.venue_ids)
+        coords = [self.locate_venue(venue) for venue in venues]
+        _write_table(self.paths[2] + '.tmp', pa.table({
+            'venue_id': pa.array(range(len(venues)), pa.int32()),
+            'venue': pa.array(venues, pa.string()),
+            'latitude': pa.array([c[0] if c else None for c in coords], pa.float64()),
+            'longitude': pa.array([c[1] if c else None for c in coords], pa.float64()),
+        }))
+        for path in self.paths:
+            os.replace(path + '.tmp', path)
+
+
+def read_referee_legs(output_dir, referee):
+    """One referee's legs as a DataFrame (date, from_venue, to_venue, distance), read from the memory-mapped file"""
+    referees = _read_table(os.path.join(output_dir, REFEREES_FILE)).to_pandas()
+    row = referees[referees['referee'] == referee]
+    if row.empty:
+        return pd.DataFrame(columns=['date', 'from_venue', 'to_venue', 'distance'])
+    offset, count = int(row['leg_offset'].iloc[0]), int(row['leg_count'].iloc[0])
+
+    legs = _read_table(os.path.join(output_dir, LEGS_FILE), memory_map=True).slice(offset, count).to_pandas()
+    venues = _read_table(os.path.join(output_dir, VENUES_FILE))['venue'].to_numpy(zero_copy_only=False)
+    return pd.DataFrame({
+        'date': legs['date'],
+        'from_venue': venues[legs['from_venue_id'].to_numpy()],
+        'to_venue': venues[legs['to_venue_id'].to_numpy()],
+        'distance': legs['distance'],
+    })
+
+
+def iter_referee_legs(output_dir, referees):
+    """
+    Yield (referee, {'date', 'from_venue', 'to_venue', 'distance'} arrays)
+    for each of referees, sliced one at a time from the memory-mapped legs
+    file (empty arrays for a referee without saved legs)
+    """
+    legs = _read_table(os.path.join(output_dir, LEGS_FILE), memory_map=True)
+    index = _read_table(os.path.join(output_dir, REFEREES_FILE)).to_pydict()
+    venues = _read_table(os.path.join(output_dir, VENUES_FILE))['venue'].to_numpy(zero_copy_only=False)
+    spans = dict(zip(index['referee'], zip(index['leg_offset'], index['leg_count'])))
+
+    for referee in referees:
+        offset, count = spans.get(referee, (0, 0))
+        referee_legs = legs.slice(offset, count)
+        yield referee, {
+            'date': referee_legs['date'].to_numpy(),
+            'from_venue': venues[referee_legs['from_venue_id'].to_numpy()],
+            'to_venue': venues[referee_legs['to_venue_id'].to_numpy()],
+            'distance': referee_legs['distance'].to_numpy(),
+        }
+
+
+class DetailsJsonWriter:
+    """
+    Write referee_travel_details.json one record at a time, in the layout
+    json.dump(records, f, indent=2) gives (atomic replace on close)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.written = 0
+        self._file = open(path + '.tmp', 'w')
+        self._file.write('[')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(commit=exc_type is None)
+
+    def write(self, record):
+        self._file.write(',\n  ' if self.written else '\n  ')
+        self._file.write(json.dumps(record, indent=2, default=str).replace('\n', '\n  '))
+        self.written += 1
+
+    def close(self, commit=True):
+        if self._file.closed:
+            return
+        self._file.write('\n]' if self.written else ']')
+        self._file.close()
+        if commit:
+            os.replace(self.path + '.tmp', self.path)
+        else:
+            os.remove(self.path + '.tmp')
@@ -0,0 +1,203 @@
+"""
+Resolve venue names to coordinates, offline first.
+
+Venue strings look like "Moby Arena (Fort Collins, CO)". A venue is looked
+up, in order, in:
+    1. the venue cache (earlier geocoder results): a VenueStore, or a plain dict
+    2. the bundled gazetteer's arenas, by full venue name
+    3. the bundled gazetteer's US cities, by the "(City, ST)" suffix
+Only venues that none of these know are sent to the geocoder, as one
+rate-limited batch on a background thread. A VenueStore records each
+result as it arrives; a plain dict cache is saved once per batch.
+
+The geocoder is pluggable: anything with a geopy-style geocode(query)
+method that returns an object with latitude and longitude (or None).
+"""
+
+import os
+import re
+import time
+import queue
+import threading
+import unicodedata
+import pandas as pd
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataset', 'venue_gazetteer.csv')
+VENUE_PATTERN = re.compile(r'^(?P<arena>.*?)\s*\((?P<city>[^()]*),\s*(?P<state>[A-Z]{2})\)\s*$')
+
+_ABBREVIATIONS = [(re.compile(r'\bst\.?(?=\s)'), 'saint'),
+                  (re.compile(r'\bft\.?(?=\s)'), 'fort'),
+                  (re.compile(r'\bmt\.?(?=\s)'), 'mount')]
+
+
+def normalize_place(text):
+    """Lowercase ASCII form of a place name, for matching"""
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode()
+    text = text.lower().replace('&', ' and ')
+    for pattern, replacement in _ABBREVIATIONS:
+        text = pattern.sub(replacement, text)
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text).split())
+
+
+def split_venue(venue):
+    """(arena, city, state) from "Arena (City, ST)", or None"""
+    match = VENUE_PATTERN.match(str(venue))
+    if match is None:
+        return None
+    return match.group('arena'), match.group('city').strip(), match.group('state')
+
+
+class Gazetteer:
+    """Offline arena and US city coordinates"""
+
+    def __init__(self, path=GAZETTEER_PATH):
+        self.arenas = {}
+        self.cities = {}
+        if not os.path.exists(path):
+            return
+        table = pd.read_csv(path, keep_default_na=False)
+        for kind, name, state, lat, lon in zip(table['kind'], table['name'], table['state'],
+                                                table['latitude'], table['longitude']):
+            if kind == 'arena':
+                self.arenas[normalize_place(name)] = (float(lat), float(lon))
+            else:
+                self.cities[(normalize_place(name), state)] = (float(lat), float(lon))
+
+    def lookup(self, venue):
+        """(coords, 'arena' or 'city'), or (None, None)"""
+        coords = self.arenas.get(normalize_place(venue))
+        if coords is not None:
+            return coords, 'arena'
+        parts = split_venue(venue)
+        if parts is not None:
+            coords = self.cities.get((normalize_place(parts[1]), parts[2]))
+            if coords is not None:
+                return coords, 'city'
+        return None, None
+
+
+class VenueResolver:
+    """Cache, then gazetteer, then a rate-limited background geocoding batch"""
+
+    def __init__(self, cache=None, geocoder=None, gazetteer=None, rate=1.0, save_cache=None):
+        self.cache = cache if cache is not None else {}
+        self.geocoder = geocoder
+        self.gazetteer = gazetteer if gazetteer is not None else Gazetteer()
+        self.min_interval = 1.0 / rate
+        self.save_cache = save_cache
+        self.sources = {}
+        self._pending = queue.Queue()
+        self._queued = set()
+        self._worker = None
+        self._last_call = 0.0
+        self._lock = threading.Lock()
+
+    def resolve_offline(self, venue):
+        """Coordinates from the cache or gazetteer, or None"""
+        if venue is None or pd.isna(venue):
+            return None
+        venue = str(venue).strip()
+        coords = self.cache.get(venue)
+        if coords is not None:
+            self.sources[venue] = 'cache'
+            return coords
+        coords, source = self.gazetteer.lookup(venue)
+        if coords is not None:
+            self.sources[venue] = source
+        return coords
+
+    def submit(self, venues):
+        """Queue venues for the background geocoder; it starts if it is not running"""
+        with self._lock:
+            for venue in venues:
+                if venue not in self._queued:
+                    self._queued.add(venue)
+                    self._pending.put(venue)
+            if self.geocoder is not None and self._worker is None:
+                self._worker = threading.Thread(target=self._geocode_batch, daemon=True)
+                self._worker.start()
+
+    def _throttle(self):
+        """Sleep until the next geocoder call is allowed"""
+        time.sleep(max(0.0, self._last_call + self.min_interval - time.monotonic()))
+        self._last_call = time.monotonic()
+
+    def _geocode_one(self, venue):
+        """Geocode a venue, falling back to its "City, ST"; returns (coords, source)"""
+        queries = [(venue, 'geocoder')]
+        parts = split_venue(venue)
+        if parts is not None:
+            queries.append((f"{parts[1]}, {parts[2]}", 'geocoder_city'))
+        for query, source in queries:
+            self._throttle()
+            location = self.geocoder.geocode(query)
+            if location:
+                return (location.latitude, location.longitude), source
+        return None, None
+
+    def _remember(self, venue, coords, source):
+        """Record a geocoder result in the cache"""
+        if hasattr(self.cache, 'put'):
+            self.cache.put(venue, coords, source=source)
+        else:
+            self.cache[venue] = coords
+        self.sources[venue] = source
+
+    def _geocode_batch(self):
+        """Drain the queue at the configured rate, saving the cache once at the end"""
+        found = 0
+        while True:
+            with self._lock:
+                if self._pending.empty():
+                    self._worker = None
+                    break
+                venue = self._pending.get()
+            try:
+                coords, source = self._geocode_one(venue)
+            except Exception as e:
+                print(f"❌ Error geocoding {venue}: {str(e)}")
+                coords = None
+            if coords:
+                self._remember(venue, coords, source)
+                found += 1
+            else:
+                print(f"⚠️ Could not geocode: {venue}")
+            # Done either way: a later submit can queue the venue again (a miss gets retried)
+            with self._lock:
+                self._queued.discard(venue)
+        if found and self.save_cache is not None:
+            self.save_cache()
+
+    def wait(self):
+        """Block until the background batch has finished"""
+        worker = self._worker
+        if worker is not None:
+            worker.join()
+
+    def resolve_all(self, venues, wait=True):
+        """
+        {venue: coords} for every venue that can be resolved.
+
+        Offline matches are immediate; the rest are geocoded in the
+        background. With wait=False only the offline matches are returned
+        and the batch keeps running (call wait() and resolve_all again).
+        """
+        resolved = {}
+        unresolved = []
+        for venue in venues:
+            coords = self.resolve_offline(venue)
+            if coords is not None:
+                resolved[venue] = coords
+            elif venue is not None and not pd.isna(venue) and str(venue).strip():
+                unresolved.append(str(venue).strip())
+
+        if unresolved and self.geocoder is not None:
+            print(f"🔍 Geocoding {len(unresolved)} venues not in the cache or gazetteer...")
+            self.submit(unresolved)
+            if wait:
+                self.wait()
+                for venue in venues:
+                    coords = None if venue in resolved else self.cache.get(str(venue).strip())
+                    if coords is not None:
+                        resolved[venue] = coords
+        return resolved
@@ -0,0 +1,239 @@
+"""
+SQLite store of venue coordinates, replacing venue_cache.json.
+
+Tables:
+    venues         one row per venue: display name, city, state, coordinates,
+                   where they came from (source), how much to trust them
+                   (confidence) and when they were last written
+    venue_aliases  normalized names pointing at a venue. Every venue gets its
+                   full name ("moby arena fort collins co") and its short name
+                   ("moby arena"), so "Moby Arena" and "Moby Arena (Fort
+                   Collins, CO)" resolve to the same venue. A short name that
+                   two different venues share points at neither.
+
+Each write is one small transaction (an O(1) upsert, nothing is rewritten
+in full). The database runs in WAL mode with a busy timeout, so several
+analysis processes can read and write it at the same time.
+
+The path comes from NCAA_VENUE_DB (default: venues.sqlite in the work
+directory, NCAA_WORK_DIR or ~/Desktop/workfiles).
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from venue_resolver import normalize_place, split_venue
+
+WORK_DIR = os.path.expanduser(os.environ.get('NCAA_WORK_DIR', '~/Desktop/workfiles'))
+VENUE_DB = os.path.expanduser(os.environ.get('NCAA_VENUE_DB', os.path.join(WORK_DIR, 'venues.sqlite')))
+
+# How far to trust coordinates from each source
+CONFIDENCE = {
+    'manual': 1.0,
+    'geocoder': 0.9,            # the full venue name was found
+    'venue_cache.json': 0.8,    # imported from the old JSON cache (geocoded by full name)
+    'geocoder_city': 0.5,       # only the "City, ST" part was found
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS venues (
+    venue_id   INTEGER PRIMARY KEY,
+    name       TEXT NOT NULL,
+    city       TEXT,
+    state      TEXT,
+    latitude   REAL NOT NULL,
+    longitude  REAL NOT NULL,
+    source     TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS venue_aliases (
+    alias      TEXT PRIMARY KEY,
+    venue_id   INTEGER REFERENCES venues(venue_id),
+    kind       TEXT NOT NULL CHECK (kind IN ('full', 'short', 'manual'))
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS venue_aliases_venue ON venue_aliases(venue_id);
+"""
+
+
+def _alias_keys(venue):
+    """[(alias, kind)] for a venue name: its full name and, if it has a "(City, ST)" suffix, its short name"""
+    keys = [(normalize_place(venue), 'full')]
+    parts = split_venue(venue)
+    if parts is not None and parts[0].strip():
+        keys.append((normalize_place(parts[0]), 'short'))
+    return keys
+
+
+class VenueStore:
+    """Venue coordinates keyed by normalized name, with aliases, provenance and confidence"""
+
+    def __init__(self, path=VENUE_DB, timeout=30):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        """One connection per thread (the resolver geocodes on a background thread)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+            self._local.connection = connection
+        return connection
+
+    def lookup(self, venue):
+        """
+        The stored row for a venue, as a dict, or None.
+
+        A name with a "(City, ST)" suffix only matches on its full name (or a
+        manual alias), so an arena name shared by two cities cannot cross
+        over; a bare name also tries the short-name aliases.
+        """
+        if venue is None:
+            return None
+        venue = str(venue).strip()
+        aliases = [normalize_place(venue)] if split_venue(venue) else [alias for alias, _ in _alias_keys(venue)]
+        connection = self._connection()
+        connection.row_factory = sqlite3.Row
+        for alias in aliases:
+            row = connection.execute(
+                'SELECT v.* FROM venue_aliases a JOIN venues v ON v.venue_id = a.venue_id WHERE a.alias = ?',
+                (alias,)).fetchone()
+            if row is not None:
+                return dict(row)
+        return None
+
+    def get(self, venue, default=None):
+        """(latitude, longitude) for a venue, or default"""
+        row = self.lookup(venue)
+        return (row['latitude'], row['longitude']) if row is not None else default
+
+    def __contains__(self, venue):
+        return self.lookup(venue) is not None
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM venues').fetchone()[0]
+
+    def put(self, venue, coords, source='geocoder', confidence=None):
+        """
+        Insert or update a venue; returns its venue_id.
+
+        A name that already resolves to a venue updates that venue, through
+        either alias: "Moby Arena" after "Moby Arena (Fort Collins, CO)"
+        (or the other way round) is the same venue, not a second one. An
+        existing venue's coordinates are only replaced by ones at least as
+        trustworthy, so a city-level guess never overwrites an arena fix.
+        """
+        venue = str(venue).strip()
+        confidence = CONFIDENCE.get(source, 0.5) if confidence is None else confidence
+        parts = split_venue(venue)
+        city, state = (parts[1], parts[2]) if parts is not None else (None, None)
+        keys = _alias_keys(venue)
+        connection = self._connection()
+
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            venue_id, keys = self._existing_venue(connection, venue, keys)
+            if venue_id is None:
+                venue_id = connection.execute(
+                    'INSERT INTO venues (name, city, state, latitude, longitude, source, confidence, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (venue, city, state, coords[0], coords[1], source, confidence, time.time())).lastrowid
+            else:
+                connection.execute(
+                    'UPDATE venues SET latitude = ?, longitude = ?, source = ?, confidence = ?, updated_at = ? '
+                    'WHERE venue_id = ? AND confidence <= ?',
+                    (coords[0], coords[1], source, confidence, time.time(), venue_id, confidence))
+
+            for alias, kind in keys:
+                self._set_alias(connection, alias, venue_id, kind)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return venue_id
+
+    @staticmethod
+    def _existing_venue(connection, venue, keys):
+        """
+        (venue_id or None, aliases still to write) for a venue about to be
+        stored, resolved the way lookup() resolves names
+        """
+        full_alias = keys[0][0]
+        row = connection.execute('SELECT venue_id, kind FROM venue_aliases WHERE alias = ? AND venue_id IS NOT NULL',
+                                 (full_alias,)).fetchone()
+        if row is not None and row[1] != 'short':
+            return row[0], keys
+        if row is not None:
+            # A bare name that is the short name of a stored venue: nothing new to alias
+            return row[0], []
+        if len(keys) > 1:
+            short_alias = keys[1][0]
+            row = connection.execute('SELECT venue_id FROM venue_aliases WHERE alias = ? AND kind = ? '
+                                     'AND venue_id IS NOT NULL', (short_alias, 'full')).fetchone()
+            if row is not None:
+                # A venue stored under its bare name now has a city: it takes the full name, and the bare
+                # name becomes its short name (ambiguous again if another city's arena shares it)
+                parts = split_venue(venue)
+                connection.execute('UPDATE venues SET name = ?, city = ?, state = ? WHERE venue_id = ?',
+                                   (venue, parts[1], parts[2], row[0]))
+                connection.execute('UPDATE venue_aliases SET kind = ? WHERE alias = ?', ('short', short_alias))
+                return row[0], keys
+        return None, keys
+
+    @staticmethod
+    def _set_alias(connection, alias, venue_id, kind):
+        if kind == 'short':
+            # A short name shared by two venues is ambiguous and resolves to neither
+            connection.execute(
+                'INSERT INTO venue_aliases (alias, venue_id, kind) VALUES (?, ?, ?) '
+                'ON CONFLICT(alias) DO UPDATE SET venue_id = NULL '
+                'WHERE venue_aliases.kind = ? AND venue_aliases.venue_id IS NOT excluded.venue_id',
+                (alias, venue_id, kind, 'short'))
+        else:
+            connection.execute(
+                'INSERT INTO venue_aliases (alias, venue_id, kind) VALUES (?, ?, ?) '
+                'ON CONFLICT(alias) DO UPDATE SET venue_id = excluded.venue_id, kind = excluded.kind',
+                (alias, venue_id, kind))
+
+    def add_alias(self, alias, venue):
+        """Make another name (e.g. an old arena name) resolve to a stored venue"""
+        row = self.lookup(venue)
+        if row is None:
+            raise KeyError(venue)
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            self._set_alias(connection, normalize_place(alias), row['venue_id'], 'manual')
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def import_json(self, json_path, source='venue_cache.json'):
+        """Load an old venue_cache.json ({venue: [lat, lon]}); returns the number of venues imported"""
+        try:
+            with open(json_path, 'r') as f:
+                venue_cache = json.load(f)
+        except FileNotFoundError:
+            return 0
+        count = 0
+        for venue, coords in venue_cache.items():
+            if coords:
+                self.put(venue, coords, source=source)
+                count += 1
+        return count
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
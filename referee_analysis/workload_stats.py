@@ -0,0 +1,141 @@
+"""
+Per-referee workload and crew statistics for scheduling decisions.
+
+Everything comes from one melted assignment table (one row per referee and
+game, see assignments.build_assignments), using grouped NumPy/pandas
+operations instead of per-referee loops:
+
+    referee_workload(assignments)  one row per referee:
+        Games_Officiated, First_Game, Last_Game
+        Games_Per_Week        games / weeks from first to last game
+        Max_Games_In_Week     most games in one Monday-Sunday week
+        Back_To_Backs         games the day after the referee's previous game
+        Same_Day_Games        games on the same day as the previous game
+        Avg/Min/Max_Rest_Days days off between consecutive games
+        Avg_Foul_Differential home minus away personal fouls, per game
+        Avg_Total_Fouls       personal fouls per game
+    crew_pairs(assignments)        every pair of referees who worked a game
+                                   together, with the number of games
+
+    python workload_stats.py   # writes referee_workload.csv and referee_crew_pairs.csv
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from assignments import find_official_columns, build_assignments
+from game_store import game_columns, load_games
+
+FOUL_COLUMNS = ['Foul_Differential', 'Total_Fouls']
+
+
+def workload_assignments(df, official_cols):
+    """The melted (referee, game) table with dates and foul columns, chronological per referee"""
+    df = df.sort_values('Date', kind='mergesort')
+    columns = ['Date'] + [col for col in FOUL_COLUMNS if col in df.columns]
+    return build_assignments(df, official_cols, columns=columns)
+
+
+def referee_workload(assignments):
+    """Workload statistics per referee, most games first"""
+    referees = assignments['Referee'].to_numpy()
+    days = assignments['Date'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+    # Days since the same referee's previous game (NaN for their first game)
+    has_prev = np.r_[False, referees[1:] == referees[:-1]]
+    gap = np.where(has_prev, days - np.r_[days[0] if len(days) else 0, days[:-1]], np.nan)
+    rest = np.maximum(gap - 1, 0)
+
+    # Monday-based week number (1970-01-01 was a Thursday)
+    week = (days + 3) // 7
+
+    frame = pd.DataFrame({
+        'Referee': referees,
+        'Day': days,
+        'Week': week,
+        'Back_To_Back': gap == 1,
+        'Same_Day': gap == 0,
+        'Rest_Days': rest,
+    })
+    for col in FOUL_COLUMNS:
+        frame[col] = assignments[col].to_numpy(dtype=np.float64) if col in assignments else np.nan
+
+    grouped = frame.groupby('Referee', sort=False)
+    stats = grouped.agg(
+        Games_Officiated=('Day', 'size'),
+        First_Day=('Day', 'min'),
+        Last_Day=('Day', 'max'),
+        Back_To_Backs=('Back_To_Back', 'sum'),
+        Same_Day_Games=('Same_Day', 'sum'),
+        Avg_Rest_Days=('Rest_Days', 'mean'),
+        Min_Rest_Days=('Rest_Days', 'min'),
+        Max_Rest_Days=('Rest_Days', 'max'),
+        Avg_Foul_Differential=('Foul_Differential', 'mean'),
+        Avg_Total_Fouls=('Total_Fouls', 'mean'),
+    )
+    stats['Max_Games_In_Week'] = frame.groupby(['Referee', 'Week'], sort=False).size().groupby(level=0, sort=False).max()
+
+    weeks = (stats['Last_Day'] - stats['First_Day']) // 7 + 1
+    stats['Games_Per_Week'] = stats['Games_Officiated'] / weeks
+    stats['First_Game'] = stats['First_Day'].to_numpy().astype('datetime64[D]')
+    stats['Last_Game'] = stats['Last_Day'].to_numpy().astype('datetime64[D]')
+
+    stats = stats.reset_index()[[
+        'Referee', 'Games_Officiated', 'First_Game', 'Last_Game', 'Games_Per_Week', 'Max_Games_In_Week',
+        'Back_To_Backs', 'Same_Day_Games', 'Avg_Rest_Days', 'Min_Rest_Days', 'Max_Rest_Days',
+        'Avg_Foul_Differential', 'Avg_Total_Fouls'
+    ]]
+    return stats.sort_values(['Games_Officiated', 'Referee'], ascending=[False, True], kind='mergesort').reset_index(drop=True)
+
+
+def crew_pairs(assignments):
+    """Games worked together by each pair of referees (Referee_A < Referee_B), most frequent first"""
+    crews = assignments.sort_values(['Game_Row', 'Referee'], kind='mergesort')
+    games = crews['Game_Row'].to_numpy()
+    referees = crews['Referee'].to_numpy()
+    crew_size = int(crews.groupby('Game_Row').size().max()) if len(crews) else 0
+
+    # Within a game the referees are sorted, so pairing each row with the rows 1..crew_size-1 below it
+    # gives every pair in the game exactly once, already ordered
+    pairs_a, pairs_b = [], []
+    for offset in range(1, crew_size):
+        same_game = games[:-offset] == games[offset:]
+        pairs_a.append(referees[:-offset][same_game])
+        pairs_b.append(referees[offset:][same_game])
+    if not pairs_a:
+        return pd.DataFrame(columns=['Referee_A', 'Referee_B', 'Games_Together'])
+
+    pairs = pd.DataFrame({'Referee_A': np.concatenate(pairs_a), 'Referee_B': np.concatenate(pairs_b)})
+    counts = pairs.groupby(['Referee_A', 'Referee_B']).size().rename('Games_Together').reset_index()
+    return counts.sort_values(['Games_Together', 'Referee_A', 'Referee_B'], ascending=[False, True, True],
+                              kind='mergesort').reset_index(drop=True)
+
+
+def workload_tables(df, official_cols=None):
+    """(referee workload, crew pairs) from one melted assignment table"""
+    official_cols = official_cols or find_official_columns(df)
+    assignments = workload_assignments(df, official_cols)
+    return referee_workload(assignments), crew_pairs(assignments)
+
+
+if __name__ == "__main__":
+    print("📊 Loading NCAA games data...")
+    columns = game_columns()
+    official_cols = find_official_columns(pd.DataFrame(columns=columns))
+    df = load_games(columns=['Date'] + official_cols + [col for col in FOUL_COLUMNS if col in columns])
+    df['Date'] = pd.to_datetime(df['Date'])
+
+    workload, pairs = workload_tables(df, official_cols)
+
+    output_dir = os.path.expanduser('~/Desktop/workfiles')
+    os.makedirs(output_dir, exist_ok=True)
+    workload.to_csv(os.path.join(output_dir, 'referee_workload.csv'), index=False)
+    pairs.to_csv(os.path.join(output_dir, 'referee_crew_pairs.csv'), index=False)
+
+    print(f"\n📊 Workload for {len(workload)} referees, {len(pairs)} crew pairs")
+    print("\nMost back-to-backs:")
+    print(workload.sort_values('Back_To_Backs', ascending=False).head(10)[
+        ['Referee', 'Games_Officiated', 'Back_To_Backs', 'Avg_Rest_Days', 'Max_Games_In_Week']])
+    print("\nMost frequent crew pairs:")
+    print(pairs.head(10))
+    print(f"\n✅ Results saved to '{output_dir}'")
@@ -0,0 +1,144 @@
+"""
+Concurrent, rate-limited page fetcher for stats.ncaa.org.
+
+All requests share one pooled keep-alive aiohttp session. A token bucket
+caps the global request rate and the connector caps how many connections
+are open to one host at a time. The three pages of a contest (box score,
+team stats, officials) are fetched concurrently.
+
+Point base_url at a local server (see stub_server.py) to run against
+saved fixture HTML instead of the live site. Pass a PageCache to serve
+cached pages without a request and to store every page that is fetched.
+Pass a RetryPolicy (retry.py) to retry transient and rate-limited failures;
+a 429/503 Retry-After pauses the shared token bucket, so every request
+backs off, not just the one that was refused.
+"""
+
+import asyncio
+import time
+import aiohttp
+from retry import RATE_LIMITED, classify_error, retry_after_seconds
+
+NCAA_BASE_URL = "https://stats.ncaa.org"
+CONTEST_PAGES = ('box_score', 'team_stats', 'officials')
+
+HEADERS = {
+    "User-agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/47.0.2526.80 Safari/537.36"
+}
+
+
+def contest_url(game_id, page, base_url=NCAA_BASE_URL):
+    """URL of one page of a contest"""
+    return f"{base_url.rstrip('/')}/contests/{game_id}/{page}"
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second, bursts of up to `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds):
+        """Hand out no tokens for the next `seconds` (a server's Retry-After)"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """Fetch NCAA pages concurrently under a global rate limit and a per-host connection cap"""
+
+    def __init__(self, base_url=NCAA_BASE_URL, rate=2.0, burst=None, max_per_host=4,
+                 timeout=30, headers=None, cache=None, retry=None):
+        self.base_url = base_url.rstrip('/')
+        self.cache = cache
+        self.retry = retry
+        self.bucket = TokenBucket(rate, burst)
+        self.max_per_host = max_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.headers = headers or HEADERS
+        self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _get_session(self):
+        """Create the pooled session on first use (it must be created inside the running loop)"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.max_per_host, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout,
+                                                 headers=self.headers)
+        return self.session
+
+    async def close(self):
+        """Close the pooled session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    def contest_url(self, game_id, page):
+        """URL of one page of a contest"""
+        return contest_url(game_id, page, self.base_url)
+
+    def _on_retry(self, exc, delay):
+        """Back the whole fetcher off when the server says it is rate limiting us"""
+        if classify_error(exc) == RATE_LIMITED:
+            self.bucket.pause(retry_after_seconds(exc) or delay)
+
+    async def fetch(self, url):
+        """Fetch one page and return its HTML, retrying with backoff if there is a retry policy"""
+        if self.retry is None:
+            return await self._fetch(url)
+        return await self.retry.call(self._fetch, url, on_retry=self._on_retry)
+
+    async def _fetch(self, url):
+        """Fetch one page once, going through the page cache if there is one"""
+        request_headers = {}
+        if self.cache is not None:
+            page = self.cache.lookup(url)
+            if page is not None:
+                return page.text
+            request_headers = self.cache.revalidation_headers(url)
+        
+        session = await self._get_session()
+        await self.bucket.acquire()
+        async with session.get(url, headers=request_headers) as response:
+            if response.status == 304 and self.cache is not None:
+                return self.cache.touch(url).text
+            response.raise_for_status()
+            if self.cache is None:
+                return await response.text()
+            body = await response.read()
+            return self.cache.put(url, body, response.headers, response.status,
+                                  response.get_encoding()).text
+
+    async def fetch_contest(self, game_id):
+        """Fetch all pages of a contest concurrently, returned as {page: html}"""
+        pages = await asyncio.gather(*(self.fetch(self.contest_url(game_id, page))
+                                       for page in CONTEST_PAGES))
+        return dict(zip(CONTEST_PAGES, pages))
+
+    async def fetch_contests(self, game_ids):
+        """Fetch many contests concurrently; a failed contest is returned as its exception"""
+        return await asyncio.gather(*(self.fetch_contest(game_id) for game_id in game_ids),
+                                    return_exceptions=True)
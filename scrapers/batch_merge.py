@@ -0,0 +1,125 @@
+"""
+Append-only merge of scraped batch files into the final games dataset.
+
+Each batch_XXXX.csv is streamed onto the end of the final CSV on its own,
+so memory is bounded by one batch rather than the whole season. A manifest
+records every batch already merged (with a hash of its contents), so a
+rerun only touches new or rewritten batches. Rows are deduped on Game_ID
+against everything already in the final file; appending is flushed to disk
+before the batch is added to the manifest, so a crash in between just
+means the batch is re-read and its rows skipped as duplicates.
+
+A batch with columns the final file does not have yet widens its header:
+the final file is rewritten once, a chunk at a time, with the new columns
+left empty for the games already in it, so no scraped field is dropped.
+"""
+
+import os
+import csv
+import hashlib
+import pandas as pd
+
+CHUNK_ROWS = 10000  # Rows per chunk when rewriting the final file under a wider header
+
+
+def _file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_manifest(manifest_file):
+    """{batch file name: content hash} of the batches already merged"""
+    try:
+        with open(manifest_file, 'r') as f:
+            return dict(line.split() for line in f if line.strip())
+    except FileNotFoundError:
+        return {}
+
+
+def load_merged_ids(final_file):
+    """Game IDs already in the final dataset, read one row at a time"""
+    try:
+        with open(final_file, 'r', newline='') as f:
+            return {row['Game_ID'] for row in csv.DictReader(f)}
+    except FileNotFoundError:
+        return set()
+
+
+def widen_csv(path, columns, chunk_rows=CHUNK_ROWS):
+    """Rewrite a CSV under a wider header, a chunk at a time, leaving the new columns empty (atomic replace)"""
+    tmp_path = path + '.tmp'
+    pd.DataFrame(columns=columns).to_csv(tmp_path, index=False)
+    # Read every value as text, so the existing rows are written back unchanged
+    for chunk in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_rows):
+        chunk.reindex(columns=columns, fill_value='').to_csv(tmp_path, mode='a', header=False, index=False)
+    with open(tmp_path, 'a') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def append_csv(rows, path):
+    """
+    Append rows to a CSV in the column order of its header, first widening
+    the header with any columns the rows add; returns the columns written
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        rows.to_csv(path, index=False)
+        return list(rows.columns)
+
+    columns = list(pd.read_csv(path, nrows=0).columns)
+    new_columns = [col for col in rows.columns if col not in columns]
+    if new_columns:
+        print(f"  Adding columns {new_columns} to '{path}'")
+        columns += new_columns
+        widen_csv(path, columns)
+    rows.reindex(columns=columns).to_csv(path, mode='a', header=False, index=False)
+    return columns
+
+
+def merge_batches(save_dir, final_file, manifest_file, on_batch=None):
+    """
+    Stream unmerged batches from save_dir onto final_file.
+
+    on_batch(new_rows) is called with each batch's newly appended rows
+    (e.g. to update the columnar store). Returns the number of rows added.
+    """
+    manifest = load_manifest(manifest_file)
+    batch_files = sorted(f for f in os.listdir(save_dir) if f.startswith('batch_') and f.endswith('.csv'))
+    pending = [(name, _file_digest(os.path.join(save_dir, name))) for name in batch_files]
+    pending = [(name, digest) for name, digest in pending if manifest.get(name) != digest]
+    if not pending:
+        return 0
+
+    seen = load_merged_ids(final_file)
+    added = 0
+
+    for name, digest in pending:
+        batch = pd.read_csv(os.path.join(save_dir, name), dtype={'Game_ID': str})
+        batch = batch.drop_duplicates(subset='Game_ID')
+        batch = batch[~batch['Game_ID'].isin(seen)]
+
+        if len(batch):
+            append_csv(batch, final_file)
+            with open(final_file, 'a') as f:
+                os.fsync(f.fileno())
+            seen.update(batch['Game_ID'])
+            added += len(batch)
+            if on_batch is not None:
+                on_batch(batch)
+
+        with open(manifest_file, 'a') as f:
+            f.write(f"{name} {digest}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        print(f"  Merged {name}: {len(batch)} new games")
+
+    return added
+
+
+def count_rows(final_file):
+    """Number of games in the final dataset, without loading it"""
+    try:
+        with open(final_file, 'r', newline='') as f:
+            return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+    except FileNotFoundError:
+        return 0
@@ -0,0 +1,80 @@
+"""
+Benchmark targeted table extraction against pd.read_html on saved pages.
+
+Usage:
+    python benchmark_table_extractor.py [fixture_dir] [repeats]
+
+fixture_dir defaults to the saved contest and scoreboard pages in
+tests/fixtures.
+
+Every *.html file under fixture_dir is parsed both ways. Files named after
+a contest page (box_score.html, team_stats.html, officials.html) extract the
+tables the game parser reads; any other page extracts its first table.
+Peak memory is the Python-heap peak reported by tracemalloc.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+import pandas as pd
+from io import StringIO
+from table_extractor import extract_tables
+from game_parser import PAGE_TABLES
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'fixtures')
+
+
+def measure(func, html, repeats):
+    """Best time and peak traced memory of func(html)"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(html)
+        best = min(best, time.perf_counter() - start)
+    
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def find_pages(fixture_dir):
+    """Every saved HTML page under the fixture directory"""
+    for root, _, files in os.walk(fixture_dir):
+        for name in sorted(files):
+            if name.endswith('.html'):
+                yield os.path.join(root, name)
+
+
+if __name__ == "__main__":
+    fixture_dir = sys.argv[1] if len(sys.argv) > 1 else FIXTURE_DIR
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    
+    results = []
+    for path in find_pages(fixture_dir):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            html = f.read()
+        indices = PAGE_TABLES.get(os.path.splitext(os.path.basename(path))[0], [0])
+        
+        read_html_time, read_html_peak = measure(lambda h: pd.read_html(StringIO(h)), html, repeats)
+        extract_time, extract_peak = measure(lambda h: extract_tables(h, indices), html, repeats)
+        results.append({
+            'Page': os.path.relpath(path, fixture_dir),
+            'KB': round(len(html) / 1024, 1),
+            'read_html_ms': round(read_html_time * 1000, 2),
+            'extract_ms': round(extract_time * 1000, 2),
+            'Speedup': round(read_html_time / extract_time, 1),
+            'read_html_peak_KB': round(read_html_peak / 1024, 1),
+            'extract_peak_KB': round(extract_peak / 1024, 1)
+        })
+    
+    if not results:
+        print(f"❌ No .html pages found under '{fixture_dir}'")
+        sys.exit(1)
+    
+    results = pd.DataFrame(results)
+    print(results.to_string(index=False))
+    print(f"\n📊 Total parse time: read_html {results['read_html_ms'].sum():.1f} ms, "
+          f"extractor {results['extract_ms'].sum():.1f} ms")
@@ -0,0 +1,57 @@
+"""
+Extract contest IDs (and their dates) from NCAA scoreboard pages.
+
+One compiled regex walks the page once with finditer: it matches a contest
+row (<tr id="contest_1234567">), the end of a row, or an MM/DD/YYYY date, so
+nothing is sliced or copied and IDs of any length are picked up.
+"""
+
+import re
+import datetime as dt
+
+SCOREBOARD_TOKENS = re.compile(
+    r'<tr\s+id="contest_(?P<contest>\d+)"'
+    r'|(?P<row_end></tr>)'
+    r'|\b(?P<date>(?:0[1-9]|1[0-2])/(?:0[1-9]|[12]\d|3[01])/\d{4})\b'
+)
+
+
+def _parse_date(text):
+    return dt.datetime.strptime(text, "%m/%d/%Y").date()
+
+
+def extract_contest_ids(html, default_date=None):
+    """
+    Return [(date, contest_id), ...] in page order, each contest once.
+
+    A contest is dated by the first date that appears inside its row;
+    rows without a date of their own take default_date (normally the
+    scoreboard's game_date). Dates outside contest rows are ignored.
+    """
+    results = []
+    seen = set()
+    pending = None  # index into results of the contest still waiting for its date
+
+    for match in SCOREBOARD_TOKENS.finditer(html):
+        contest = match.group('contest')
+        if contest is not None:
+            pending = None
+            if contest in seen:
+                continue
+            seen.add(contest)
+            results.append([default_date, contest])
+            pending = len(results) - 1
+            continue
+
+        if match.group('row_end') is not None:
+            pending = None
+            continue
+
+        if pending is not None:
+            try:
+                results[pending][0] = _parse_date(match.group('date'))
+            except ValueError:
+                continue
+            pending = None
+
+    return [tuple(result) for result in results]
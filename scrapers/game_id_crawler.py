@@ -0,0 +1,132 @@
+"""
+Concurrent, resumable crawl of NCAA scoreboard pages for Game IDs.
+
+Scoreboards for every date are fetched concurrently through AsyncFetcher
+(global token-bucket rate limit, pooled keep-alive session, page cache,
+retries with backoff),
+but they are committed strictly in date order: each date's new (Date,
+Game ID) rows are appended to the output CSV and fsynced, and only then is
+that date recorded as completed in the state file. After a crash the crawl
+resumes from the day after the last completed date. Game IDs are deduped
+with one set across the whole season, seeded from the existing CSV.
+"""
+
+import os
+import csv
+import asyncio
+import datetime as dt
+from urllib.parse import urlencode
+from async_fetcher import AsyncFetcher, NCAA_BASE_URL
+from contest_ids import extract_contest_ids
+from page_cache import PageCache
+from retry import RetryPolicy
+
+SEASON_DIVISION_ID = 18403  # 2024-25 Division I men's basketball
+OUTPUT_COLUMNS = ['Date', 'Game ID']
+
+
+def scoreboard_url(day, base_url=NCAA_BASE_URL, season_division_id=SEASON_DIVISION_ID):
+    """URL of the livestream scoreboard for one date"""
+    query = urlencode({
+        'utf8': '✓',
+        'season_division_id': '',
+        'game_date': day.strftime('%m/%d/%Y'),
+        'conference_id': 0,
+        'tournament_id': '',
+        'commit': 'Submit'
+    })
+    return f"{base_url.rstrip('/')}/season_divisions/{season_division_id}/livestream_scoreboards?{query}"
+
+
+def load_crawl_state(state_file):
+    """Last fully committed date, or None"""
+    try:
+        with open(state_file, 'r') as f:
+            return dt.date.fromisoformat(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_crawl_state(state_file, day):
+    """Record a date as completed (atomic replace, so the file is never half-written)"""
+    tmp_file = state_file + '.tmp'
+    with open(tmp_file, 'w') as f:
+        f.write(day.isoformat())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, state_file)
+
+
+def load_seen_ids(output_csv):
+    """Game IDs already written to the output CSV"""
+    try:
+        with open(output_csv, 'r', newline='') as f:
+            return {row['Game ID'] for row in csv.DictReader(f)}
+    except FileNotFoundError:
+        return set()
+
+
+async def crawl_game_ids(days, output_csv, state_file, fetcher, base_url=NCAA_BASE_URL):
+    """Fetch scoreboards for days concurrently and stream new rows to output_csv in date order"""
+    seen = load_seen_ids(output_csv)
+    write_header = not os.path.exists(output_csv) or os.path.getsize(output_csv) == 0
+    tasks = [asyncio.ensure_future(fetcher.fetch(scoreboard_url(day, base_url))) for day in days]
+    new_rows = 0
+
+    try:
+        with open(output_csv, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(OUTPUT_COLUMNS)
+
+            for day, task in zip(days, tasks):
+                html = await task
+                rows = []
+                for game_date, contest_id in extract_contest_ids(html, day):
+                    if contest_id not in seen:
+                        seen.add(contest_id)
+                        rows.append((game_date.isoformat(), contest_id))
+
+                writer.writerows(rows)
+                f.flush()
+                os.fsync(f.fileno())
+                save_crawl_state(state_file, day)
+                new_rows += len(rows)
+                print(f"📅 {day}: {len(rows)} new games ({len(seen)} this season)")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return new_rows
+
+
+def daterange(start_date, end_date):
+    """Each date from start_date up to end_date (exclusive)"""
+    for n in range(int((end_date - start_date).days)):
+        yield start_date + dt.timedelta(n)
+
+
+def run_crawl(start_date, end_date, output_csv, state_file, base_url=NCAA_BASE_URL,
+              rate=1.0, max_per_host=4, resume=True, retry=None):
+    """
+    Crawl [start_date, end_date), resuming after the last completed date;
+    returns rows added. Failed scoreboard fetches are retried with retry
+    (a RetryPolicy, the default one if None).
+    """
+    last_done = load_crawl_state(state_file) if resume else None
+    if last_done is not None and last_done >= start_date:
+        print(f"⏩ Resuming after {last_done}")
+        start_date = last_done + dt.timedelta(days=1)
+
+    days = list(daterange(start_date, end_date))
+    if not days:
+        print("✅ Nothing to crawl, every date is already done")
+        return 0
+
+    async def crawl():
+        async with AsyncFetcher(base_url=base_url, rate=rate, max_per_host=max_per_host,
+                                cache=PageCache(), retry=retry or RetryPolicy()) as fetcher:
+            return await crawl_game_ids(days, output_csv, state_file, fetcher, base_url)
+
+    return asyncio.run(crawl())
@@ -0,0 +1,130 @@
+"""
+Parse stored NCAA contest pages into game rows.
+
+This is the second stage of the scrape: the fetcher stores raw HTML in the
+page cache, and these functions turn a contest's box score, team stats and
+officials pages into one row of ncaa_games_data_complete.csv. Changing a
+column index here only needs a rerun of parse_pages.py, not a new scrape.
+
+Only the tables listed in PAGE_TABLES are extracted (see table_extractor.py);
+read_all_tables() keeps the old pd.read_html path for comparison.
+"""
+
+import pandas as pd
+from io import StringIO
+from table_extractor import extract_table_list
+
+# Tables build_game_info reads from each page, by read_html position
+PAGE_TABLES = {
+    'box_score': [1],
+    'team_stats': [3],
+    'officials': [3]
+}
+
+
+def safe_convert_to_numeric(value):
+    """Safely convert a value to numeric, returning None if conversion fails"""
+    try:
+        if pd.isna(value):
+            return None
+        return pd.to_numeric(str(value).replace(',', ''))
+    except:
+        return None
+
+
+def get_officials(officials_df):
+    """Extract officials and return them as separate entries"""
+    if officials_df is None or officials_df.empty or len(officials_df) < 3:
+        return None, None, None
+    
+    officials_list = officials_df['Official'].tolist()
+    # Pad the list with None values if less than 3 officials
+    officials_list.extend([None] * (3 - len(officials_list)))
+    # Return only the first 3 officials
+    return officials_list[0], officials_list[1], officials_list[2]
+
+
+def build_game_info(game_id, game_date, box_score, team_stats, officials):
+    """Build one game row from the parsed box score, team stats and officials tables"""
+    # Get officials
+    official1, official2, official3 = get_officials(officials[3] if len(officials) > 3 else None)
+
+    # Extract game information from box score tables
+    game_info = {
+        'Game_ID': game_id,
+        'Date': game_date,
+        'Home_Team': box_score[1].iloc[1, 0] if len(box_score) > 1 and not box_score[1].empty else None,
+        'Away_Team': box_score[1].iloc[2, 0] if len(box_score) > 1 and not box_score[1].empty else None,
+        'Home_Score_1H': safe_convert_to_numeric(box_score[1].iloc[1, 1]) if len(box_score) > 1 and not box_score[1].empty else None,
+        'Home_Score_2H': safe_convert_to_numeric(box_score[1].iloc[1, 2]) if len(box_score) > 1 and not box_score[1].empty else None,
+        'Home_Score_Final': safe_convert_to_numeric(box_score[1].iloc[1, 3]) if len(box_score) > 1 and not box_score[1].empty else None,
+        'Away_Score_1H': safe_convert_to_numeric(box_score[1].iloc[2, 1]) if len(box_score) > 1 and not box_score[1].empty else None,
+        'Away_Score_2H': safe_convert_to_numeric(box_score[1].iloc[2, 2]) if len(box_score) > 1 and not box_score[1].empty else None,
+        'Away_Score_Final': safe_convert_to_numeric(box_score[1].iloc[2, 3]) if len(box_score) > 1 and not box_score[1].empty else None,
+        'Venue': box_score[1].iloc[4, 0] if len(box_score) > 1 and not box_score[1].empty else None,
+        'Game_Time': box_score[1].iloc[3, 0] if len(box_score) > 1 and not box_score[1].empty else None,
+        'Official_1': official1,
+        'Official_2': official2,
+        'Official_3': official3
+    }
+
+    # Extract team stats
+    if len(team_stats) > 3 and not team_stats[3].empty:
+        period_stats = team_stats[3]
+
+        # Foul-related stats
+        game_info.update({
+            # Personal Fouls
+            'Home_Personal_Fouls': safe_convert_to_numeric(period_stats.iloc[9, 1]) if not period_stats.empty else None,
+            'Away_Personal_Fouls': safe_convert_to_numeric(period_stats.iloc[9, 2]) if not period_stats.empty else None,
+
+            # Free Throws
+            'Home_FTM': safe_convert_to_numeric(period_stats.iloc[7, 1]) if not period_stats.empty else None,
+            'Away_FTM': safe_convert_to_numeric(period_stats.iloc[7, 2]) if not period_stats.empty else None,
+            'Home_FTA': safe_convert_to_numeric(period_stats.iloc[8, 1]) if not period_stats.empty else None,
+            'Away_FTA': safe_convert_to_numeric(period_stats.iloc[8, 2]) if not period_stats.empty else None,
+
+            # Free Throw Percentage
+            'Home_FT_Percentage': safe_convert_to_numeric(period_stats.iloc[8, 1]) if not period_stats.empty else None,
+            'Away_FT_Percentage': safe_convert_to_numeric(period_stats.iloc[8, 2]) if not period_stats.empty else None,
+
+            # Technical Fouls
+            'Home_Technical_Fouls': safe_convert_to_numeric(period_stats.iloc[10, 1]) if not period_stats.empty else None,
+            'Away_Technical_Fouls': safe_convert_to_numeric(period_stats.iloc[10, 2]) if not period_stats.empty else None,
+
+            # Flagrant Fouls
+            'Home_Flagrant_Fouls': safe_convert_to_numeric(period_stats.iloc[11, 1]) if not period_stats.empty else None,
+            'Away_Flagrant_Fouls': safe_convert_to_numeric(period_stats.iloc[11, 2]) if not period_stats.empty else None,
+
+            # Fouls by Period
+            'Home_Fouls_1H': safe_convert_to_numeric(period_stats.iloc[12, 1]) if not period_stats.empty else None,
+            'Away_Fouls_1H': safe_convert_to_numeric(period_stats.iloc[12, 2]) if not period_stats.empty else None,
+            'Home_Fouls_2H': safe_convert_to_numeric(period_stats.iloc[13, 1]) if not period_stats.empty else None,
+            'Away_Fouls_2H': safe_convert_to_numeric(period_stats.iloc[13, 2]) if not period_stats.empty else None,
+        })
+
+        # Calculate derived foul statistics
+        if game_info['Home_Personal_Fouls'] is not None and game_info['Away_Personal_Fouls'] is not None:
+            game_info['Foul_Differential'] = game_info['Home_Personal_Fouls'] - game_info['Away_Personal_Fouls']
+            game_info['Total_Fouls'] = game_info['Home_Personal_Fouls'] + game_info['Away_Personal_Fouls']
+
+        if game_info['Home_FTA'] is not None and game_info['Away_FTA'] is not None:
+            game_info['Free_Throw_Differential'] = game_info['Home_FTA'] - game_info['Away_FTA']
+
+    return game_info
+
+
+def read_tables(pages):
+    """Extract only the tables build_game_info reads from each page"""
+    return {page: extract_table_list(pages[page], indices) for page, indices in PAGE_TABLES.items()}
+
+
+def read_all_tables(pages):
+    """Parse every table on each page with pd.read_html"""
+    return {page: pd.read_html(StringIO(pages[page])) for page in PAGE_TABLES}
+
+
+def parse_contest(game_id, game_date, pages, reader=read_tables):
+    """Parse a contest's {page: html} into one game row"""
+    tables = reader(pages)
+    return build_game_info(game_id, game_date, tables['box_score'], tables['team_stats'], tables['officials'])
@@ -0,0 +1,223 @@
+"""
+Persistent on-disk cache for stats.ncaa.org pages.
+
+Layout under the cache directory:
+    objects/ab/abcd...gz   gzip-compressed page bodies, named by the SHA-256
+                           of the body, so identical pages are stored once
+    entries/12/1234...json one metadata file per URL (named by the SHA-256 of
+                           the URL): body hash, ETag, Last-Modified, status
+                           and fetch time
+
+Modes:
+    'online'  serve fresh entries from the cache and fetch (or revalidate
+              with ETag/Last-Modified) everything else
+    'replay'  never touch the network; a cache miss raises CacheMiss, so the
+              parsers can be rerun or changed offline
+    'refresh' revalidate every page, even fresh ones
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import tempfile
+from urllib.parse import urlsplit, parse_qs
+from datetime import datetime, date
+
+CACHE_MODES = ('online', 'replay', 'refresh')
+CACHE_MODE = os.environ.get('NCAA_CACHE_MODE', 'online')
+CACHE_DIRECTORY = os.environ.get('NCAA_CACHE_DIR', 'page_cache')
+
+SCOREBOARD_TTL = 60 * 60  # Scoreboards for recent dates can still change
+SETTLED_AFTER_DAYS = 2  # Scoreboards this many days in the past are final
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a page is not in the cache"""
+
+
+def default_ttl(url):
+    """
+    Seconds a cached page stays fresh, or None if it never expires.
+
+    Contest pages (box score, team stats, officials) are only scraped for
+    finished games, so they never change and are never refetched. A
+    scoreboard is final once its date is a couple of days in the past.
+    """
+    parts = urlsplit(url)
+    if '/contests/' in parts.path:
+        return None
+
+    game_date = parse_qs(parts.query).get('game_date')
+    if game_date:
+        try:
+            day = datetime.strptime(game_date[0], '%m/%d/%Y').date()
+        except ValueError:
+            return SCOREBOARD_TTL
+        if (date.today() - day).days >= SETTLED_AFTER_DAYS:
+            return None
+    return SCOREBOARD_TTL
+
+
+class CachedPage:
+    """A cached page body plus its fetch metadata"""
+
+    def __init__(self, url, body, meta):
+        self.url = url
+        self.body = body
+        self.meta = meta
+
+    @property
+    def text(self):
+        return self.body.decode(self.meta.get('encoding') or 'utf-8', errors='replace')
+
+    @property
+    def fetched_at(self):
+        return self.meta.get('fetched_at', 0)
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _atomic_write(path, data):
+    """Write bytes to path via a temp file and rename, so readers never see half a file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class PageCache:
+    """URL-keyed, content-addressed page store with TTL and replay support"""
+
+    def __init__(self, cache_dir=CACHE_DIRECTORY, mode=CACHE_MODE, ttl_policy=default_ttl):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{mode}', expected one of {CACHE_MODES}")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.ttl_policy = ttl_policy
+
+    def _entry_path(self, url):
+        key = _sha256(url.encode('utf-8'))
+        return os.path.join(self.cache_dir, 'entries', key[:2], key + '.json')
+
+    def _object_path(self, digest):
+        return os.path.join(self.cache_dir, 'objects', digest[:2], digest + '.gz')
+
+    def get_meta(self, url):
+        """Metadata for a cached URL, or None"""
+        try:
+            with open(self._entry_path(url), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def get(self, url):
+        """Cached page for a URL, or None"""
+        meta = self.get_meta(url)
+        if meta is None:
+            return None
+        try:
+            with gzip.open(self._object_path(meta['sha256']), 'rb') as f:
+                body = f.read()
+        except (FileNotFoundError, OSError, EOFError):
+            return None
+        return CachedPage(url, body, meta)
+
+    def put(self, url, body, headers=None, status=200, encoding=None):
+        """Store a page body and its response headers"""
+        if isinstance(body, str):
+            encoding = encoding or 'utf-8'
+            body = body.encode(encoding)
+        headers = headers or {}
+        digest = _sha256(body)
+
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            _atomic_write(object_path, gzip.compress(body))
+
+        meta = {
+            'url': url,
+            'sha256': digest,
+            'size': len(body),
+            'status': status,
+            'encoding': encoding,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': time.time()
+        }
+        _atomic_write(self._entry_path(url), json.dumps(meta).encode('utf-8'))
+        return CachedPage(url, body, meta)
+
+    def touch(self, url):
+        """Mark a cached page as just revalidated (HTTP 304)"""
+        page = self.get(url)
+        if page is not None:
+            page.meta['fetched_at'] = time.time()
+            _atomic_write(self._entry_path(url), json.dumps(page.meta).encode('utf-8'))
+        return page
+
+    def is_fresh(self, page):
+        """True if a cached page can be served without revalidation"""
+        if self.mode == 'refresh':
+            return False
+        ttl = self.ttl_policy(page.url)
+        return ttl is None or time.time() - page.fetched_at < ttl
+
+    def lookup(self, url):
+        """
+        Cached page to serve without touching the network, or None.
+
+        Raises CacheMiss in replay mode when the URL was never cached.
+        """
+        page = self.get(url)
+        if self.mode == 'replay':
+            if page is None:
+                raise CacheMiss(url)
+            return page
+        if page is not None and self.is_fresh(page):
+            return page
+        return None
+
+    def revalidation_headers(self, url):
+        """Conditional request headers for a stale cached page"""
+        meta = self.get_meta(url) or {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def fetch(self, url, headers=None, timeout=30):
+        """Fetch a page synchronously through the cache and return its text"""
+        page = self.lookup(url)
+        if page is not None:
+            return page.text
+
+        import requests
+        request_headers = dict(headers or {})
+        request_headers.update(self.revalidation_headers(url))
+        response = requests.get(url, headers=request_headers, timeout=timeout)
+        if response.status_code == 304:
+            return self.touch(url).text
+        response.raise_for_status()
+        return self.put(url, response.content, response.headers, response.status_code,
+                        response.encoding).text
+
+    def urls(self):
+        """Every cached URL"""
+        entries_dir = os.path.join(self.cache_dir, 'entries')
+        for root, _, files in os.walk(entries_dir):
+            for name in files:
+                if name.endswith('.json'):
+                    with open(os.path.join(root, name), 'r') as f:
+                        yield json.load(f)['url']
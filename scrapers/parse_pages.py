@@ -0,0 +1,89 @@
+"""
+Stage two of the scrape: rebuild ncaa_games_data_complete.csv from cached HTML.
+
+The scraper (stage one) stores every contest page in the page cache. This
+script never touches the network; it reads the stored pages for every
+Game ID in regular_season_game_ids.csv and parses them across a process
+pool, so a parser change only costs a reparse. The reparsed games also
+rebuild their partitions of the columnar store (game_store.py), so the
+analysis reads the same games as the CSV.
+
+Usage:
+    python parse_pages.py [game_ids_csv] [output_csv] [workers]
+"""
+
+# ===========================================
+# 📦 Import Required Libraries
+# ===========================================
+import os
+import sys
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from async_fetcher import NCAA_BASE_URL, CONTEST_PAGES, contest_url
+from page_cache import PageCache, CacheMiss, CACHE_DIRECTORY
+from game_parser import parse_contest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'referee_analysis'))
+from game_store import write_games, GAMES_STORE  # Typed, partitioned Parquet copy of the games
+
+# ===========================================
+# ⚙️ Configuration
+# ===========================================
+GAME_IDS_FILE = "regular_season_game_ids.csv"
+OUTPUT_FILE = "ncaa_games_data_complete.csv"
+FAILED_FILE = "parse_failures.csv"
+BASE_URL = os.environ.get("NCAA_BASE_URL", NCAA_BASE_URL)  # Must match the URL the pages were cached under
+CHUNK_SIZE = 25  # Games handed to a worker at a time
+
+
+def parse_cached_game(args):
+    """Load one game's pages from the cache and parse them; returns (row, error)"""
+    game_id, game_date, cache_dir, base_url = args
+    cache = PageCache(cache_dir, mode='replay')
+    try:
+        pages = {page: cache.lookup(contest_url(game_id, page, base_url)).text for page in CONTEST_PAGES}
+        return parse_contest(game_id, game_date, pages), None
+    except CacheMiss as e:
+        return None, f"Not cached: {e}"
+    except Exception as e:
+        return None, str(e)
+
+
+def parse_all(game_data, cache_dir=CACHE_DIRECTORY, base_url=BASE_URL, workers=None):
+    """Parse every game in game_data from the cache; returns (rows, failures) in game order"""
+    tasks = [(game_id, game_date, cache_dir, base_url)
+             for game_id, game_date in zip(game_data['Game ID'], game_data['Date'])]
+    
+    rows, failures = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for (game_id, _, _, _), (row, error) in zip(tasks, pool.map(parse_cached_game, tasks, chunksize=CHUNK_SIZE)):
+            if error is None:
+                rows.append(row)
+            else:
+                failures.append({'Game_ID': game_id, 'Error': error})
+    return rows, failures
+
+
+if __name__ == "__main__":
+    game_ids_file = sys.argv[1] if len(sys.argv) > 1 else GAME_IDS_FILE
+    output_file = sys.argv[2] if len(sys.argv) > 2 else OUTPUT_FILE
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    
+    game_data = pd.read_csv(game_ids_file)
+    print(f"🧩 Parsing {len(game_data)} games from the page cache in '{CACHE_DIRECTORY}'...")
+    
+    start = time.time()
+    rows, failures = parse_all(game_data, workers=workers)
+    
+    games = pd.DataFrame(rows)
+    games.to_csv(output_file, index=False)
+    print(f"✅ Saved {len(rows)} games to '{output_file}' in {time.time() - start:.1f}s")
+    
+    if rows:
+        write_games(games)
+        print(f"🗄️ Rebuilt the columnar store in '{GAMES_STORE}'")
+    
+    if failures:
+        pd.DataFrame(failures).to_csv(FAILED_FILE, index=False)
+        print(f"❌ {len(failures)} games could not be parsed, see '{FAILED_FILE}'")
@@ -8,12 +8,18 @@ Created on Sun Mar 30 23:45:24 2025
 # 📦 Import Required Libraries
 # ===========================================
 import pandas as pd
-import time
-import requests
-from bs4 import BeautifulSoup
-import numpy as np
 import os
-from datetime import datetime
+import sys
+import asyncio
+from async_fetcher import AsyncFetcher, NCAA_BASE_URL
+from page_cache import PageCache
+from game_parser import parse_contest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'referee_analysis'))
+from game_store import append_games  # Typed, partitioned Parquet copy of the merged games
+from batch_merge import merge_batches, count_rows
+from scrape_journal import ScrapeJournal
+from retry import RetryPolicy, classify_error
 
 # ===========================================
 # 📂 Load Game Metadata CSV
@@ -26,7 +32,17 @@ game_data = pd.read_csv(file_path)
 # ===========================================
 BATCH_SIZE = 50  # Number of games to process in each batch
 SAVE_DIRECTORY = "scraped_data"
-RESUME_FILE = "resume_state.txt"
+JOURNAL_FILE = f"{SAVE_DIRECTORY}/scrape_journal.jsonl"  # Append-only record of every game, failure and batch
+FINAL_FILE = "ncaa_games_data_complete.csv"
+MERGE_MANIFEST = f"{SAVE_DIRECTORY}/merged_batches.txt"  # Batches already appended to FINAL_FILE
+BASE_URL = os.environ.get("NCAA_BASE_URL", NCAA_BASE_URL)  # Point at stub_server.py to scrape fixtures
+REQUESTS_PER_SECOND = 2.0  # Global request rate shared by all connections
+MAX_CONNECTIONS_PER_HOST = 4  # Concurrent keep-alive connections to stats.ncaa.org
+MAX_ATTEMPTS = 5  # Tries per page for timeouts, 5xx and 429s before the game is recorded as failed
+RETRY_BASE_DELAY = 2.0  # Seconds; backoff doubles per attempt (with jitter), Retry-After wins if longer
+# Run with `retry-failed` to requeue only the games whose last failure was transient or rate limited
+MODE = sys.argv[1] if len(sys.argv) > 1 else 'scrape'
+# Pages are cached under NCAA_CACHE_DIR; set NCAA_CACHE_MODE=replay to rerun offline from the cache
 
 # Create save directory if it doesn't exist
 if not os.path.exists(SAVE_DIRECTORY):
@@ -35,217 +51,120 @@ if not os.path.exists(SAVE_DIRECTORY):
 # ===========================================
 # 📝 Helper Functions
 # ===========================================
-def safe_convert_to_numeric(value):
-    """Safely convert a value to numeric, returning None if conversion fails"""
-    try:
-        if pd.isna(value):
-            return None
-        return pd.to_numeric(str(value).replace(',', ''))
-    except:
-        return None
-
-def get_officials(officials_df):
-    """Extract officials and return them as separate entries"""
-    if officials_df is None or officials_df.empty or len(officials_df) < 3:
-        return None, None, None
-    
-    officials_list = officials_df['Official'].tolist()
-    # Pad the list with None values if less than 3 officials
-    officials_list.extend([None] * (3 - len(officials_list)))
-    # Return only the first 3 officials
-    return officials_list[0], officials_list[1], officials_list[2]
-
 def save_batch_data(batch_data, batch_num):
-    """Save batch data to a CSV file"""
+    """Save batch data to a CSV file (written to a temp file and renamed, so it is never half-written)"""
     batch_file = f"{SAVE_DIRECTORY}/batch_{batch_num:04d}.csv"
-    pd.DataFrame(batch_data).to_csv(batch_file, index=False)
+    pd.DataFrame(batch_data).to_csv(batch_file + '.tmp', index=False)
+    os.replace(batch_file + '.tmp', batch_file)
     return batch_file
 
-def save_resume_state(last_completed_index):
-    """Save the current state for resume capability"""
-    with open(RESUME_FILE, 'w') as f:
-        f.write(str(last_completed_index))
-
-def load_resume_state():
-    """Load the last saved state"""
-    try:
-        with open(RESUME_FILE, 'r') as f:
-            return int(f.read().strip())
-    except:
-        return 0
+def flush_batch(journal, batch_data):
+    """Save scraped rows as the next batch file and journal it"""
+    batch_num = journal.next_batch
+    batch_file = save_batch_data(batch_data, batch_num)
+    journal.record_batch(batch_num, batch_file, [row['Game_ID'] for row in batch_data])
+    return batch_num, batch_file
 
 def merge_batch_files():
-    """Merge all batch files into a single final dataset"""
-    all_files = sorted([f for f in os.listdir(SAVE_DIRECTORY) if f.startswith('batch_') and f.endswith('.csv')])
-    if not all_files:
-        return
-    
-    dfs = []
-    for file in all_files:
-        df = pd.read_csv(f"{SAVE_DIRECTORY}/{file}")
-        dfs.append(df)
-    
-    final_df = pd.concat(dfs, ignore_index=True)
-    final_df.to_csv('ncaa_games_data_complete.csv', index=False)
-    return final_df
+    """Append the batches not merged yet to the final dataset (and the columnar store)"""
+    return merge_batches(SAVE_DIRECTORY, FINAL_FILE, MERGE_MANIFEST, on_batch=append_games)
 
 # ===========================================
 # 🔄 Process Games in Batches
 # ===========================================
-start_index = load_resume_state()
-total_games = len(game_data)
-current_batch = start_index // BATCH_SIZE + 1
+journal = ScrapeJournal(JOURNAL_FILE, SAVE_DIRECTORY)
+if MODE == 'retry-failed':
+    # Drain the failure queue: permanent failures (parse errors, 404s) would only fail again
+    remaining = game_data[game_data['Game ID'].astype(str).isin(journal.retryable_ids())]
+    remaining = remaining.drop_duplicates(subset='Game ID')
+    total_games = len(remaining)
+    print(f"🔁 Retrying {total_games} failed games")
+else:
+    done_ids = journal.done_ids()
+    remaining = game_data[~game_data['Game ID'].astype(str).isin(done_ids)]
+    total_games = len(game_data)
 
 print(f"Total games to process: {total_games}")
-print(f"Starting from game index: {start_index}")
-print(f"Current batch: {current_batch}")
+print(f"Already done: {total_games - len(remaining)}")
+print(f"Next batch: {journal.next_batch}")
+
+# Rows scraped before a crash but not yet saved to a batch file go into the next batch
+batch_data = journal.pending_rows()
 
-# Initialize batch storage
-batch_data = []
-failed_games = []
+# One event loop and fetcher for the whole run, so the keep-alive session is reused across chunks
+loop = asyncio.new_event_loop()
+fetcher = AsyncFetcher(base_url=BASE_URL, rate=REQUESTS_PER_SECOND, max_per_host=MAX_CONNECTIONS_PER_HOST,
+                       cache=PageCache(), retry=RetryPolicy(MAX_ATTEMPTS, RETRY_BASE_DELAY))
 
 try:
-    for i in range(start_index, total_games):
-        game_id = game_data.iloc[i]['Game ID']
-        game_date = game_data.iloc[i]['Date']
+    for chunk_start in range(0, len(remaining), BATCH_SIZE):
+        chunk = remaining.iloc[chunk_start:chunk_start + BATCH_SIZE]
+        done = total_games - len(remaining) + chunk_start
         
-        try:
-            print(f"\n🔄 Scraping Game ID: {game_id} ({i+1}/{total_games})")
-            
-            # -------- Box Score --------
-            url_box = f'https://stats.ncaa.org/contests/{game_id}/box_score'
-            print(f"  Fetching box score...")
-            box_score = pd.read_html(url_box)
-            
-            # -------- Team Stats --------
-            url_team = f'https://stats.ncaa.org/contests/{game_id}/team_stats'
-            print(f"  Fetching team stats...")
-            team_stats = pd.read_html(url_team)
-            time.sleep(1.5)  # Polite delay between requests
-            
-            # -------- Officials --------
-            url_official = f'https://stats.ncaa.org/contests/{game_id}/officials'
-            print(f"  Fetching officials...")
-            officials = pd.read_html(url_official)
-            time.sleep(1.5)
-            
-            # Get officials
-            official1, official2, official3 = get_officials(officials[3] if len(officials) > 3 else None)
-            
-            # Extract game information from box score tables
-            game_info = {
-                'Game_ID': game_id,
-                'Date': game_date,
-                'Home_Team': box_score[1].iloc[1, 0] if len(box_score) > 1 and not box_score[1].empty else None,
-                'Away_Team': box_score[1].iloc[2, 0] if len(box_score) > 1 and not box_score[1].empty else None,
-                'Home_Score_1H': safe_convert_to_numeric(box_score[1].iloc[1, 1]) if len(box_score) > 1 and not box_score[1].empty else None,
-                'Home_Score_2H': safe_convert_to_numeric(box_score[1].iloc[1, 2]) if len(box_score) > 1 and not box_score[1].empty else None,
-                'Home_Score_Final': safe_convert_to_numeric(box_score[1].iloc[1, 3]) if len(box_score) > 1 and not box_score[1].empty else None,
-                'Away_Score_1H': safe_convert_to_numeric(box_score[1].iloc[2, 1]) if len(box_score) > 1 and not box_score[1].empty else None,
-                'Away_Score_2H': safe_convert_to_numeric(box_score[1].iloc[2, 2]) if len(box_score) > 1 and not box_score[1].empty else None,
-                'Away_Score_Final': safe_convert_to_numeric(box_score[1].iloc[2, 3]) if len(box_score) > 1 and not box_score[1].empty else None,
-                'Venue': box_score[1].iloc[4, 0] if len(box_score) > 1 and not box_score[1].empty else None,
-                'Game_Time': box_score[1].iloc[3, 0] if len(box_score) > 1 and not box_score[1].empty else None,
-                'Official_1': official1,
-                'Official_2': official2,
-                'Official_3': official3
-            }
-            
-            # Extract team stats
-            if len(team_stats) > 3 and not team_stats[3].empty:
-                period_stats = team_stats[3]
-                
-                # Foul-related stats
-                game_info.update({
-                    # Personal Fouls
-                    'Home_Personal_Fouls': safe_convert_to_numeric(period_stats.iloc[9, 1]) if not period_stats.empty else None,
-                    'Away_Personal_Fouls': safe_convert_to_numeric(period_stats.iloc[9, 2]) if not period_stats.empty else None,
-                    
-                    # Free Throws
-                    'Home_FTM': safe_convert_to_numeric(period_stats.iloc[7, 1]) if not period_stats.empty else None,
-                    'Away_FTM': safe_convert_to_numeric(period_stats.iloc[7, 2]) if not period_stats.empty else None,
-                    'Home_FTA': safe_convert_to_numeric(period_stats.iloc[8, 1]) if not period_stats.empty else None,
-                    'Away_FTA': safe_convert_to_numeric(period_stats.iloc[8, 2]) if not period_stats.empty else None,
-                    
-                    # Free Throw Percentage
-                    'Home_FT_Percentage': safe_convert_to_numeric(period_stats.iloc[8, 1]) if not period_stats.empty else None,
-                    'Away_FT_Percentage': safe_convert_to_numeric(period_stats.iloc[8, 2]) if not period_stats.empty else None,
-                    
-                    # Technical Fouls
-                    'Home_Technical_Fouls': safe_convert_to_numeric(period_stats.iloc[10, 1]) if not period_stats.empty else None,
-                    'Away_Technical_Fouls': safe_convert_to_numeric(period_stats.iloc[10, 2]) if not period_stats.empty else None,
-                    
-                    # Flagrant Fouls
-                    'Home_Flagrant_Fouls': safe_convert_to_numeric(period_stats.iloc[11, 1]) if not period_stats.empty else None,
-                    'Away_Flagrant_Fouls': safe_convert_to_numeric(period_stats.iloc[11, 2]) if not period_stats.empty else None,
-                    
-                    # Fouls by Period
-                    'Home_Fouls_1H': safe_convert_to_numeric(period_stats.iloc[12, 1]) if not period_stats.empty else None,
-                    'Away_Fouls_1H': safe_convert_to_numeric(period_stats.iloc[12, 2]) if not period_stats.empty else None,
-                    'Home_Fouls_2H': safe_convert_to_numeric(period_stats.iloc[13, 1]) if not period_stats.empty else None,
-                    'Away_Fouls_2H': safe_convert_to_numeric(period_stats.iloc[13, 2]) if not period_stats.empty else None,
-                })
-                
-                # Calculate derived foul statistics
-                if game_info['Home_Personal_Fouls'] is not None and game_info['Away_Personal_Fouls'] is not None:
-                    game_info['Foul_Differential'] = game_info['Home_Personal_Fouls'] - game_info['Away_Personal_Fouls']
-                    game_info['Total_Fouls'] = game_info['Home_Personal_Fouls'] + game_info['Away_Personal_Fouls']
+        # Fetch every page of every game in the chunk concurrently
+        print(f"\n🔄 Fetching games {done+1}-{done+len(chunk)} of {total_games}...")
+        contests = loop.run_until_complete(fetcher.fetch_contests(chunk['Game ID'].tolist()))
+        
+        results = []
+        for game_id, game_date, pages in zip(chunk['Game ID'], chunk['Date'], contests):
+            try:
+                if isinstance(pages, Exception):
+                    raise pages
                 
-                if game_info['Home_FTA'] is not None and game_info['Away_FTA'] is not None:
-                    game_info['Free_Throw_Differential'] = game_info['Home_FTA'] - game_info['Away_FTA']
-            
-            batch_data.append(game_info)
-            
-            # Save batch when it reaches BATCH_SIZE
-            if len(batch_data) >= BATCH_SIZE:
-                batch_file = save_batch_data(batch_data, current_batch)
-                print(f"\n✅ Saved batch {current_batch} to {batch_file}")
-                batch_data = []  # Reset batch data
-                current_batch += 1
-            
-            # Save resume state
-            save_resume_state(i)
-            
-            # Add a longer delay between batches
-            if len(batch_data) == 0:
-                print("😴 Taking a short break between batches...")
-                time.sleep(5)  # 5 second break between batches
-            else:
-                time.sleep(1.5)  # Regular delay between games
+                print(f"  Parsing Game ID: {game_id}")
+                game_info = parse_contest(game_id, game_date, pages)
+                results.append((game_id, game_info))
+                batch_data.append(game_info)
                 
-        except Exception as e:
-            print(f"⚠️ Failed to scrape Game ID: {game_id}")
-            print(f"Error: {str(e)}")
-            failed_games.append({'Game_ID': game_id, 'Error': str(e)})
-            continue
+            except Exception as e:
+                print(f"⚠️ Failed to scrape Game ID: {game_id} ({classify_error(e)})")
+                print(f"Error: {str(e)}")
+                results.append((game_id, e))
+                continue
+        
+        # Journal the whole chunk with one fsync; these games are now done even if the run dies
+        journal.record_games(results)
+        
+        # Save a batch each time BATCH_SIZE games are ready
+        while len(batch_data) >= BATCH_SIZE:
+            batch_num, batch_file = flush_batch(journal, batch_data[:BATCH_SIZE])
+            print(f"\n✅ Saved batch {batch_num} to {batch_file}")
+            batch_data = batch_data[BATCH_SIZE:]
 
     # Save any remaining games in the last batch
     if batch_data:
-        batch_file = save_batch_data(batch_data, current_batch)
-        print(f"\n✅ Saved final batch {current_batch} to {batch_file}")
+        batch_num, batch_file = flush_batch(journal, batch_data)
+        print(f"\n✅ Saved final batch {batch_num} to {batch_file}")
 
 except KeyboardInterrupt:
     print("\n\n⚠️ Script interrupted by user!")
     print("Don't worry - progress has been saved and you can resume later.")
-    # Save the current batch before exiting
+    # Games already journaled are resumed exactly; save them as a batch now
+    batch_data = journal.pending_rows()
     if batch_data:
-        batch_file = save_batch_data(batch_data, current_batch)
-        print(f"✅ Saved current batch {current_batch} to {batch_file}")
+        batch_num, batch_file = flush_batch(journal, batch_data)
+        print(f"✅ Saved current batch {batch_num} to {batch_file}")
 
 finally:
-    # Save failed games
+    loop.run_until_complete(fetcher.close())
+    loop.close()
+    
+    journal.close()
+    
+    # Save failed games (every game whose latest attempt failed, across all runs)
+    failed_games = journal.failures()
     if failed_games:
         failed_file = f"{SAVE_DIRECTORY}/failed_games.csv"
         pd.DataFrame(failed_games).to_csv(failed_file, index=False)
         print(f"\n❌ Saved {len(failed_games)} failed games to {failed_file}")
     
-    # Merge all batches into final dataset
-    print("\n🔄 Merging all batches into final dataset...")
-    final_df = merge_batch_files()
+    # Append any new batches to the final dataset
+    print("\n🔄 Merging new batches into final dataset...")
+    merged = merge_batch_files()
+    final_count = count_rows(FINAL_FILE)
     
     print("\n📊 Final Statistics:")
-    print(f"Total games processed: {len(final_df) if final_df is not None else 0}")
+    print(f"Games added to final dataset: {merged}")
+    print(f"Total games processed: {final_count}")
     print(f"Failed games: {len(failed_games)}")
-    print(f"Success rate: {(len(final_df) / total_games * 100 if final_df is not None else 0):.2f}%")
-    
-python merge_batches.py
+    print(f"Success rate: {(final_count / len(game_data) * 100 if len(game_data) else 0):.2f}%")
@@ -0,0 +1,92 @@
+"""
+Error classification and retry with backoff for NCAA page fetches.
+
+Every failure is put in one of three classes:
+    'transient'     connection resets, timeouts, 5xx responses; retried
+    'rate_limited'  429, or 503 with a Retry-After header; retried after the
+                    server's Retry-After (or the backoff, if longer)
+    'permanent'     other 4xx responses, replay-mode cache misses and parse
+                    errors; never retried, because the same input would fail
+                    the same way again
+
+Retries use exponential backoff with full jitter, so concurrent requests
+that failed together do not all come back at the same moment.
+"""
+
+import random
+import asyncio
+import email.utils
+import time
+import aiohttp
+
+TRANSIENT = 'transient'
+RATE_LIMITED = 'rate_limited'
+PERMANENT = 'permanent'
+RETRYABLE = (TRANSIENT, RATE_LIMITED)
+
+TRANSIENT_STATUSES = {408, 500, 502, 503, 504}
+
+
+def retry_after_seconds(exc):
+    """Seconds the server asked us to wait (Retry-After), or None"""
+    headers = getattr(exc, 'headers', None) or {}
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(exc):
+    """'transient', 'rate_limited' or 'permanent'"""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        if exc.status == 429 or (exc.status == 503 and retry_after_seconds(exc) is not None):
+            return RATE_LIMITED
+        if exc.status in TRANSIENT_STATUSES:
+            return TRANSIENT
+        return PERMANENT
+    if isinstance(exc, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                        asyncio.TimeoutError, ConnectionError)):
+        return TRANSIENT
+    return PERMANENT
+
+
+def backoff_delay(attempt, base_delay=1.0, max_delay=60.0, rng=random):
+    """Full-jitter exponential backoff: uniform in [0, min(max_delay, base_delay * 2**attempt)]"""
+    return rng.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+class RetryPolicy:
+    """Retry an async call on transient and rate-limited errors"""
+
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=60.0, rng=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt, exc):
+        """Seconds to wait before the next attempt"""
+        delay = backoff_delay(attempt, self.base_delay, self.max_delay, self.rng)
+        if classify_error(exc) == RATE_LIMITED:
+            delay = max(delay, retry_after_seconds(exc) or self.base_delay)
+        return delay
+
+    async def call(self, func, *args, on_retry=None):
+        """Await func(*args), retrying retryable errors up to max_attempts times in total"""
+        for attempt in range(self.max_attempts):
+            try:
+                return await func(*args)
+            except Exception as e:
+                if classify_error(e) not in RETRYABLE or attempt == self.max_attempts - 1:
+                    raise
+                delay = self.delay(attempt, e)
+                if on_retry is not None:
+                    on_retry(e, delay)
+                await asyncio.sleep(delay)
@@ -0,0 +1,137 @@
+"""
+Append-only JSONL journal of scraper progress.
+
+Every completed game row and every failure is appended to the journal as
+one JSON line and fsynced, and so is every batch file written. Nothing is
+ever rewritten in place, so a crash loses at most the line being written
+(a torn last line is dropped on the next load). Replaying the journal
+gives the exact resume point:
+
+    done_ids()      Game IDs scraped or failed, which are skipped on resume
+    pending_rows()  scraped rows not yet saved to a batch file, which go into
+                    the next batch instead of being lost
+    failures()      every failed game, latest error (and its class) per game
+    retryable_ids() failed games whose error is worth retrying (retry.py)
+    next_batch      a batch number no earlier batch file uses, so batch files
+                    are never overwritten
+
+Record types:
+    {"type": "game", "game_id": "...", "row": {...}}
+    {"type": "failure", "game_id": "...", "error": "...", "kind": "transient"}
+    {"type": "batch", "batch": 3, "file": "...", "game_ids": [...]}
+"""
+
+import os
+import re
+import json
+from retry import RETRYABLE, classify_error
+
+BATCH_FILE_PATTERN = re.compile(r'^batch_(\d+)\.csv$')
+
+
+def _json_value(value):
+    """JSON fallback for numpy scalars and other non-JSON values"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class ScrapeJournal:
+    """Crash-safe record of which games have been scraped, failed and saved"""
+
+    def __init__(self, path, save_dir=None):
+        self.path = path
+        self.save_dir = save_dir
+        self.rows = {}          # game_id -> row, scraped but not yet in a batch file
+        self.failed = {}        # game_id -> (error, kind)
+        self.saved = set()      # game_ids written to a batch file
+        self.next_batch = 1
+        self._load()
+        if save_dir is not None:
+            self.next_batch = max(self.next_batch, self._next_free_batch(save_dir))
+        self._file = open(self.path, 'a')
+
+    def _apply(self, record):
+        game_id = record.get('game_id')
+        if record['type'] == 'game':
+            self.rows[game_id] = record['row']
+            self.failed.pop(game_id, None)
+        elif record['type'] == 'failure':
+            if game_id not in self.rows and game_id not in self.saved:
+                self.failed[game_id] = (record['error'], record.get('kind'))
+        elif record['type'] == 'batch':
+            for saved_id in record['game_ids']:
+                self.rows.pop(saved_id, None)
+                self.saved.add(saved_id)
+            self.next_batch = max(self.next_batch, record['batch'] + 1)
+
+    def _load(self):
+        """Replay the journal, dropping a torn last line left by a crash"""
+        if not os.path.exists(self.path):
+            return
+        good_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                self._apply(record)
+                good_bytes += len(line)
+        if good_bytes < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_bytes)
+
+    @staticmethod
+    def _next_free_batch(save_dir):
+        numbers = [int(m.group(1)) for m in map(BATCH_FILE_PATTERN.match, os.listdir(save_dir)) if m]
+        return max(numbers, default=0) + 1
+
+    def _append(self, records):
+        """Append records and fsync before they count as done"""
+        lines = [json.dumps(record, default=_json_value) for record in records]
+        self._file.write(''.join(line + '\n' for line in lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        # Apply what was written, so in-memory state matches a replay of the file
+        for line in lines:
+            self._apply(json.loads(line))
+
+    def record_games(self, results):
+        """Journal a chunk of results: (game_id, row) pairs, or (game_id, Exception) for failures"""
+        records = []
+        for game_id, result in results:
+            if isinstance(result, Exception):
+                records.append({'type': 'failure', 'game_id': str(game_id), 'error': str(result),
+                                'kind': classify_error(result)})
+            else:
+                records.append({'type': 'game', 'game_id': str(game_id), 'row': result})
+        if records:
+            self._append(records)
+
+    def record_batch(self, batch_num, batch_file, game_ids):
+        """Journal that these games are now saved in batch_file"""
+        self._append([{'type': 'batch', 'batch': batch_num, 'file': batch_file,
+                       'game_ids': [str(game_id) for game_id in game_ids]}])
+
+    def done_ids(self):
+        """Game IDs that need no scraping on resume"""
+        return set(self.rows) | self.saved | set(self.failed)
+
+    def pending_rows(self):
+        """Scraped rows that have not been saved to a batch file yet"""
+        return list(self.rows.values())
+
+    def failures(self):
+        """[{'Game_ID', 'Error', 'Error_Type'}] for every game whose latest attempt failed"""
+        return [{'Game_ID': game_id, 'Error': error, 'Error_Type': kind}
+                for game_id, (error, kind) in self.failed.items()]
+
+    def retryable_ids(self):
+        """Failed games worth another attempt (failures journaled without a class count too)"""
+        return {game_id for game_id, (_, kind) in self.failed.items() if kind is None or kind in RETRYABLE}
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,140 @@
+"""
+Local stub of stats.ncaa.org that serves saved fixture HTML.
+
+A request path maps onto the fixture directory, so
+    /contests/5730943/box_score  ->  <fixtures>/contests/5730943/box_score.html
+and when no contest-specific file exists the generic <fixtures>/box_score.html
+is served instead. Anything else is a 404.
+
+FaultInjectingHandler fails a share of requests (429 and 503 with
+Retry-After, 500, or a dropped connection) to exercise the retry logic.
+Add 'stall' to its faults to hold a request without answering, so the
+client times out.
+
+Usage:
+    python stub_server.py <fixture_dir> [port] [fault_rate]
+then run the scrapers with NCAA_BASE_URL=http://127.0.0.1:<port>.
+"""
+
+import os
+import sys
+import time
+import random
+import threading
+import collections
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serve <fixture_dir>/<path>.html with keep-alive"""
+    protocol_version = 'HTTP/1.1'
+    fixture_dir = '.'
+
+    def fixture_path(self):
+        """Resolve the request path to a fixture file, or None"""
+        path = urlsplit(self.path).path.strip('/')
+        candidates = [os.path.join(self.fixture_dir, *path.split('/')) + '.html',
+                      os.path.join(self.fixture_dir, os.path.basename(path) + '.html')]
+        root = os.path.realpath(self.fixture_dir)
+        for candidate in candidates:
+            candidate = os.path.realpath(candidate)
+            if candidate.startswith(root + os.sep) and os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def send_body(self, status, body, content_type='text/html; charset=utf-8'):
+        """Send a complete response"""
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.fixture_path()
+        if path is None:
+            self.send_body(404, b'Not Found', 'text/plain')
+            return
+        with open(path, 'rb') as f:
+            self.send_body(200, f.read())
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FaultInjectingHandler(FixtureHandler):
+    """FixtureHandler that fails some requests; configure it with fault_handler()"""
+    fault_rate = 0.2                            # share of requests that fail at random
+    fail_first = 0                              # fail the first N requests for each path, then serve it
+    faults = (429, 503, 500, 'drop')            # status codes, 'drop' to close without a response, or 'stall'
+    retry_after = 1                             # Retry-After seconds sent with 429 and 503
+    stall_seconds = 5                           # how long a 'stall' holds the request before closing it
+    rng = random.Random(0)
+    requests_seen = collections.Counter()
+    lock = threading.Lock()
+
+    def choose_fault(self):
+        """The fault to inject for this request, or None to serve it"""
+        with self.lock:
+            self.requests_seen[self.path] += 1
+            if self.requests_seen[self.path] <= self.fail_first:
+                return self.faults[(self.requests_seen[self.path] - 1) % len(self.faults)]
+            if self.rng.random() < self.fault_rate:
+                return self.rng.choice(self.faults)
+        return None
+
+    def do_GET(self):
+        fault = self.choose_fault()
+        if fault is None:
+            super().do_GET()
+        elif fault == 'drop':
+            self.close_connection = True
+        elif fault == 'stall':
+            time.sleep(self.stall_seconds)
+            self.close_connection = True
+        else:
+            body = b'Injected fault'
+            self.send_response(fault)
+            if fault in (429, 503):
+                self.send_header('Retry-After', str(self.retry_after))
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+
+def fault_handler(seed=0, **options):
+    """A FaultInjectingHandler class with its own options, random stream and request counts"""
+    attributes = dict(options, rng=random.Random(seed), requests_seen=collections.Counter(),
+                      lock=threading.Lock())
+    return type('FaultInjectingHandler', (FaultInjectingHandler,), attributes)
+
+
+def serve_fixtures(fixture_dir, host='127.0.0.1', port=0, handler=FixtureHandler):
+    """Start a stub server in a background thread; the caller shuts it down with server.shutdown()"""
+    handler = type(handler.__name__, (handler,), {'fixture_dir': fixture_dir})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def base_url(server):
+    """Base URL to hand to the fetcher"""
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+if __name__ == "__main__":
+    fixture_dir = sys.argv[1] if len(sys.argv) > 1 else 'fixtures'
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    fault_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+    handler = fault_handler(fault_rate=fault_rate) if fault_rate else FixtureHandler
+    server = serve_fixtures(fixture_dir, port=port, handler=handler)
+    print(f"🧪 Serving {fixture_dir} at {base_url(server)} with {fault_rate:.0%} faults (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,192 @@
+"""
+Targeted HTML table extraction for NCAA contest pages.
+
+pd.read_html turns every table on a page into a DataFrame, but the parser
+only ever reads box_score[1], team_stats[3] and officials[3]. This module
+parses the page once with lxml, picks the requested tables by position
+(counted exactly the way read_html counts them) and returns their cell text
+directly, without building DataFrames for the rest of the page.
+
+The returned Table supports the small slice of the DataFrame API the game
+parser uses: len(), .empty, .iloc[row, col] and table['Column'].tolist().
+Cell values are strings (or None for empty/NA cells); the parser already
+runs every numeric field through safe_convert_to_numeric.
+"""
+
+import re
+import numpy as np
+from lxml import etree
+from lxml.html import HTMLParser, document_fromstring
+
+# Same selection read_html uses with its default match='.+': tables that contain some text
+TABLES_XPATH = etree.XPath("//table[.//text()[re:test(., '.+')]]",
+                           namespaces={'re': 'http://exslt.org/regular-expressions'})
+
+_RE_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+
+# pandas' default NA strings, which read_html turns into NaN
+NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+    '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+])
+
+
+def _is_hidden(element):
+    return 'display:none' in element.get('style', '').replace(' ', '')
+
+
+class _ILoc:
+    def __init__(self, table):
+        self.table = table
+
+    def __getitem__(self, key):
+        row, col = key
+        return self.table.rows[row][col]
+
+
+class Table:
+    """Cell values of one HTML table, indexed the way read_html's DataFrame would be"""
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def empty(self):
+        return len(self.rows) == 0 or len(self.columns) == 0
+
+    @property
+    def iloc(self):
+        return _ILoc(self)
+
+    def __getitem__(self, column):
+        col = self.columns.index(column)
+        return np.array([row[col] for row in self.rows], dtype=object)
+
+
+def _cell_text(cell):
+    """Cell text normalised like read_html: <br> as line break, whitespace collapsed"""
+    for br in cell.iter('br'):
+        br.tail = "\n" + (br.tail or "")
+    return _RE_WHITESPACE.sub(" ", cell.text_content().strip())
+
+
+def _expand_rows(rows, remainder=None):
+    """Expand colspan/rowspan into rectangular text rows (read_html's algorithm)"""
+    all_texts = []
+    remainder = remainder if remainder is not None else []
+
+    for tr in rows:
+        texts = []
+        next_remainder = []
+        index = 0
+        for td in tr.xpath("./td|./th"):
+            while remainder and remainder[0][0] <= index:
+                prev_i, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+                index += 1
+
+            text = _cell_text(td)
+            rowspan = int(td.get('rowspan') or 1)
+            colspan = int(td.get('colspan') or 1)
+            for _ in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+
+        for prev_i, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+
+        all_texts.append(texts)
+        remainder = next_remainder
+
+    return all_texts, remainder
+
+
+def _header_names(head):
+    """Column names from the header rows, with read_html's blank and duplicate handling"""
+    if len(head) == 1:
+        names = [text if text else f"Unnamed: {i}" for i, text in enumerate(head[0])]
+    else:
+        rows = [row for row in head if any(row)]
+        names = [tuple(text if text else f"Unnamed: {i}_level_{level}" for level, text in
+                       enumerate(row[i] for row in rows))
+                 for i in range(len(rows[0]))] if rows else []
+
+    seen = {}
+    mangled = []
+    for name in names:
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        mangled.append(name if count == 0 or isinstance(name, tuple) else f"{name}.{count}")
+    return mangled
+
+
+def _table_from_element(table):
+    """Convert a <table> element to a Table"""
+    for element in table.xpath(".//*[@style]"):
+        if _is_hidden(element):
+            element.drop_tree()
+
+    header_rows = []
+    for thead in table.xpath(".//thead"):
+        header_rows.extend(thead.xpath("./tr"))
+        if thead.xpath("./td|./th"):
+            header_rows.append(thead)
+    body_rows = table.xpath(".//tbody//tr") + table.xpath("./tr")
+    footer_rows = table.xpath(".//tfoot//tr")
+
+    if not header_rows:
+        while body_rows and all(td.tag == 'th' for td in body_rows[0].xpath("./td|./th")):
+            header_rows.append(body_rows.pop(0))
+
+    head, remainder = _expand_rows(header_rows)
+    body, remainder = _expand_rows(body_rows, remainder)
+    foot, _ = _expand_rows(footer_rows, remainder)
+    body += foot
+
+    width = max((len(row) for row in head + body), default=0)
+    head = [row + [''] * (width - len(row)) for row in head]
+    body = [row + [''] * (width - len(row)) for row in body]
+
+    # Single-cell blank rows are dropped, as read_html's text parser does
+    body = [row for row in body if len(row) > 1 or (len(row) == 1 and row[0].strip())]
+    rows = [[None if text in NA_VALUES else text for text in row] for row in body]
+    columns = _header_names(head) if head else list(range(width))
+    return Table(columns, rows)
+
+
+def extract_tables(html, indices):
+    """
+    Extract only the tables at the given read_html positions.
+
+    Returns {index: Table}; indices past the last table are left out.
+    Like read_html, raises ValueError if the page has no tables at all.
+    """
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+    document = document_fromstring(html, parser=HTMLParser(recover=True, encoding='utf-8'))
+    tables = [table for table in TABLES_XPATH(document) if not _is_hidden(table)]
+    if not tables:
+        raise ValueError("No tables found")
+    return {index: _table_from_element(tables[index]) for index in indices if index < len(tables)}
+
+
+def extract_table_list(html, indices):
+    """
+    Extract the given tables as a list indexed like read_html's result.
+
+    Positions that were not requested are None, so list[i] and len(list)
+    behave the same as for pd.read_html(html)[i] on the requested tables.
+    """
+    found = extract_tables(html, indices)
+    size = max(found) + 1 if found else 0
+    return [found.get(i) for i in range(size)]
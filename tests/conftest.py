@@ -0,0 +1,27 @@
+"""Make the flat scrapers/ and referee_analysis/ modules importable, as pipeline.py does"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ('scrapers', 'referee_analysis'):
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import pytest
+
+CONTEST_PAGES = ('box_score', 'team_stats', 'officials')
+
+
+@pytest.fixture
+def contest_fixtures(tmp_path):
+    """Write a small page for each contest page of the given Game IDs; returns the fixture directory"""
+    def write(game_ids):
+        for game_id in game_ids:
+            contest_dir = tmp_path / 'fixtures' / 'contests' / str(game_id)
+            contest_dir.mkdir(parents=True, exist_ok=True)
+            for page in CONTEST_PAGES:
+                (contest_dir / f'{page}.html').write_text(f'<html><body>{game_id} {page}</body></html>')
+        return str(tmp_path / 'fixtures')
+    return write
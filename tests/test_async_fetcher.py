@@ -0,0 +1,73 @@
+import time
+import asyncio
+import threading
+from async_fetcher import AsyncFetcher, CONTEST_PAGES
+from page_cache import PageCache
+from stub_server import FixtureHandler, serve_fixtures, fault_handler, base_url
+
+GAMES = list(range(5730901, 5730905))
+
+
+class SlowHandler(FixtureHandler):
+    """FixtureHandler that holds each request briefly and records the most requests in flight at once"""
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def do_GET(self):
+        with self.lock:
+            SlowHandler.in_flight += 1
+            SlowHandler.peak = max(SlowHandler.peak, SlowHandler.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            SlowHandler.in_flight -= 1
+        super().do_GET()
+
+
+def fetch_all(server, **options):
+    async def fetch():
+        async with AsyncFetcher(base_url=base_url(server), **options) as fetcher:
+            return await fetcher.fetch_contests(GAMES)
+    return asyncio.run(fetch())
+
+
+def test_rate_limit_spaces_requests(contest_fixtures):
+    server = serve_fixtures(contest_fixtures(GAMES))
+    try:
+        start = time.monotonic()
+        contests = fetch_all(server, rate=40, burst=1, max_per_host=8)
+        elapsed = time.monotonic() - start
+    finally:
+        server.shutdown()
+
+    assert all(isinstance(pages, dict) for pages in contests)
+    # One token up front, then one every 1/40 s for the other requests
+    requests = len(GAMES) * len(CONTEST_PAGES)
+    assert elapsed >= (requests - 1) / 40 * 0.9
+
+
+def test_connections_per_host_are_capped(contest_fixtures):
+    SlowHandler.in_flight = SlowHandler.peak = 0
+    server = serve_fixtures(contest_fixtures(GAMES), handler=SlowHandler)
+    try:
+        contests = fetch_all(server, rate=1000, max_per_host=2)
+    finally:
+        server.shutdown()
+
+    assert all(isinstance(pages, dict) for pages in contests)
+    assert SlowHandler.peak == 2
+
+
+def test_cached_pages_are_not_fetched_again(contest_fixtures, tmp_path):
+    handler = fault_handler(fault_rate=0)
+    server = serve_fixtures(contest_fixtures(GAMES), handler=handler)
+    try:
+        first = fetch_all(server, rate=1000, cache=PageCache(str(tmp_path / 'cache')))
+        requests = sum(handler.requests_seen.values())
+        second = fetch_all(server, rate=1000, cache=PageCache(str(tmp_path / 'cache')))
+    finally:
+        server.shutdown()
+
+    assert requests == len(GAMES) * len(CONTEST_PAGES)
+    assert sum(handler.requests_seen.values()) == requests
+    assert second == first
@@ -0,0 +1,40 @@
+import pandas as pd
+from batch_merge import merge_batches
+
+
+def write_batch(save_dir, number, rows):
+    pd.DataFrame(rows).to_csv(save_dir / f'batch_{number:04d}.csv', index=False)
+
+
+def test_batch_with_an_extra_column_widens_the_final_file(tmp_path):
+    save_dir, final_file = tmp_path / 'scraped_data', tmp_path / 'final.csv'
+    save_dir.mkdir()
+    write_batch(save_dir, 1, [{'Game_ID': '6001', 'Date': '2025-01-04', 'Venue': 'Moby Arena'},
+                              {'Game_ID': '6002', 'Date': '2025-01-05', 'Venue': 'Pit'}])
+    write_batch(save_dir, 2, [{'Game_ID': '6003', 'Date': '2025-01-07', 'Venue': 'Moby Arena', 'Attendance': 8745},
+                              {'Game_ID': '6001', 'Date': '2025-01-04', 'Venue': 'Moby Arena', 'Attendance': 5120}])
+
+    merged = []
+    added = merge_batches(str(save_dir), str(final_file), str(tmp_path / 'manifest.txt'), on_batch=merged.append)
+
+    final = pd.read_csv(final_file, dtype={'Game_ID': str})
+    assert added == 3
+    assert list(final.columns) == ['Game_ID', 'Date', 'Venue', 'Attendance']
+    assert final['Game_ID'].tolist() == ['6001', '6002', '6003']
+    assert final['Attendance'].isna().tolist() == [True, True, False]
+    assert final.loc[2, 'Attendance'] == 8745
+    assert final.loc[1, 'Venue'] == 'Pit'
+    assert [len(batch) for batch in merged] == [2, 1]
+
+
+def test_batch_missing_a_column_keeps_the_header(tmp_path):
+    save_dir, final_file = tmp_path / 'scraped_data', tmp_path / 'final.csv'
+    save_dir.mkdir()
+    write_batch(save_dir, 1, [{'Game_ID': '6001', 'Date': '2025-01-04', 'Attendance': 8745}])
+    write_batch(save_dir, 2, [{'Game_ID': '6002', 'Date': '2025-01-05'}])
+
+    merge_batches(str(save_dir), str(final_file), str(tmp_path / 'manifest.txt'))
+
+    final = pd.read_csv(final_file)
+    assert list(final.columns) == ['Game_ID', 'Date', 'Attendance']
+    assert final['Attendance'].isna().tolist() == [False, True]
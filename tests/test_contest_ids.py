@@ -0,0 +1,28 @@
+import os
+import datetime as dt
+import pytest
+from contest_ids import extract_contest_ids
+
+SCOREBOARDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'scoreboards')
+
+EXPECTED = {
+    # Two rows per contest, and a late West Coast game listed on the next day
+    '2024-11-04': [(dt.date(2024, 11, 4), '5730943'),
+                   (dt.date(2024, 11, 4), '5731120'),
+                   (dt.date(2024, 11, 5), '5732007')],
+    '2024-12-24': [],
+    # 6-, 7- and 8-digit IDs; the TBA game has no date of its own
+    '2025-03-18': [(dt.date(2025, 3, 18), '987654'),
+                   (dt.date(2025, 3, 18), '6384211'),
+                   (dt.date(2025, 3, 18), '10000023')],
+}
+
+
+@pytest.mark.parametrize('day', sorted(EXPECTED))
+def test_scoreboard_fixtures(day):
+    with open(os.path.join(SCOREBOARDS, f'{day}.html'), encoding='utf-8') as f:
+        html = f.read()
+    contests = extract_contest_ids(html, dt.date.fromisoformat(day))
+
+    assert contests == EXPECTED[day]
+    assert len({contest_id for _, contest_id in contests}) == len(contests)
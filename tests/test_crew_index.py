@@ -0,0 +1,31 @@
+import pandas as pd
+from crew_index import CrewIndex
+
+
+def games(game_ids):
+    return pd.DataFrame({
+        'Game_ID': game_ids,
+        'Date': ['2025-01-04', '2025-01-05', '2025-01-07'][:len(game_ids)],
+        'Official_1': ['Ann Lee', 'Ann Lee', 'Bo Park'][:len(game_ids)],
+        'Official_2': ['Bo Park', 'Bo Park', 'Cy Diaz'][:len(game_ids)],
+        'Official_3': ['Cy Diaz', None, 'Ann Lee'][:len(game_ids)],
+    })
+
+
+def test_text_game_ids_are_not_added_twice(tmp_path):
+    index = CrewIndex(str(tmp_path / 'crew_index.npz'))
+    assert index.add_games(games([6001, 6002, 6003])) == 3
+
+    # pipeline.py passes freshly scraped Game_IDs as strings
+    assert index.add_games(games(['6001', '6002', '6003'])) == 0
+    assert index.games_together('Ann Lee', 'Bo Park')['Game_ID'].tolist() == [6001, 6002, 6003]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = CrewIndex(str(tmp_path / 'crew_index.npz'))
+    index.add_games(games(['6001', '6002']))
+    index.save()
+
+    loaded = CrewIndex.load(index.path)
+    assert loaded.add_games(games([6001, 6002, 6003])) == 1
+    assert loaded.top_partners('Ann Lee').values.tolist() == [['Bo Park', 3], ['Cy Diaz', 2]]
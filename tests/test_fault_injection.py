@@ -0,0 +1,74 @@
+import random
+import asyncio
+import aiohttp
+from async_fetcher import AsyncFetcher, CONTEST_PAGES
+from retry import RetryPolicy, classify_error, PERMANENT
+from scrape_journal import ScrapeJournal
+from stub_server import serve_fixtures, fault_handler, base_url
+
+GAMES = [5730943, 5731120]
+MISSING = 5799999  # No fixture pages, so the stub answers 404
+FAULTS = (429, 503, 500, 'drop', 'stall')
+
+
+def scrape(server, journal, game_ids, max_attempts):
+    """Fetch contests through a retrying fetcher and journal them, as regular_season_scraper.py does"""
+    async def fetch():
+        async with AsyncFetcher(base_url=base_url(server), rate=1000, max_per_host=4, timeout=0.5,
+                                retry=RetryPolicy(max_attempts, base_delay=0.01, max_delay=0.05,
+                                                  rng=random.Random(0))) as fetcher:
+            return await fetcher.fetch_contests(game_ids)
+
+    contests = asyncio.run(fetch())
+    journal.record_games(list(zip(game_ids, contests)))
+    return dict(zip(game_ids, contests))
+
+
+def test_faults_are_retried_and_404s_are_permanent(contest_fixtures, tmp_path):
+    # Every path fails once with each fault, then is served
+    handler = fault_handler(fault_rate=0, fail_first=len(FAULTS), faults=FAULTS,
+                            retry_after=0, stall_seconds=1)
+    server = serve_fixtures(contest_fixtures(GAMES), handler=handler)
+    journal = ScrapeJournal(str(tmp_path / 'journal.jsonl'))
+    try:
+        contests = scrape(server, journal, GAMES + [MISSING], max_attempts=len(FAULTS) + 1)
+    finally:
+        server.shutdown()
+        journal.close()
+
+    for game_id in GAMES:
+        assert contests[game_id] == {page: f'<html><body>{game_id} {page}</body></html>' for page in CONTEST_PAGES}
+        for page in CONTEST_PAGES:
+            assert handler.requests_seen[f'/contests/{game_id}/{page}'] == len(FAULTS) + 1
+
+    error = contests[MISSING]
+    assert isinstance(error, aiohttp.ClientResponseError) and error.status == 404
+    assert classify_error(error) == PERMANENT
+    assert journal.failures() == [{'Game_ID': str(MISSING), 'Error': str(error), 'Error_Type': PERMANENT}]
+    assert journal.retryable_ids() == set()
+
+
+def test_retry_failed_recovers_retryable_games(contest_fixtures, tmp_path):
+    handler = fault_handler(fault_rate=0, fail_first=len(FAULTS), faults=FAULTS,
+                            retry_after=0, stall_seconds=1)
+    server = serve_fixtures(contest_fixtures(GAMES), handler=handler)
+    journal = ScrapeJournal(str(tmp_path / 'journal.jsonl'))
+    try:
+        # First run gives up before the faults stop: every game fails with a retryable error
+        scrape(server, journal, GAMES + [MISSING], max_attempts=3)
+        assert journal.retryable_ids() == {str(game_id) for game_id in GAMES + [MISSING]}
+
+        # Once the outage is over, retry-failed requeues only the retryable failures;
+        # the missing game now gets its 404
+        handler.fail_first = 0
+        retry_ids = sorted(int(game_id) for game_id in journal.retryable_ids())
+        contests = scrape(server, journal, retry_ids, max_attempts=3)
+    finally:
+        server.shutdown()
+        journal.close()
+
+    assert all(isinstance(contests[game_id], dict) for game_id in GAMES)
+    assert set(journal.rows) == {str(game_id) for game_id in GAMES}
+    assert [failure['Game_ID'] for failure in journal.failures()] == [str(MISSING)]
+    assert journal.failures()[0]['Error_Type'] == PERMANENT
+    assert journal.retryable_ids() == set()
@@ -0,0 +1,16 @@
+import datetime as dt
+import pandas as pd
+from pipeline import unseen_game_ids
+
+
+def test_late_games_dated_the_next_day_are_included(tmp_path):
+    game_ids_file, games_file = tmp_path / 'game_ids.csv', tmp_path / 'games.csv'
+    pd.DataFrame({
+        'Date': ['2025-03-09', '2025-03-10', '2025-03-11', '2025-03-12', '2025-03-12', '2025-03-13'],
+        'Game ID': ['6001', '6002', '6003', '6004', '6004', '6005'],
+    }).to_csv(game_ids_file, index=False)
+    pd.DataFrame({'Game_ID': ['6002']}).to_csv(games_file, index=False)
+
+    # A 9 PM Pacific tip-off on the 11th's scoreboard is listed on the 12th
+    unseen = unseen_game_ids(str(game_ids_file), str(games_file), dt.date(2025, 3, 10), dt.date(2025, 3, 11))
+    assert unseen['Game ID'].tolist() == ['6003', '6004']
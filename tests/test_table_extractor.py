@@ -0,0 +1,46 @@
+import os
+import glob
+from io import StringIO
+import pandas as pd
+import pytest
+from table_extractor import extract_tables
+from game_parser import PAGE_TABLES, parse_contest, read_all_tables
+
+CONTESTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'contests')
+PAGES = sorted(glob.glob(os.path.join(CONTESTS, '*', '*.html')))
+
+
+def read_page(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def same_cell(text, value):
+    """An extracted cell (text or None) against read_html's parsed value (NaN, number or text)"""
+    if text is None:
+        return pd.isna(value)
+    if isinstance(value, str):
+        return text == value
+    return pd.to_numeric(text.replace(',', '')) == value
+
+
+@pytest.mark.parametrize('path', PAGES, ids=[os.path.relpath(path, CONTESTS) for path in PAGES])
+def test_every_table_matches_read_html(path):
+    html = read_page(path)
+    expected = pd.read_html(StringIO(html))
+    tables = extract_tables(html, range(len(expected) + 1))
+
+    assert sorted(tables) == list(range(len(expected)))
+    for index, frame in enumerate(expected):
+        table = tables[index]
+        assert table.columns == list(frame.columns)
+        assert len(table) == len(frame)
+        for row, values in zip(table.rows, frame.itertuples(index=False)):
+            assert all(same_cell(text, value) for text, value in zip(row, values)), (index, row, values)
+
+
+@pytest.mark.parametrize('game_id', sorted(os.listdir(CONTESTS)))
+def test_parsed_games_match_read_html(game_id):
+    pages = {page: read_page(os.path.join(CONTESTS, game_id, f'{page}.html')) for page in PAGE_TABLES}
+    assert parse_contest(game_id, '2024-11-04', pages) == parse_contest(game_id, '2024-11-04', pages,
+                                                                        reader=read_all_tables)
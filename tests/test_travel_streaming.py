@@ -0,0 +1,73 @@
+import os
+import tracemalloc
+import numpy as np
+import pandas as pd
+import pytest
+import geolocator
+import travel_legs
+from assignments import build_assignments
+
+OFFICIAL_COLS = ['Official_1', 'Official_2', 'Official_3']
+N_REFEREES, N_VENUES = 300, 100
+
+
+def synthetic_games(n_games, seed=0):
+    """Games over a fixed referee and venue pool, so more games means more legs per referee"""
+    rng = np.random.default_rng(seed)
+    referees = np.array([f'Referee {i}' for i in range(N_REFEREES)], dtype=object)
+    venues = np.array([f'Arena {i}' for i in range(N_VENUES)], dtype=object)
+    officials = rng.integers(0, N_REFEREES, (n_games, 3))
+    games = pd.DataFrame({
+        'Date': pd.Timestamp('2015-11-01') + pd.to_timedelta(np.sort(rng.integers(0, 3000, n_games)), unit='D'),
+        'Venue': venues[rng.integers(0, N_VENUES, n_games)],
+        **{col: referees[officials[:, i]] for i, col in enumerate(OFFICIAL_COLS)},
+    })
+    coords = np.column_stack([rng.uniform(25, 49, N_VENUES), rng.uniform(-124, -67, N_VENUES)])
+    return games, {venue: tuple(row) for venue, row in zip(venues, coords)}
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    monkeypatch.setattr(geolocator, 'WORK_DIR', str(tmp_path))
+    analyzer = geolocator.RefereeTravel(venue_db=str(tmp_path / 'venues.sqlite'), details_json=True)
+    analyzer.block_rows = 2000
+    return analyzer
+
+
+def save_outputs(analyzer, n_games):
+    """Stream the travel outputs for n_games; returns (travel_df, peak bytes traced while streaming)"""
+    games, venue_coords = synthetic_games(n_games)
+    assignments = build_assignments(games, OFFICIAL_COLS, columns=['Date', 'Venue'])
+    analyzer.distance_index.add_venues(venue_coords)
+
+    tracemalloc.start()
+    try:
+        travel_df, _ = analyzer.save_travel_outputs(analyzer.travel_blocks(assignments, 'Venue', venue_coords))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return travel_df, peak
+
+
+def test_peak_memory_does_not_grow_with_legs(analyzer):
+    small_df, small_peak = save_outputs(analyzer, 4000)
+    large_df, large_peak = save_outputs(analyzer, 16000)
+
+    legs = travel_legs._read_table(os.path.join(analyzer.output_dir, travel_legs.LEGS_FILE))
+    assert len(legs) > 40000
+    # Four times the legs, same referees: the peak is set by the block size, not the input
+    assert large_peak < 1.25 * small_peak
+
+
+def test_blocks_give_the_same_outputs_as_one_block(analyzer):
+    streamed, _ = save_outputs(analyzer, 4000)
+    streamed_legs = dict(travel_legs.iter_referee_legs(analyzer.output_dir, streamed['Referee']))
+
+    analyzer.block_rows = 10 ** 9
+    whole, _ = save_outputs(analyzer, 4000)
+    whole_legs = dict(travel_legs.iter_referee_legs(analyzer.output_dir, whole['Referee']))
+
+    pd.testing.assert_frame_equal(streamed, whole)
+    for referee, columns in whole_legs.items():
+        for name, values in columns.items():
+            np.testing.assert_array_equal(streamed_legs[referee][name], values)
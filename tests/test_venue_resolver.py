@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+from venue_resolver import VenueResolver, Gazetteer
+
+
+class FlakyGeocoder:
+    """Fails every query until it is switched on, then finds every venue"""
+
+    def __init__(self):
+        self.online = False
+        self.queries = []
+
+    def geocode(self, query):
+        self.queries.append(query)
+        if not self.online:
+            raise TimeoutError("geocoder unavailable")
+        return SimpleNamespace(latitude=40.57, longitude=-105.09)
+
+
+def test_failed_venue_is_geocoded_again(tmp_path):
+    geocoder = FlakyGeocoder()
+    resolver = VenueResolver(geocoder=geocoder, gazetteer=Gazetteer(str(tmp_path / 'none.csv')), rate=1000)
+
+    assert resolver.resolve_all(['Moby Arena']) == {}
+    geocoder.online = True
+    assert resolver.resolve_all(['Moby Arena']) == {'Moby Arena': (40.57, -105.09)}
+    assert geocoder.queries == ['Moby Arena', 'Moby Arena']
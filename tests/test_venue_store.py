@@ -0,0 +1,35 @@
+import pytest
+from venue_store import VenueStore
+
+SUFFIXED = 'Moby Arena (Fort Collins, CO)'
+BARE = 'Moby Arena'
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = VenueStore(str(tmp_path / 'venues.sqlite'))
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize('first, second', [(SUFFIXED, BARE), (BARE, SUFFIXED)])
+def test_bare_and_suffixed_names_are_one_venue(store, first, second):
+    first_id = store.put(first, (40.5, -105.1), source='geocoder_city')
+    second_id = store.put(second, (40.57, -105.09), source='geocoder')
+
+    assert first_id == second_id
+    assert len(store) == 1
+    assert store.lookup(BARE)['venue_id'] == store.lookup(SUFFIXED)['venue_id'] == first_id
+    assert store.get(BARE) == store.get(SUFFIXED) == (40.57, -105.09)
+    assert store.lookup(SUFFIXED)['city'] == 'Fort Collins'
+
+
+def test_shared_short_name_stays_ambiguous(store):
+    store.put('Memorial Gym', (36.1, -86.8))
+    nashville = store.put('Memorial Gym (Nashville, TN)', (36.14, -86.8))
+    el_paso = store.put('Memorial Gym (El Paso, TX)', (31.77, -106.5))
+
+    assert nashville != el_paso
+    assert store.lookup('Memorial Gym (Nashville, TN)')['venue_id'] == nashville
+    assert store.lookup('Memorial Gym (El Paso, TX)')['venue_id'] == el_paso
+    assert store.lookup('Memorial Gym') is None